@@ -0,0 +1,807 @@
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:
+    # Windows no tiene fcntl; se usa msvcrt para el bloqueo de archivos
+    fcntl = None
+    import msvcrt
+
+import modelo
+import rendimiento
+import seguridad
+from config import ARCHIVOS, ALMACENAMIENTO
+
+logger = logging.getLogger(__name__)
+
+# Colecciones que se guardan como registros individuales
+COLECCIONES = ("usuarios", "proyectos", "calificaciones")
+
+def datos_iniciales():
+    """Devuelve la estructura inicial de datos del sistema"""
+    return {
+        "usuarios": [
+            {
+                "id": "user_001",
+                "username": "admin",
+                "password": seguridad.hashear_password("admin123"),
+                "nombre": "Administrador",
+                "email": "admin@universidad.edu",
+                "rol": "admin",
+                "fecha_registro": datetime.now().strftime("%Y-%m-%d")
+            }
+        ],
+        "proyectos": [],
+        "calificaciones": [],
+        "configuracion": {
+            "pesos_criterios": {
+                "innovacion": 30,
+                "viabilidad": 25,
+                "impacto": 20,
+                "ejecucion": 15,
+                "pitch": 10
+            },
+            "max_calificacion": 10,
+            "min_calificacion": 0
+        },
+        "ranking": {
+            "fecha_actualizacion": datetime.now().strftime("%Y-%m-%d"),
+            "proyectos_ganadores": []
+        }
+    }
+
+def leer_json(ruta):
+    """Lee un documento JSON completo desde disco"""
+    with open(ruta, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+def escribir_json(ruta, datos):
+    """Escribe un documento JSON completo de forma atómica (temporal + rename)"""
+    directorio = os.path.dirname(ruta) or "."
+    os.makedirs(directorio, exist_ok=True)
+
+    descriptor, ruta_temporal = tempfile.mkstemp(
+        prefix=os.path.basename(ruta) + ".", suffix=".tmp", dir=directorio
+    )
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            json.dump(datos, file, indent=2, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(ruta_temporal, ruta)
+    except BaseException:
+        try:
+            os.remove(ruta_temporal)
+        except FileNotFoundError:
+            pass
+        raise
+
+class BloqueoArchivo:
+    """Bloqueo exclusivo entre procesos (archivo .lock) y reentrante entre hilos"""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._lock = threading.RLock()
+        self._profundidad = 0
+        self._archivo = None
+
+    @contextmanager
+    def __call__(self):
+        with self._lock:
+            if self._profundidad == 0:
+                self._adquirir()
+            self._profundidad += 1
+            try:
+                yield
+            finally:
+                self._profundidad -= 1
+                if self._profundidad == 0:
+                    self._liberar()
+
+    def _adquirir(self):
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        self._archivo = open(self.ruta, 'a+')
+        if fcntl is not None:
+            fcntl.flock(self._archivo.fileno(), fcntl.LOCK_EX)
+        else:
+            self._archivo.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._archivo.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK se rinde tras unos segundos; seguir esperando
+                    continue
+
+    def _liberar(self):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._archivo.fileno(), fcntl.LOCK_UN)
+            else:
+                self._archivo.seek(0)
+                msvcrt.locking(self._archivo.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._archivo.close()
+            self._archivo = None
+
+# Función que recalcula los campos derivados (calificación final, ranking) tras una fusión
+_recalculo = None
+
+def registrar_recalculo(funcion):
+    """Registra la función de dominio que recalcula los campos derivados de los datos"""
+    global _recalculo
+    _recalculo = funcion
+
+def recalcular(datos):
+    """Aplica la función de recálculo registrada, si la hay"""
+    if _recalculo is not None:
+        datos = _recalculo(datos) or datos
+    return datos
+
+def fusionar_datos(actuales, propios):
+    """Fusiona los registros nuevos de 'propios' sobre la versión más reciente 'actuales'
+
+    Las colecciones son de solo agregado: se conservan todos los registros
+    actuales y se añaden los propios que aún no existan (por id). Para los
+    proyectos presentes en ambos lados se unen sus listas de calificaciones.
+    Los demás cambios a registros existentes se pierden: para editarlos hay
+    que usar modificar_datos, que aplica la edición dentro del bloqueo.
+    """
+    fusionados = dict(actuales)
+    for coleccion in COLECCIONES:
+        registros = list(actuales.get(coleccion, []))
+        por_id = {r.get('id'): r for r in registros}
+        for registro in propios.get(coleccion, []):
+            existente = por_id.get(registro.get('id'))
+            if existente is None:
+                registros.append(registro)
+                por_id[registro.get('id')] = registro
+            elif coleccion == "proyectos":
+                ids = existente.setdefault('calificaciones', [])
+                for cal_id in registro.get('calificaciones', []):
+                    if cal_id not in ids:
+                        ids.append(cal_id)
+        fusionados[coleccion] = registros
+    return recalcular(fusionados)
+
+def firma_archivo(ruta):
+    """Devuelve (mtime, tamaño) de un archivo o None si no existe"""
+    try:
+        estado = os.stat(ruta)
+    except FileNotFoundError:
+        return None
+    return (estado.st_mtime_ns, estado.st_size)
+
+class BackendJSON:
+    """Almacena el documento en un snapshot JSON más un journal de calificaciones"""
+
+    def __init__(self, ruta, ruta_journal=None, umbral_compactacion=None):
+        self.ruta = ruta
+        self.ruta_journal = ruta_journal or ALMACENAMIENTO["journal"]
+        self.umbral_compactacion = umbral_compactacion or ALMACENAMIENTO["umbral_compactacion"]
+        self._entradas_journal = 0
+        self._compactando = False
+        self._lock = BloqueoArchivo(ruta + ".lock")
+
+    def cargar(self):
+        """Devuelve el snapshot con el journal aplicado o None si aún no existe"""
+        with self._lock():
+            try:
+                datos = leer_json(self.ruta)
+            except FileNotFoundError:
+                return None
+            datos.setdefault('version', 0)
+            self._entradas_journal = self._reproducir_journal(datos)
+            return datos
+
+    def guardar(self, datos, fusionar=True):
+        """Reescribe el snapshot completo y vacía el journal ya incluido en él
+
+        Si otro proceso escribió desde que se cargaron los datos, se fusionan
+        sus cambios antes de escribir. Devuelve el documento realmente guardado.
+        """
+        with self._lock():
+            actuales = self.cargar()
+            if actuales is not None and actuales.get('version') != datos.get('version'):
+                if fusionar:
+                    datos.update(fusionar_datos(actuales, datos))
+                datos['version'] = actuales.get('version', 0)
+
+            datos['version'] = datos.get('version', 0) + 1
+            escribir_json(self.ruta, datos)
+            self._vaciar_journal()
+            return datos
+
+    def modificar(self, funcion):
+        """Aplica funcion(datos) al documento más reciente y lo guarda sin soltar el bloqueo"""
+        with self._lock():
+            datos = self.cargar()
+            if datos is None:
+                datos = datos_iniciales()
+            funcion(datos)
+            return self.guardar(datos, fusionar=False)
+
+    def firma(self):
+        """Devuelve una firma barata que cambia cuando cambia el snapshot o el journal"""
+        return (firma_archivo(self.ruta), firma_archivo(self.ruta_journal))
+
+    def agregar_calificacion(self, datos, calificacion, proyecto):
+        """Agrega la calificación como una sola línea al journal"""
+        entrada = {
+            "version_base": datos.get('version', 0),
+            "calificacion": calificacion,
+            "proyecto_id": calificacion.get('proyecto_id'),
+            "calificacion_final": proyecto.get('calificacion_final', 0) if proyecto else None,
+            "ranking": datos.get('ranking')
+        }
+        linea = json.dumps(entrada, ensure_ascii=False) + "\n"
+
+        with self._lock():
+            directorio = os.path.dirname(self.ruta_journal)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+
+            with open(self.ruta_journal, 'a', encoding='utf-8') as file:
+                file.write(linea)
+                file.flush()
+                os.fsync(file.fileno())
+            self._entradas_journal += 1
+            datos['version'] = datos.get('version', 0) + 1
+
+            if self._entradas_journal >= self.umbral_compactacion and not self._compactando:
+                self._compactando = True
+                threading.Thread(target=self.compactar, name="compactacion-journal", daemon=True).start()
+
+    def compactar(self):
+        """Integra el journal en el snapshot y lo vacía"""
+        try:
+            with self._lock():
+                datos = self.cargar()
+                if datos is not None and self._entradas_journal:
+                    self.guardar(datos)
+        finally:
+            self._compactando = False
+
+    def _reproducir_journal(self, datos):
+        """Aplica sobre el snapshot las calificaciones del journal y devuelve cuántas había"""
+        try:
+            file = open(self.ruta_journal, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return 0
+
+        with file:
+            ids_existentes = {cal.get('id') for cal in datos.get('calificaciones', [])}
+            proyectos = {p.get('id'): p for p in datos.get('proyectos', [])}
+            entradas = 0
+            desactualizado = False
+
+            for linea in file:
+                if not linea.strip():
+                    continue
+                try:
+                    entrada = json.loads(linea)
+                except json.JSONDecodeError:
+                    # Línea incompleta por una escritura interrumpida
+                    continue
+
+                entradas += 1
+                calificacion = entrada['calificacion']
+                if calificacion.get('id') in ids_existentes:
+                    # Ya integrada en el snapshot por una compactación anterior
+                    continue
+
+                # Si la entrada se calculó sobre otra versión, sus derivados no son fiables
+                if entrada.get('version_base', datos['version']) != datos['version']:
+                    desactualizado = True
+                datos['version'] += 1
+
+                ids_existentes.add(calificacion.get('id'))
+                datos.setdefault('calificaciones', []).append(calificacion)
+
+                proyecto = proyectos.get(entrada.get('proyecto_id'))
+                if proyecto is not None:
+                    proyecto.setdefault('calificaciones', []).append(calificacion.get('id'))
+                    if entrada.get('calificacion_final') is not None:
+                        proyecto['calificacion_final'] = entrada['calificacion_final']
+                if entrada.get('ranking') is not None:
+                    datos['ranking'] = entrada['ranking']
+
+            if desactualizado:
+                datos.update(recalcular(datos))
+            return entradas
+
+    def _vaciar_journal(self):
+        """Elimina el journal una vez integrado en el snapshot"""
+        try:
+            os.remove(self.ruta_journal)
+        except FileNotFoundError:
+            pass
+        self._entradas_journal = 0
+
+class BackendSQLite:
+    """Almacena cada registro como una fila de SQLite con índices por clave"""
+
+    ESQUEMA = """
+    CREATE TABLE IF NOT EXISTS usuarios (
+        id TEXT PRIMARY KEY,
+        username TEXT,
+        datos TEXT NOT NULL
+    );
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_usuarios_username ON usuarios(username);
+    CREATE TABLE IF NOT EXISTS proyectos (
+        id TEXT PRIMARY KEY,
+        datos TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS calificaciones (
+        id TEXT PRIMARY KEY,
+        proyecto_id TEXT,
+        docente_id TEXT,
+        datos TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_calificaciones_proyecto ON calificaciones(proyecto_id);
+    CREATE INDEX IF NOT EXISTS idx_calificaciones_docente ON calificaciones(docente_id);
+    CREATE TABLE IF NOT EXISTS ranking (
+        clave TEXT PRIMARY KEY,
+        valor TEXT
+    );
+    CREATE TABLE IF NOT EXISTS configuracion (
+        clave TEXT PRIMARY KEY,
+        valor TEXT
+    );
+    CREATE TABLE IF NOT EXISTS meta (
+        clave TEXT PRIMARY KEY,
+        valor INTEGER
+    );
+    INSERT OR IGNORE INTO meta (clave, valor) VALUES ('version', 0);
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._esquema_creado = False
+
+    def conectar(self):
+        """Abre una conexión y asegura que el esquema exista"""
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        conexion = sqlite3.connect(self.ruta, timeout=30)
+        conexion.execute("PRAGMA synchronous=NORMAL")
+        if not self._esquema_creado:
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.executescript(self.ESQUEMA)
+            self._esquema_creado = True
+        return conexion
+
+    def firma(self):
+        """Devuelve el contador de versión que se incrementa en cada escritura"""
+        conexion = self.conectar()
+        try:
+            return self._version(conexion)
+        finally:
+            conexion.close()
+
+    def _incrementar_version(self, conexion):
+        """Incrementa el contador de versión dentro de la transacción actual"""
+        conexion.execute("UPDATE meta SET valor = valor + 1 WHERE clave = 'version'")
+
+    def cargar(self):
+        """Reconstruye el documento completo o devuelve None si la base está vacía"""
+        conexion = self.conectar()
+        try:
+            # Una transacción de lectura garantiza una instantánea consistente con su versión
+            with conexion:
+                conexion.execute("BEGIN")
+                return self._leer(conexion)
+        finally:
+            conexion.close()
+
+    def _leer(self, conexion):
+        """Lee el documento completo usando una conexión abierta"""
+        datos = {}
+        for coleccion in COLECCIONES:
+            filas = conexion.execute(f"SELECT datos FROM {coleccion} ORDER BY rowid")
+            datos[coleccion] = [json.loads(fila[0]) for fila in filas]
+
+        for seccion in ("configuracion", "ranking"):
+            filas = conexion.execute(f"SELECT clave, valor FROM {seccion} ORDER BY rowid")
+            datos[seccion] = {clave: json.loads(valor) for clave, valor in filas}
+
+        if not datos["usuarios"] and not datos["configuracion"]:
+            return None
+        datos['version'] = self._version(conexion)
+        return datos
+
+    def calificaciones_desde(self, desde_id):
+        """Devuelve las calificaciones con id >= desde_id recorriendo el índice de la clave primaria
+
+        Con los ids ordenables por tiempo (identificadores.limite_id) equivale
+        a pedir las calificaciones registradas a partir de un momento.
+        """
+        conexion = self.conectar()
+        try:
+            filas = conexion.execute("SELECT datos FROM calificaciones WHERE id >= ? ORDER BY id", (desde_id,))
+            return [json.loads(fila[0]) for fila in filas]
+        finally:
+            conexion.close()
+
+    def _version(self, conexion):
+        """Devuelve el contador de versión de la base"""
+        return conexion.execute("SELECT valor FROM meta WHERE clave = 'version'").fetchone()[0]
+
+    def guardar(self, datos, fusionar=True):
+        """Reemplaza todo el contenido de la base dentro de una transacción
+
+        Si otro proceso escribió desde que se cargaron los datos, se fusionan
+        sus cambios antes de escribir. Devuelve el documento realmente guardado.
+        """
+        conexion = self.conectar()
+        try:
+            with conexion:
+                # BEGIN IMMEDIATE toma el bloqueo de escritura antes de comparar versiones
+                conexion.execute("BEGIN IMMEDIATE")
+                version = self._version(conexion)
+                if fusionar and 'version' in datos and datos['version'] != version:
+                    actuales = self._leer(conexion)
+                    if actuales is not None:
+                        datos.update(fusionar_datos(actuales, datos))
+
+                self._escribir(conexion, datos, version)
+            return datos
+        finally:
+            conexion.close()
+
+    def modificar(self, funcion):
+        """Aplica funcion(datos) al documento más reciente y lo guarda en la misma transacción"""
+        conexion = self.conectar()
+        try:
+            with conexion:
+                conexion.execute("BEGIN IMMEDIATE")
+                datos = self._leer(conexion) or datos_iniciales()
+                funcion(datos)
+                self._escribir(conexion, datos, self._version(conexion))
+            return datos
+        finally:
+            conexion.close()
+
+    def _escribir(self, conexion, datos, version):
+        """Reemplaza el contenido de la base dentro de la transacción abierta"""
+        for tabla in COLECCIONES + ("ranking", "configuracion"):
+            conexion.execute(f"DELETE FROM {tabla}")
+
+        conexion.executemany(
+            "INSERT OR REPLACE INTO usuarios (id, username, datos) VALUES (?, ?, ?)",
+            [(u['id'], u.get('username'), json.dumps(u, ensure_ascii=False))
+             for u in datos.get('usuarios', [])]
+        )
+        conexion.executemany(
+            "INSERT OR REPLACE INTO proyectos (id, datos) VALUES (?, ?)",
+            [(p['id'], json.dumps(p, ensure_ascii=False))
+             for p in datos.get('proyectos', [])]
+        )
+        conexion.executemany(
+            "INSERT OR REPLACE INTO calificaciones (id, proyecto_id, docente_id, datos) VALUES (?, ?, ?, ?)",
+            [self._fila_calificacion(cal) for cal in datos.get('calificaciones', [])]
+        )
+        self._guardar_seccion(conexion, "configuracion", datos.get('configuracion', {}))
+        self._guardar_seccion(conexion, "ranking", datos.get('ranking', {}))
+        self._incrementar_version(conexion)
+        datos['version'] = version + 1
+
+    def agregar_calificacion(self, datos, calificacion, proyecto):
+        """Inserta una calificación y actualiza solo las filas afectadas"""
+        conexion = self.conectar()
+        try:
+            with conexion:
+                conexion.execute("BEGIN IMMEDIATE")
+                version = self._version(conexion)
+                conexion.execute(
+                    "INSERT OR REPLACE INTO calificaciones (id, proyecto_id, docente_id, datos) VALUES (?, ?, ?, ?)",
+                    self._fila_calificacion(calificacion)
+                )
+
+                if 'version' in datos and datos['version'] != version:
+                    # Otro proceso escribió entretanto: recalcular derivados sobre la versión actual
+                    actuales = self._leer(conexion)
+                    for proyecto_actual in actuales['proyectos']:
+                        if proyecto_actual['id'] == calificacion.get('proyecto_id'):
+                            ids = proyecto_actual.setdefault('calificaciones', [])
+                            if calificacion['id'] not in ids:
+                                ids.append(calificacion['id'])
+                    actuales = recalcular(actuales)
+                    conexion.executemany(
+                        "UPDATE proyectos SET datos = ? WHERE id = ?",
+                        [(json.dumps(p, ensure_ascii=False), p['id']) for p in actuales['proyectos']]
+                    )
+                    self._guardar_seccion(conexion, "ranking", actuales.get('ranking', {}))
+                else:
+                    if proyecto is not None:
+                        conexion.execute(
+                            "UPDATE proyectos SET datos = ? WHERE id = ?",
+                            (json.dumps(proyecto, ensure_ascii=False), proyecto['id'])
+                        )
+                    self._guardar_seccion(conexion, "ranking", datos.get('ranking', {}))
+                self._incrementar_version(conexion)
+                datos['version'] = version + 1
+        finally:
+            conexion.close()
+
+    def _fila_calificacion(self, calificacion):
+        """Convierte una calificación en la tupla de columnas de su tabla"""
+        return (
+            calificacion['id'],
+            calificacion.get('proyecto_id'),
+            calificacion.get('docente_id'),
+            json.dumps(calificacion, ensure_ascii=False)
+        )
+
+    def _guardar_seccion(self, conexion, tabla, seccion):
+        """Guarda una sección clave/valor (configuración o ranking)"""
+        conexion.execute(f"DELETE FROM {tabla}")
+        conexion.executemany(
+            f"INSERT INTO {tabla} (clave, valor) VALUES (?, ?)",
+            [(clave, json.dumps(valor, ensure_ascii=False)) for clave, valor in seccion.items()]
+        )
+
+class DictSoloLectura(dict):
+    """Diccionario compartido entre sesiones que no admite modificaciones"""
+
+    # En la vista de congelar_documento: registros omitidos por inválidos
+    errores = ()
+
+    def _solo_lectura(self, *args, **kwargs):
+        raise TypeError("Los datos compartidos son de solo lectura; use cargar_datos() para editarlos")
+
+    __setitem__ = __delitem__ = __ior__ = _solo_lectura
+    clear = pop = popitem = setdefault = update = _solo_lectura
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copia_editable(self)
+
+class ListaSoloLectura(list):
+    """Lista compartida entre sesiones que no admite modificaciones"""
+
+    def _solo_lectura(self, *args, **kwargs):
+        raise TypeError("Los datos compartidos son de solo lectura; use cargar_datos() para editarlos")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _solo_lectura
+    append = extend = insert = pop = remove = clear = sort = reverse = _solo_lectura
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return copia_editable(self)
+
+def congelar(valor):
+    """Convierte recursivamente un documento en una vista de solo lectura"""
+    if isinstance(valor, dict):
+        return DictSoloLectura((clave, congelar(v)) for clave, v in valor.items())
+    if isinstance(valor, list):
+        return ListaSoloLectura(congelar(v) for v in valor)
+    return valor
+
+def congelar_documento(datos):
+    """Convierte el documento en la vista compartida, validando sus registros con modelo.py
+
+    Las calificaciones (la colección más numerosa) se guardan como registros
+    compactos del modelo; usuarios, proyectos y el resto, como vistas de solo
+    lectura. Los registros inválidos se omiten de la vista (siguen guardados)
+    y quedan en 'errores' como (colección, id, mensaje).
+    """
+    vista = {}
+    errores = []
+    for clave, valor in datos.items():
+        clase = modelo.REGISTROS.get(clave)
+        if clase is None:
+            vista[clave] = congelar(valor)
+        elif clave == "calificaciones":
+            try:
+                # Camino rápido (la colección más numerosa): todas válidas
+                vista[clave] = ListaSoloLectura(map(clase.desde_dict, valor))
+            except modelo.ErrorModelo:
+                vista[clave] = ListaSoloLectura(_validos(clase, clave, valor, errores))
+        else:
+            # Se leen por clave en cada rerun de la interfaz: se validan y se mantienen como dicts
+            vista[clave] = congelar(list(_validos(clase, clave, valor, errores, instancias=False)))
+    vista = DictSoloLectura(vista)
+    vista.errores = errores
+    return vista
+
+def _validos(clase, coleccion, registros, errores, instancias=True):
+    """Recorre los registros válidos (como registros del modelo o, sin 'instancias', como venían)
+
+    Los inválidos se anotan en 'errores' y en el log.
+    """
+    for registro in registros:
+        try:
+            instancia = clase.desde_dict(registro)
+        except modelo.ErrorModelo as error:
+            registro_id = registro.get('id') if isinstance(registro, dict) else None
+            errores.append((coleccion, registro_id, str(error)))
+            logger.warning("Registro omitido de la vista compartida: %s", error)
+            continue
+        yield instancia if instancias else registro
+
+def copia_editable(valor):
+    """Devuelve una copia mutable (dicts y listas normales) de un documento"""
+    if isinstance(valor, modelo.Registro):
+        valor = valor.a_dict()
+    if isinstance(valor, dict):
+        return {clave: copia_editable(v) for clave, v in valor.items()}
+    if isinstance(valor, list):
+        return [copia_editable(v) for v in valor]
+    return valor
+
+# Backend activo del proceso
+_backend = None
+
+# Caché compartida del documento entre todas las sesiones del proceso
+_cache = {
+    "datos": None,
+    "firma": None,
+    "version_local": 0,
+    "aciertos": 0,
+    "fallos": 0
+}
+_cache_lock = threading.Lock()
+
+# Estructuras derivadas (índices, ranking...) construidas sobre la vista compartida
+_derivados = {}
+
+def obtener_backend():
+    """Devuelve el backend configurado (se crea una sola vez por proceso)"""
+    global _backend
+    if _backend is None:
+        motor = os.environ.get("CONCURSO_ALMACENAMIENTO", ALMACENAMIENTO["motor"])
+        if motor == "sqlite":
+            _backend = BackendSQLite(ALMACENAMIENTO["sqlite"])
+            # Primera ejecución: importar el JSON existente si la base está vacía
+            if _backend.cargar() is None and os.path.exists(ARCHIVOS["datos"]):
+                _backend.guardar(BackendJSON(ARCHIVOS["datos"]).cargar())
+        elif motor == "json":
+            _backend = BackendJSON(ARCHIVOS["datos"])
+        else:
+            raise ValueError(f"Motor de almacenamiento desconocido: {motor}")
+    return _backend
+
+@rendimiento.medido()
+def cargar_datos():
+    """Carga los datos desde el backend, creando la estructura inicial si no existe"""
+    backend = obtener_backend()
+    datos = backend.cargar()
+    if datos is None:
+        datos = datos_iniciales()
+        backend.guardar(datos)
+    return datos
+
+@rendimiento.medido()
+def guardar_datos(datos):
+    """Guarda el documento completo en el backend y devuelve la versión guardada"""
+    datos = obtener_backend().guardar(datos)
+    invalidar_cache()
+    return datos
+
+@rendimiento.medido()
+def modificar_datos(funcion):
+    """Aplica funcion(datos) sobre la versión más reciente dentro del bloqueo de escritura y la guarda
+
+    Es la forma de editar registros existentes: guardar_datos solo fusiona
+    los registros nuevos si otro proceso escribió antes.
+    """
+    datos = obtener_backend().modificar(funcion)
+    invalidar_cache()
+    return datos
+
+# Intentos de lectura de la vista compartida si los datos cambian mientras se cargan
+INTENTOS_LECTURA = 3
+
+@rendimiento.medido()
+def obtener_datos():
+    """Devuelve una vista de solo lectura compartida, releída solo si los datos cambiaron"""
+    backend = obtener_backend()
+    for _ in range(INTENTOS_LECTURA):
+        with _cache_lock:
+            # La firma se toma antes de cargar: si otra escritura ocurre durante la
+            # carga, el documento queda guardado con la firma anterior y se relee
+            firma = (backend.firma(), _cache["version_local"])
+            if _cache["datos"] is not None and _cache["firma"] == firma:
+                _cache["aciertos"] += 1
+                return _cache["datos"]
+            _cache["fallos"] += 1
+
+        datos = congelar_documento(cargar_datos())
+
+        with _cache_lock:
+            _cache["datos"] = datos
+            _cache["firma"] = firma
+            # Si los datos cambiaron durante la carga (o cargar_datos creó el archivo), releer
+            if (backend.firma(), _cache["version_local"]) == firma:
+                return datos
+    return datos
+
+def obtener_derivado(nombre, constructor, actualizar=None):
+    """Devuelve una estructura derivada de la vista compartida, reconstruida solo cuando cambian los datos
+
+    Si se indica 'actualizar(anterior, datos)', se usa para derivar la nueva
+    estructura a partir de la anterior; si devuelve None se reconstruye entera.
+    """
+    datos = obtener_datos()
+    with _cache_lock:
+        entrada = _derivados.get(nombre)
+        if entrada is not None and entrada[0] is datos:
+            return entrada[1]
+
+    valor = None
+    if actualizar is not None and entrada is not None:
+        valor = actualizar(entrada[1], datos)
+    if valor is None:
+        valor = constructor(datos)
+
+    with _cache_lock:
+        _derivados[nombre] = (datos, valor)
+    return valor
+
+def derivado_de(datos, nombre, constructor, actualizar=None):
+    """Como obtener_derivado, pero para unos 'datos' concretos
+
+    Si 'datos' es la vista compartida se reutiliza la estructura en caché;
+    si no (por ejemplo, una copia editable), se construye aparte.
+    """
+    if datos is obtener_datos():
+        return obtener_derivado(nombre, constructor, actualizar)
+    return constructor(datos)
+
+def invalidar_cache():
+    """Fuerza a que la próxima lectura compartida vuelva a cargar los datos"""
+    with _cache_lock:
+        _cache["version_local"] += 1
+        _cache["datos"] = None
+
+def estadisticas_cache():
+    """Devuelve los contadores de aciertos y fallos de la caché compartida"""
+    with _cache_lock:
+        return {
+            "aciertos": _cache["aciertos"],
+            "fallos": _cache["fallos"],
+            "version_local": _cache["version_local"]
+        }
+
+def registrar_calificacion(datos, calificacion, proyecto=None):
+    """Persiste una calificación recién agregada a los datos en memoria"""
+    if proyecto is None:
+        proyecto = next(
+            (p for p in datos['proyectos'] if p['id'] == calificacion.get('proyecto_id')),
+            None
+        )
+    obtener_backend().agregar_calificacion(datos, calificacion, proyecto)
+    invalidar_cache()
+
+def importar_json(ruta=None):
+    """Importa un documento JSON completo al backend activo"""
+    datos = leer_json(ruta or ARCHIVOS["datos"])
+    # Rechazar el documento antes de reemplazar los datos si algún registro no es válido
+    modelo.validar_documento(datos)
+    # La importación reemplaza el contenido, no se fusiona con lo existente
+    datos = obtener_backend().guardar(datos, fusionar=False)
+    invalidar_cache()
+    return datos
+
+def exportar_json(ruta=None):
+    """Exporta el contenido del backend activo a un documento JSON"""
+    datos = cargar_datos()
+    escribir_json(ruta or ARCHIVOS["datos"], datos)
+    return datos
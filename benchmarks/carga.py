@@ -0,0 +1,416 @@
+"""Prueba de carga sin servidor: docentes simultáneos contra la aplicación con AppTest
+
+Uso:
+    python benchmarks/carga.py [--app concurso|main] [--sesiones 20] [--concurrencia 8] [--procesos 1]
+                               [--proyectos 100] [--calificaciones 500] [--mismo-proyecto]
+                               [--motor json|sqlite] [--salida carga.json]
+
+Cada sesión simula a un docente: inicia sesión, abre la tabla de calificación,
+busca y selecciona un proyecto, mueve los sliders de los criterios y envía la
+calificación. Las sesiones de un proceso corren en hilos y se intercalan rerun
+a rerun sobre las mismas cachés, como en el servidor de Streamlit; AppTest no
+admite reruns en paralelo dentro de un proceso (cada uno instala su propio
+Runtime global), así que el tiempo que un rerun espera su turno se informa aparte
+como "espera". Con --procesos se simulan varias instancias en paralelo sobre
+los mismos datos.
+
+Informa los percentiles de latencia por rerun y por paso, los bytes escritos
+en datos/ (snapshot y journal) y las actualizaciones perdidas: calificaciones
+enviadas con éxito que no están en los datos finales. Al terminar, cada proceso
+compara sus estructuras derivadas (extendidas calificación a calificación) con
+las reconstruidas desde cero. Todo corre sin red, sobre datos sintéticos en un
+directorio temporal.
+
+Con --app main solo se mide el inicio de sesión: los paneles de main.py se
+importan del paquete pages/, que no forma parte de este repositorio.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+from streamlit.testing.v1 import AppTest
+
+from generar_datos import PASSWORD_SINTETICA, escribir, generar
+
+PERCENTILES = (50, 90, 95, 99)
+TIEMPO_MAXIMO_RERUN = 120
+
+# AppTest no es seguro entre hilos: crear una app o ejecutar un rerun toma el turno del proceso
+_turno_rerun = threading.Lock()
+
+def _script_concurso():
+    import streamlit as st
+
+    import concurso
+
+    # streamlit_option_menu es un componente que AppTest no puede operar: la página se elige por session_state
+    def menu(*args, **kwargs):
+        return st.session_state.get("_pagina_carga", kwargs["options"][kwargs.get("default_index", 0)])
+
+    concurso.option_menu = menu
+    concurso.main()
+
+def _script_main():
+    import main
+    main.main()
+
+def crear_app(script):
+    """Crea la AppTest de una sesión nueva"""
+    with _turno_rerun:
+        return AppTest.from_function(script, default_timeout=TIEMPO_MAXIMO_RERUN)
+
+class Medidor:
+    """Registra la latencia de cada rerun por paso y los errores de las sesiones"""
+
+    def __init__(self):
+        self.latencias = defaultdict(list)
+        self.errores = Counter()
+        self.enviadas = []
+        self._lock = threading.Lock()
+
+    def ejecutar(self, paso, app):
+        """Ejecuta un rerun de la app y registra su latencia; devuelve False si hubo una excepción"""
+        llegada = time.perf_counter()
+        with _turno_rerun:
+            inicio = time.perf_counter()
+            app.run(timeout=TIEMPO_MAXIMO_RERUN)
+            duracion = time.perf_counter() - inicio
+        with self._lock:
+            self.latencias[paso].append(duracion)
+            self.latencias["espera"].append(inicio - llegada)
+            for excepcion in app.exception:
+                self.errores[f"{paso}: {excepcion.message.splitlines()[0]}"] += 1
+        return not app.exception
+
+def _iniciar_sesion(medidor, app, username, formulario):
+    if not medidor.ejecutar("inicio", app):
+        return False
+    app.text_input[0].input(username)
+    app.text_input[1].input(PASSWORD_SINTETICA)
+    app.button(key=f"FormSubmitter:{formulario}-🚀 Iniciar Sesión").click()
+    if not medidor.ejecutar("login", app):
+        return False
+    if "usuario_actual" not in app.session_state:
+        medidor.errores["login: credenciales rechazadas"] += 1
+        return False
+    return True
+
+def simular_docente_concurso(medidor, docente, proyecto):
+    """Recorre el flujo completo de calificación de un docente en concurso.main"""
+    app = crear_app(_script_concurso)
+    if not _iniciar_sesion(medidor, app, docente["username"], "login"):
+        return
+
+    app.session_state["_pagina_carga"] = "Calificar Proyecto"
+    if not medidor.ejecutar("tabla", app):
+        return
+    app.radio(key="modo_tabla_calificar").set_value("Detallada")
+    if not medidor.ejecutar("tabla", app):
+        return
+    app.text_input(key="busqueda_calificar").input(proyecto["nombre"])
+    if not medidor.ejecutar("buscar", app):
+        return
+
+    boton = next((b for b in app.button if b.key == f"calificar_{proyecto['id']}"), None)
+    if boton is None:
+        medidor.errores["seleccionar: proyecto no visible en la tabla"] += 1
+        return
+    boton.click()
+    if not medidor.ejecutar("seleccionar", app):
+        return
+
+    # Cada movimiento de un slider es un rerun completo
+    for posicion, slider in enumerate(list(app.slider)):
+        app.slider(key=slider.key).set_value((posicion * 3 + len(docente["id"])) % 11)
+        if not medidor.ejecutar("sliders", app):
+            return
+
+    app.button(key="FormSubmitter:calificacion_proyecto-Enviar Calificación").click()
+    if not medidor.ejecutar("enviar", app):
+        return
+    if "proyecto_seleccionado" in app.session_state:
+        medidor.errores["enviar: la calificación no se registró"] += 1
+        return
+    with medidor._lock:
+        medidor.enviadas.append((docente["id"], proyecto["id"]))
+
+def simular_docente_main(medidor, docente, proyecto):
+    """Inicia sesión en main.main y abre el panel del docente"""
+    app = crear_app(_script_main)
+    if _iniciar_sesion(medidor, app, docente["username"], "login_principal"):
+        medidor.ejecutar("panel", app)
+
+def contar_escrituras():
+    """Envuelve las escrituras del almacenamiento para contar los bytes escritos en datos/"""
+    import almacenamiento
+    from config import ARCHIVOS
+
+    bytes_escritos = Counter()
+    lock = threading.Lock()
+    escribir_json = almacenamiento.escribir_json
+    vaciar_journal = almacenamiento.BackendJSON._vaciar_journal
+
+    def escribir_contando(ruta, datos):
+        escribir_json(ruta, datos)
+        with lock:
+            bytes_escritos["snapshot" if ruta == ARCHIVOS["datos"] else "otros"] += os.path.getsize(ruta)
+
+    def vaciar_contando(self):
+        # Las líneas del journal se cuentan una vez, al integrarlas en el snapshot
+        try:
+            tamano = os.path.getsize(self.ruta_journal)
+        except FileNotFoundError:
+            tamano = 0
+        with lock:
+            bytes_escritos["journal"] += tamano
+        vaciar_journal(self)
+
+    almacenamiento.escribir_json = escribir_contando
+    almacenamiento.BackendJSON._vaciar_journal = vaciar_contando
+    return bytes_escritos
+
+def ejecutar_proceso(directorio, app, tareas, concurrencia):
+    """Ejecuta las sesiones de un proceso en hilos y devuelve sus mediciones"""
+    os.chdir(directorio)
+    # Interactuar con una AppTest desde hilos propios avisa "missing ScriptRunContext" en cada paso
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda registro: "missing ScriptRunContext" not in registro.getMessage()
+    )
+    bytes_escritos = contar_escrituras()
+    simular = simular_docente_concurso if app == "concurso" else simular_docente_main
+    medidor = Medidor()
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as ejecutor:
+        for futuro in [ejecutor.submit(simular, medidor, docente, proyecto) for docente, proyecto in tareas]:
+            try:
+                futuro.result()
+            except Exception as error:
+                medidor.errores[f"sesión: {type(error).__name__}: {error}"] += 1
+
+    return {
+        "duracion": time.perf_counter() - inicio,
+        "derivados": verificar_derivados(),
+        "latencias": dict(medidor.latencias),
+        "errores": dict(medidor.errores),
+        "enviadas": medidor.enviadas,
+        "bytes": dict(bytes_escritos)
+    }
+
+def verificar_derivados():
+    """Compara las estructuras que el proceso extendió de forma incremental con las reconstruidas desde cero"""
+    import almacenamiento
+    import servicios
+    from indices import IndiceCalificaciones
+    from ranking import MotorRanking
+
+    def ids(indice):
+        return {clave: [cal['id'] for cal in lista] for clave, lista in indice.items()}
+
+    datos = almacenamiento.obtener_datos()
+    motor = servicios.obtener_motor_ranking()
+    reconstruido = MotorRanking.desde_datos(datos)
+    indice = servicios.obtener_indice_calificaciones()
+    indice_reconstruido = IndiceCalificaciones.desde_datos(datos)
+    return {
+        "ranking": (
+            motor.finales == reconstruido.finales and motor.orden == reconstruido.orden
+            and motor.cantidades == reconstruido.cantidades
+        ),
+        "calificaciones": (
+            indice.por_id.keys() == indice_reconstruido.por_id.keys()
+            and ids(indice.por_proyecto) == ids(indice_reconstruido.por_proyecto)
+            and ids(indice.por_docente) == ids(indice_reconstruido.por_docente)
+            and ids(indice.por_docente_proyecto) == ids(indice_reconstruido.por_docente_proyecto)
+        )
+    }
+
+def preparar_datos(sesiones, proyectos, calificaciones, mismo_proyecto):
+    """Escribe los datos sintéticos en datos/ y devuelve las tareas (docente, proyecto) de cada sesión"""
+    import seguridad
+
+    datos = generar(sesiones + 1, proyectos, calificaciones, semilla=sesiones)
+    # Todas las cuentas comparten un hash con el algoritmo actual: así el login no reescribe el snapshot
+    password = seguridad.hashear_password(PASSWORD_SINTETICA)
+    for usuario in datos["usuarios"]:
+        usuario["password"] = password
+    escribir(datos, os.path.join("datos", "data.json"))
+
+    calificados = {(cal["docente_id"], cal["proyecto_id"]) for cal in datos["calificaciones"]}
+    docentes = [usuario for usuario in datos["usuarios"] if usuario["rol"] == "docente"]
+    tareas = []
+    for numero, docente in enumerate(docentes[:sesiones]):
+        inicio = 0 if mismo_proyecto else numero % len(datos["proyectos"])
+        candidatos = datos["proyectos"][inicio:] + datos["proyectos"][:inicio]
+        proyecto = next((p for p in candidatos if (docente["id"], p["id"]) not in calificados), None)
+        if proyecto is not None:
+            tareas.append((docente, proyecto))
+    return tareas
+
+def verificar(enviadas):
+    """Compara las calificaciones enviadas con las que quedaron guardadas"""
+    import almacenamiento
+
+    almacenamiento.invalidar_cache()
+    datos = almacenamiento.cargar_datos()
+    guardadas = Counter((cal["docente_id"], cal["proyecto_id"]) for cal in datos["calificaciones"])
+    # Calificaciones guardadas que no figuran en la lista de su proyecto
+    ids_por_proyecto = {proyecto["id"]: set(proyecto.get("calificaciones", [])) for proyecto in datos["proyectos"]}
+    huerfanas = sum(
+        1 for cal in datos["calificaciones"]
+        if cal["id"] not in ids_por_proyecto.get(cal["proyecto_id"], set())
+    )
+    return {
+        "enviadas": len(enviadas),
+        "perdidas": sum(1 for par in enviadas if par not in guardadas),
+        "duplicadas": sum(1 for par in set(enviadas) if guardadas[par] > 1),
+        "huerfanas": huerfanas
+    }
+
+def tamano_sqlite():
+    """Devuelve el tamaño de la base SQLite en bytes (páginas × tamaño de página)
+
+    Con WAL los archivos no reflejan el crecimiento: el WAL se reutiliza sin
+    encogerse y la base no cambia hasta el checkpoint. page_count incluye las
+    páginas confirmadas en el WAL.
+    """
+    import almacenamiento
+    from config import ALMACENAMIENTO
+
+    almacenamiento.obtener_backend()
+    conexion = sqlite3.connect(ALMACENAMIENTO["sqlite"])
+    try:
+        paginas = conexion.execute("PRAGMA page_count").fetchone()[0]
+        tamano_pagina = conexion.execute("PRAGMA page_size").fetchone()[0]
+    finally:
+        conexion.close()
+    return paginas * tamano_pagina
+
+def percentiles(valores):
+    """Devuelve los percentiles (por rango más cercano) y el máximo en milisegundos"""
+    ordenados = sorted(valores)
+    resultado = {"n": len(ordenados)}
+    for p in PERCENTILES:
+        posicion = max(0, -(-p * len(ordenados) // 100) - 1)
+        resultado[f"p{p}"] = ordenados[posicion] * 1000
+    resultado["max"] = ordenados[-1] * 1000
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", choices=["concurso", "main"], default="concurso")
+    parser.add_argument("--sesiones", type=int, default=20, help="Docentes simulados")
+    parser.add_argument("--concurrencia", type=int, default=8, help="Sesiones simultáneas por proceso")
+    parser.add_argument("--procesos", type=int, default=1, help="Instancias de la aplicación sobre los mismos datos")
+    parser.add_argument("--proyectos", type=int, default=100)
+    parser.add_argument("--calificaciones", type=int, default=500, help="Calificaciones previas en los datos")
+    parser.add_argument("--mismo-proyecto", action="store_true", help="Todos los docentes califican el mismo proyecto")
+    parser.add_argument("--motor", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar el resultado")
+    argumentos = parser.parse_args()
+
+    # El motor se elige antes de que cualquier proceso cree su backend
+    os.environ["CONCURSO_ALMACENAMIENTO"] = argumentos.motor
+    directorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as directorio:
+        os.chdir(directorio)
+        try:
+            tareas = preparar_datos(
+                argumentos.sesiones, argumentos.proyectos, argumentos.calificaciones, argumentos.mismo_proyecto
+            )
+            repartos = [tareas[i::argumentos.procesos] for i in range(argumentos.procesos)]
+            # Con SQLite la base se crea (importando el JSON) antes de medir; luego se mide su crecimiento
+            tamano_inicial = tamano_sqlite() if argumentos.motor == "sqlite" else 0
+
+            inicio = time.perf_counter()
+            if argumentos.procesos == 1:
+                resultados = [ejecutar_proceso(directorio, argumentos.app, tareas, argumentos.concurrencia)]
+            else:
+                # spawn: cada proceso arranca limpio, como una instancia nueva de la aplicación
+                contexto = multiprocessing.get_context("spawn")
+                with contexto.Pool(argumentos.procesos) as pool:
+                    resultados = pool.starmap(ejecutar_proceso, [
+                        (directorio, argumentos.app, reparto, argumentos.concurrencia) for reparto in repartos
+                    ])
+            duracion = time.perf_counter() - inicio
+
+            enviadas = [tuple(par) for resultado in resultados for par in resultado["enviadas"]]
+            verificacion = verificar(enviadas)
+            journal = os.path.join("datos", "calificaciones.journal.jsonl")
+            pendiente_journal = os.path.getsize(journal) if os.path.exists(journal) else 0
+            crecimiento_sqlite = tamano_sqlite() - tamano_inicial if argumentos.motor == "sqlite" else 0
+        finally:
+            os.chdir(directorio_original)
+
+    latencias = defaultdict(list)
+    errores = Counter()
+    bytes_escritos = Counter(journal=pendiente_journal, sqlite=crecimiento_sqlite)
+    for resultado in resultados:
+        for paso, valores in resultado["latencias"].items():
+            latencias[paso].extend(valores)
+        errores.update(resultado["errores"])
+        bytes_escritos.update(resultado["bytes"])
+    todas = [valor for paso, valores in latencias.items() if paso != "espera" for valor in valores]
+    # Estructuras cuya versión incremental difiere de la reconstruida en algún proceso
+    derivados_distintos = sorted({
+        nombre for resultado in resultados for nombre, iguales in resultado["derivados"].items() if not iguales
+    })
+
+    resumen = {
+        "app": argumentos.app,
+        "motor": argumentos.motor,
+        "sesiones": len(tareas),
+        "concurrencia": argumentos.concurrencia,
+        "procesos": argumentos.procesos,
+        "duracion_s": duracion,
+        "reruns_por_segundo": len(todas) / duracion if duracion else 0,
+        "latencia_ms": {"total": percentiles(todas)} if todas else {},
+        "bytes_escritos": dict(bytes_escritos),
+        "errores": dict(errores),
+        "derivados_distintos": derivados_distintos,
+        **verificacion
+    }
+    for paso, valores in latencias.items():
+        resumen["latencia_ms"][paso] = percentiles(valores)
+
+    print(f"{resumen['sesiones']} sesiones ({argumentos.app}, {argumentos.motor}), "
+          f"{argumentos.procesos} proceso(s) × {argumentos.concurrencia} hilos: "
+          f"{duracion:.1f} s, {resumen['reruns_por_segundo']:.1f} reruns/s")
+    print(f"  {'paso':12s} {'n':>5s} " + " ".join(f"{'p' + str(p):>9s}" for p in PERCENTILES) + f" {'max':>9s}")
+    for paso, estadisticas in resumen["latencia_ms"].items():
+        print(f"  {paso:12s} {estadisticas['n']:5d} "
+              + " ".join(f"{estadisticas[f'p{p}']:9.1f}" for p in PERCENTILES) + f" {estadisticas['max']:9.1f}")
+    if argumentos.motor == "sqlite":
+        print(f"  Crecimiento de la base SQLite: {bytes_escritos['sqlite']:,} bytes")
+    else:
+        print(f"  Bytes escritos: snapshot {bytes_escritos['snapshot']:,}, journal {bytes_escritos['journal']:,}")
+    print(f"  Calificaciones enviadas: {verificacion['enviadas']}, perdidas: {verificacion['perdidas']}, "
+          f"duplicadas: {verificacion['duplicadas']}, fuera de su proyecto: {verificacion['huerfanas']}")
+    if derivados_distintos:
+        print(f"  ⚠️ Derivados incrementales distintos de los reconstruidos: {', '.join(derivados_distintos)}")
+    else:
+        print("  Derivados incrementales iguales a los reconstruidos")
+    for error, cantidad in errores.most_common():
+        print(f"  ⚠️ {cantidad} × {error}")
+
+    if argumentos.salida:
+        with open(argumentos.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(resumen, archivo, indent=2, ensure_ascii=False)
+
+    return 1 if verificacion["perdidas"] or derivados_distintos else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
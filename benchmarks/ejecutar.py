@@ -0,0 +1,217 @@
+"""Suite de benchmarks del flujo de calificación sobre datos sintéticos
+
+Uso:
+    python benchmarks/ejecutar.py [--escalas 100 10000 1000000] [--repeticiones 5]
+                                  [--salida benchmarks/resultados] [--comparar resultado_anterior.json]
+
+La escala es la cantidad de calificaciones; se generan escala/10 proyectos
+(mínimo 10) y escala/100 docentes (mínimo 10). Cada escala se ejecuta en un
+directorio temporal con su propio datos/data.json, sin tocar los datos reales.
+
+Los resultados (mínimo, mediana, media, desviación y máximo en segundos
+por benchmark y escala, y los bytes por calificación de la vista compartida)
+se guardan en JSON junto con el commit actual, para comparar entre commits
+con --comparar. La escala 10⁶ necesita varios GB de memoria.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+import almacenamiento
+import concurso
+import puntuacion
+import servicios
+from busqueda import IndiceBusqueda
+from filtros import ConsultaFiltros, MotorFiltros
+from horarios import IndiceHorarios
+from paginacion import PaginadorProyectos
+from ranking import MotorRanking
+
+from generar_datos import escribir, generar
+
+def medir(funcion, repeticiones, preparar=None):
+    """Ejecuta 'funcion' varias veces y devuelve estadísticas de tiempo en segundos
+
+    Si se indica 'preparar', se llama antes de cada repetición (fuera de la
+    medición) y su resultado se pasa a 'funcion'. La primera ejecución es de
+    calentamiento y no se mide.
+    """
+    funcion(*((preparar(),) if preparar else ()))
+    tiempos = []
+    for _ in range(repeticiones):
+        argumentos = (preparar(),) if preparar else ()
+        inicio = time.perf_counter()
+        funcion(*argumentos)
+        tiempos.append(time.perf_counter() - inicio)
+    return {
+        "min": min(tiempos),
+        "mediana": statistics.median(tiempos),
+        "media": statistics.mean(tiempos),
+        "desviacion": statistics.stdev(tiempos) if len(tiempos) > 1 else 0.0,
+        "max": max(tiempos),
+        "repeticiones": repeticiones
+    }
+
+def bytes_por_calificacion(documento):
+    """Memoria que ocupa la vista compartida de 'documento', dividida por su cantidad de calificaciones"""
+    tracemalloc.start()
+    try:
+        vista = almacenamiento.congelar_documento(documento)
+        ocupado = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del vista
+    return ocupado / max(len(documento['calificaciones']), 1)
+
+def tamanos(escala):
+    """Devuelve (usuarios, proyectos, calificaciones) para una escala"""
+    return max(10, escala // 100) + 1, max(10, escala // 10), escala
+
+def medir_documento(datos, repeticiones):
+    """Mide las etapas que trabajan sobre el documento editable 'datos'"""
+    resultados = {}
+    resultados["actualizar_ranking"] = medir(servicios.actualizar_ranking, repeticiones, lambda: datos)
+
+    pesos = datos['configuracion']['pesos_criterios']
+    criterios = [cal['criterios'] for cal in datos['calificaciones']]
+    resultados["calcular_calificacion_ponderada"] = medir(
+        lambda: [servicios.calcular_calificacion_ponderada(c, pesos) for c in criterios], repeticiones
+    )
+    matriz = puntuacion.matriz_criterios(datos['calificaciones'])
+    resultados["calcular_lote_vectorizado"] = medir(lambda: puntuacion.calcular_lote(matriz, pesos), repeticiones)
+
+    # Vista compartida (registros del modelo): construcción; la memoria y los recorridos se miden aparte
+    resultados["vista_compartida"] = medir(lambda: almacenamiento.congelar_documento(datos), repeticiones)
+    return resultados
+
+def ejecutar_escala(escala, repeticiones):
+    """Genera los datos de una escala y mide cada etapa del flujo de calificación"""
+    usuarios, proyectos, calificaciones = tamanos(escala)
+    datos_generados = generar(usuarios, proyectos, calificaciones, semilla=escala)
+    escribir(datos_generados, os.path.join("datos", "data.json"))
+    del datos_generados
+    almacenamiento.invalidar_cache()
+
+    resultados = {}
+    resultados["cargar_datos"] = medir(almacenamiento.cargar_datos, repeticiones)
+    resultados["guardar_datos"] = medir(almacenamiento.guardar_datos, repeticiones, almacenamiento.cargar_datos)
+
+    # El documento editable se libera al volver, antes de medir sobre la vista compartida
+    datos = almacenamiento.cargar_datos()
+    resultados.update(medir_documento(datos, repeticiones))
+    memoria = bytes_por_calificacion(datos)
+    del datos
+
+    vista = almacenamiento.obtener_datos()
+    resultados["ranking_vista"] = medir(lambda: MotorRanking.desde_datos(vista), repeticiones)
+    resultados["historial_vista"] = medir(lambda: puntuacion.HistorialCalificaciones.desde_datos(vista), repeticiones)
+
+    # Cadena de filtros del dashboard sobre la vista compartida
+    resultados["indices_dashboard"] = medir(
+        lambda: (IndiceBusqueda.desde_datos(vista), IndiceHorarios.desde_datos(vista)), repeticiones
+    )
+    indice_busqueda = IndiceBusqueda.desde_datos(vista)
+    indice_horarios = IndiceHorarios.desde_datos(vista)
+    consulta = ConsultaFiltros(texto="sistema", carrera="Ingeniería en Sistemas", calificacion="calificados")
+
+    def filtrar_y_paginar(motor):
+        filtrados = motor.filtrar(consulta)
+        return PaginadorProyectos().pagina((consulta, frozenset()), filtrados, "Calificación", set(), 1, 25)
+
+    resultados["filtros_dashboard"] = medir(
+        filtrar_y_paginar, repeticiones, lambda: MotorFiltros(vista, indice_busqueda, indice_horarios)
+    )
+
+    # Tabla de calificación de un docente (índices ya construidos, como en un rerun)
+    docente_id = next(u['id'] for u in vista['usuarios'] if u['rol'] == 'docente')
+    concurso.construir_tabla_calificacion(docente_id)
+    resultados["tabla_calificacion"] = medir(lambda: concurso.construir_tabla_calificacion(docente_id), repeticiones)
+
+    return {
+        "usuarios": usuarios,
+        "proyectos": proyectos,
+        "calificaciones": calificaciones,
+        "bytes_vista_por_calificacion": memoria,
+        "benchmarks": resultados
+    }
+
+def commit_actual():
+    """Devuelve el hash corto del commit actual o None si no hay git"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def comparar(actual, anterior):
+    """Imprime la relación de medianas actual/anterior por escala y benchmark"""
+    print(f"\nComparación con {anterior.get('commit')} ({anterior.get('fecha')}):")
+    for escala, resultado in actual["escalas"].items():
+        previo = anterior["escalas"].get(escala)
+        if not previo:
+            continue
+        print(f"  Escala {escala}:")
+        for nombre, estadisticas in resultado["benchmarks"].items():
+            if nombre in previo["benchmarks"]:
+                relacion = estadisticas["mediana"] / previo["benchmarks"][nombre]["mediana"]
+                marca = "⚠️" if relacion > 1.2 else "  "
+                print(f"    {marca} {nombre:35s} x{relacion:.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escalas", type=int, nargs="+", default=[100, 10000])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--salida", default=os.path.join(RAIZ, "benchmarks", "resultados"))
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior")
+    argumentos = parser.parse_args()
+
+    resultado = {
+        "fecha": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "commit": commit_actual(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "escalas": {}
+    }
+
+    directorio_original = os.getcwd()
+    for escala in argumentos.escalas:
+        with tempfile.TemporaryDirectory() as directorio:
+            # Las rutas de config.ARCHIVOS son relativas: cada escala usa su propio datos/
+            os.chdir(directorio)
+            try:
+                print(f"Escala {escala}...", flush=True)
+                resultado["escalas"][str(escala)] = ejecutar_escala(escala, argumentos.repeticiones)
+            finally:
+                os.chdir(directorio_original)
+        for nombre, estadisticas in resultado["escalas"][str(escala)]["benchmarks"].items():
+            print(f"  {nombre:35s} mediana {estadisticas['mediana'] * 1000:10.2f} ms")
+        print(f"  {'vista compartida':35s} {resultado['escalas'][str(escala)]['bytes_vista_por_calificacion']:10.0f} bytes/calificación")
+
+    os.makedirs(argumentos.salida, exist_ok=True)
+    ruta = os.path.join(
+        argumentos.salida,
+        f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{resultado['commit'] or 'sin-git'}.json"
+    )
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump(resultado, archivo, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en {ruta}")
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, 'r', encoding='utf-8') as archivo:
+            comparar(resultado, json.load(archivo))
+
+if __name__ == "__main__":
+    main()
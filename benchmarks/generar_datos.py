@@ -0,0 +1,160 @@
+"""Generador determinista de datos sintéticos con la forma de datos/data.json
+
+Uso:
+    python benchmarks/generar_datos.py --usuarios 50 --proyectos 1000 --calificaciones 5000 --salida sintetico.json
+
+La misma semilla produce siempre el mismo documento. Todos los usuarios
+sintéticos tienen la contraseña 'clave123' (hash SHA-256 antiguo, para no
+pagar el costo de scrypt por usuario al generar).
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+from config import CRITERIOS, CRITERIOS_CALIFICACION
+from ranking import MotorRanking
+
+PASSWORD_SINTETICA = "clave123"
+
+PALABRAS_NOMBRE = [
+    "Sistema", "Gestión", "Plataforma", "Aplicación", "Control", "Monitoreo", "Turnos", "Inventario",
+    "Biblioteca", "Salud", "Deportes", "Agenda", "Energía", "Agua", "Tienda", "Reservas", "Óptica",
+    "Aprendizaje", "Transporte", "Residuos", "Seguridad", "Eventos", "Ventas", "Turismo", "Clínica"
+]
+CONECTORES = ["de", "para", "con", "en"]
+ASIGNATURAS = [
+    "Programación Avanzada", "Base de Datos", "Negocios Electrónicos", "Introducción UNIX",
+    "Ingeniería de Software", "Redes", "Inteligencia Artificial", "Sistemas Operativos"
+]
+CARRERAS = ["Ingeniería en Sistemas", "Ingeniería Industrial", "Administración de Empresas", "Arquitectura"]
+SALAS = ["el Auditorio", "el aula C10", "el aula B2", "el laboratorio 3"]
+FECHAS = ["Jueves, 14 de agosto de 2025", "Viernes, 15 de agosto de 2025"]
+NOMBRES = ["Ana", "Luis", "María", "Jorge", "Lucía", "Pedro", "Sofía", "Diego", "Elena", "Andrés"]
+APELLIDOS = ["Pérez", "Gómez", "Torres", "Jaramillo", "Castillo", "Ortega", "Vega", "Rojas"]
+
+def _nombre_persona(aleatorio):
+    return f"{aleatorio.choice(NOMBRES)} {aleatorio.choice(APELLIDOS)}"
+
+def generar(usuarios, proyectos, calificaciones, semilla=0):
+    """Devuelve un documento con 'usuarios' usuarios, 'proyectos' proyectos y hasta 'calificaciones' calificaciones
+
+    Cada docente califica cada proyecto como máximo una vez, así que las
+    calificaciones se limitan a docentes × proyectos.
+    """
+    aleatorio = random.Random(semilla)
+    password = hashlib.sha256(PASSWORD_SINTETICA.encode()).hexdigest()
+    pesos = {criterio: CRITERIOS_CALIFICACION[criterio]["peso"] for criterio in CRITERIOS}
+
+    lista_usuarios = [{
+        "id": "user_001",
+        "username": "admin",
+        "password": password,
+        "nombre": "Administrador",
+        "email": "admin@universidad.edu",
+        "rol": "admin",
+        "fecha_registro": "2025-08-01"
+    }]
+    for i in range(1, max(usuarios, 2)):
+        lista_usuarios.append({
+            "id": f"user_{i + 1:07d}",
+            "username": f"docente{i}",
+            "password": password,
+            "nombre": _nombre_persona(aleatorio),
+            "email": f"docente{i}@universidad.edu",
+            "rol": "docente",
+            "fecha_registro": "2025-08-01"
+        })
+    docentes = [usuario["id"] for usuario in lista_usuarios if usuario["rol"] == "docente"]
+
+    lista_proyectos = []
+    for i in range(proyectos):
+        inicio = aleatorio.randrange(8, 18)
+        palabras = aleatorio.sample(PALABRAS_NOMBRE, 2)
+        lista_proyectos.append({
+            "id": f"proj_{i + 1:07d}",
+            "nombre": f"{palabras[0]} {aleatorio.choice(CONECTORES)} {palabras[1]} {i + 1}",
+            "asignatura": aleatorio.choice(ASIGNATURAS),
+            "carrera": aleatorio.choice(CARRERAS),
+            "semestre": f"{aleatorio.randrange(1, 10)}vo Semestre",
+            "docente": _nombre_persona(aleatorio),
+            "horas_presentacion": (
+                f"{aleatorio.choice(FECHAS)}, {inicio:02d}:00 a {inicio + 1:02d}:00 en {aleatorio.choice(SALAS)}"
+            ),
+            "estudiantes": [_nombre_persona(aleatorio) for _ in range(aleatorio.randrange(1, 4))],
+            "descripcion": "Proyecto sintético para pruebas de rendimiento",
+            "fecha_registro": "2025-08-10",
+            "calificaciones": [],
+            "calificacion_final": 0
+        })
+
+    lista_calificaciones = []
+    calificaciones = min(calificaciones, len(docentes) * proyectos)
+    for i in range(calificaciones):
+        # En cada ronda todos los proyectos reciben una calificación de un docente distinto
+        ronda, posicion = divmod(i, proyectos)
+        proyecto = lista_proyectos[posicion]
+        docente_id = docentes[(ronda + posicion) % len(docentes)]
+        criterios = {criterio: aleatorio.randrange(0, 11) for criterio in CRITERIOS}
+        ponderada = round(sum(criterios[criterio] * pesos[criterio] / 100 for criterio in CRITERIOS), 2)
+        calificacion = {
+            "id": f"cal_{i + 1:08d}",
+            "proyecto_id": proyecto["id"],
+            "docente_id": docente_id,
+            "criterios": criterios,
+            "calificacion_ponderada": ponderada,
+            "fecha_calificacion": "2025-08-15 12:00:00"
+        }
+        lista_calificaciones.append(calificacion)
+        proyecto["calificaciones"].append(calificacion["id"])
+
+    datos = {
+        "usuarios": lista_usuarios,
+        "proyectos": lista_proyectos,
+        "calificaciones": lista_calificaciones,
+        "configuracion": {
+            "pesos_criterios": pesos,
+            "max_calificacion": 10,
+            "min_calificacion": 0
+        },
+        "ranking": {
+            "fecha_actualizacion": "2025-08-15",
+            "proyectos_ganadores": []
+        },
+        "version": 1
+    }
+    MotorRanking.desde_datos(datos).aplicar(datos)
+    # aplicar() registra la fecha actual; se fija para que el documento sea reproducible
+    datos["ranking"]["fecha_actualizacion"] = "2025-08-15"
+    return datos
+
+def escribir(datos, ruta):
+    """Escribe el documento en 'ruta' con el mismo formato que data.json"""
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump(datos, archivo, indent=2, ensure_ascii=False)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--usuarios", type=int, default=20)
+    parser.add_argument("--proyectos", type=int, default=100)
+    parser.add_argument("--calificaciones", type=int, default=500)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", default="datos_sinteticos.json")
+    argumentos = parser.parse_args()
+
+    datos = generar(argumentos.usuarios, argumentos.proyectos, argumentos.calificaciones, argumentos.semilla)
+    escribir(datos, argumentos.salida)
+    print(f"{argumentos.salida}: {len(datos['usuarios'])} usuarios, {len(datos['proyectos'])} proyectos, "
+          f"{len(datos['calificaciones'])} calificaciones")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Perfil del tiempo de importación (python -X importtime) de los módulos de la aplicación
+
+Uso:
+    python benchmarks/perfil_importacion.py [--modulo concurso] [--top 15] [--salida perfil.json]
+
+Informa el tiempo total de importar el módulo, los módulos más costosos y si
+alguna librería pesada (pandas, numpy, pyarrow, streamlit_option_menu) se
+importó durante el arranque. Termina con código 1 si se importó alguna,
+para poder usarlo como verificación antes de desplegar.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Librerías que no deben cargarse al importar la aplicación (se importan en las páginas que las usan)
+PESADAS = ("pandas", "numpy", "pyarrow", "streamlit_option_menu")
+
+def perfilar(modulo):
+    """Importa 'modulo' en un proceso nuevo con -X importtime y devuelve [(módulo, propio_us, acumulado_us)]"""
+    # streamlit se importa antes para separar su costo del de la aplicación
+    codigo = f"import streamlit, sys; sys.stderr.write('--inicio--\\n'); import {modulo}"
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ, capture_output=True, text=True
+    )
+    if proceso.returncode != 0:
+        raise RuntimeError(proceso.stderr)
+
+    registros = []
+    despues_de_streamlit = False
+    for linea in proceso.stderr.splitlines():
+        if linea == "--inicio--":
+            despues_de_streamlit = True
+            continue
+        if not despues_de_streamlit or not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        registros.append((nombre.strip(), int(propio), int(acumulado)))
+    return registros
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modulo", default="concurso")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--salida", help="Archivo JSON donde guardar el perfil")
+    argumentos = parser.parse_args()
+
+    registros = perfilar(argumentos.modulo)
+    total = next((acumulado for nombre, _, acumulado in registros if nombre == argumentos.modulo), 0)
+    importadas = sorted({nombre.split(".")[0] for nombre, _, _ in registros} & set(PESADAS))
+
+    print(f"Importar {argumentos.modulo} (sin contar streamlit): {total / 1000:.1f} ms")
+    print("Módulos más costosos (acumulado):")
+    for nombre, propio, acumulado in sorted(registros, key=lambda r: r[2], reverse=True)[:argumentos.top]:
+        print(f"  {acumulado / 1000:8.1f} ms  {propio / 1000:8.1f} ms propio  {nombre}")
+    if importadas:
+        print(f"⚠️ Librerías pesadas importadas al arrancar: {', '.join(importadas)}")
+    else:
+        print("✅ Ninguna librería pesada se importa al arrancar")
+
+    if argumentos.salida:
+        with open(argumentos.salida, 'w', encoding='utf-8') as archivo:
+            json.dump({
+                "modulo": argumentos.modulo,
+                "total_ms": total / 1000,
+                "pesadas_importadas": importadas,
+                "modulos": [
+                    {"nombre": nombre, "propio_ms": propio / 1000, "acumulado_ms": acumulado / 1000}
+                    for nombre, propio, acumulado in registros
+                ]
+            }, archivo, indent=2, ensure_ascii=False)
+
+    return 1 if importadas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
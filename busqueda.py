@@ -0,0 +1,137 @@
+import bisect
+import re
+import unicodedata
+from collections import Counter
+
+# Campos indexados y su peso en la puntuación de resultados
+CAMPOS = {
+    "nombre": 3,
+    "asignatura": 1,
+    "carrera": 1
+}
+
+PATRON_PALABRA = re.compile(r"\w+")
+
+def normalizar(texto):
+    """Pasa a minúsculas y quita tildes para comparar sin distinguir acentos"""
+    descompuesto = unicodedata.normalize("NFKD", texto or "")
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).lower()
+
+def tokenizar(texto):
+    """Divide un texto en palabras normalizadas"""
+    return PATRON_PALABRA.findall(normalizar(texto))
+
+class IndiceBusqueda:
+    """Índice invertido de proyectos (palabra → proyectos) con búsqueda por prefijo
+
+    Cada palabra de la consulta debe coincidir (como palabra completa o como
+    prefijo) con alguna palabra de los campos indexados. Los resultados se
+    ordenan por puntuación: peso del campo, con bonificación para coincidencias
+    exactas, y en empate por orden de registro.
+    """
+
+    def __init__(self):
+        self.postings = {campo: {} for campo in CAMPOS}
+        self.tokens = []
+        self.orden = {}
+        self.nombres = {}
+        self.frecuencias = Counter()
+        self.formas = {}
+
+    @classmethod
+    def desde_datos(cls, datos):
+        """Indexa todos los proyectos"""
+        indice = cls()
+        for proyecto in datos['proyectos']:
+            indice.agregar_proyecto(proyecto)
+        return indice
+
+    @classmethod
+    def extender(cls, anterior, datos):
+        """Devuelve un índice nuevo que añade al anterior solo los proyectos recién registrados
+
+        Devuelve None si los proyectos ya indexados cambiaron (hay que reconstruir).
+        """
+        proyectos = datos['proyectos']
+        if len(proyectos) < len(anterior.orden):
+            return None
+        for proyecto in proyectos[:len(anterior.orden)]:
+            if anterior.nombres.get(proyecto['id']) != proyecto.get('nombre', ''):
+                return None
+
+        indice = cls()
+        indice.postings = {
+            campo: {token: set(ids) for token, ids in postings.items()}
+            for campo, postings in anterior.postings.items()
+        }
+        indice.tokens = list(anterior.tokens)
+        indice.orden = dict(anterior.orden)
+        indice.nombres = dict(anterior.nombres)
+        indice.frecuencias = Counter(anterior.frecuencias)
+        indice.formas = dict(anterior.formas)
+
+        for proyecto in proyectos[len(anterior.orden):]:
+            indice.agregar_proyecto(proyecto)
+        return indice
+
+    def agregar_proyecto(self, proyecto):
+        """Indexa los campos de un proyecto"""
+        proyecto_id = proyecto['id']
+        self.orden[proyecto_id] = len(self.orden)
+        self.nombres[proyecto_id] = proyecto.get('nombre', '')
+
+        for campo in CAMPOS:
+            postings = self.postings[campo]
+            for token in tokenizar(proyecto.get(campo, '')):
+                if token not in postings:
+                    postings[token] = set()
+                    if not self._existe(token):
+                        bisect.insort(self.tokens, token)
+                postings[token].add(proyecto_id)
+
+        # Palabras clave para sugerencias (mismo criterio de antes: más de 3 letras)
+        for palabra in proyecto.get('nombre', '').split():
+            token = normalizar(palabra)
+            if len(palabra) > 3:
+                self.frecuencias[token] += 1
+                self.formas.setdefault(token, palabra.lower())
+
+    def _existe(self, token):
+        posicion = bisect.bisect_left(self.tokens, token)
+        return posicion < len(self.tokens) and self.tokens[posicion] == token
+
+    def _con_prefijo(self, prefijo):
+        """Devuelve las palabras indexadas que empiezan por el prefijo"""
+        posicion = bisect.bisect_left(self.tokens, prefijo)
+        coincidencias = []
+        while posicion < len(self.tokens) and self.tokens[posicion].startswith(prefijo):
+            coincidencias.append(self.tokens[posicion])
+            posicion += 1
+        return coincidencias
+
+    def buscar(self, consulta, campos=None):
+        """Devuelve los ids que coinciden con todas las palabras de la consulta, ordenados por relevancia"""
+        campos = campos or tuple(CAMPOS)
+        palabras = tokenizar(consulta)
+        if not palabras:
+            return []
+
+        puntajes = Counter()
+        resultado = None
+        for palabra in palabras:
+            coincidentes = set()
+            for token in self._con_prefijo(palabra):
+                bonificacion = 2 if token == palabra else 1
+                for campo in campos:
+                    for proyecto_id in self.postings[campo].get(token, ()):
+                        puntajes[proyecto_id] += CAMPOS[campo] * bonificacion
+                        coincidentes.add(proyecto_id)
+            resultado = coincidentes if resultado is None else resultado & coincidentes
+            if not resultado:
+                return []
+
+        return sorted(resultado, key=lambda proyecto_id: (-puntajes[proyecto_id], self.orden[proyecto_id]))
+
+    def sugerencias(self, cantidad=5):
+        """Devuelve las palabras clave más frecuentes en los nombres de proyectos"""
+        return [(self.formas[token], frecuencia) for token, frecuencia in self.frecuencias.most_common(cantidad)]
@@ -1,203 +1,61 @@
 import streamlit as st
-import json
-import os
 from datetime import datetime
-import pandas as pd
-from streamlit_option_menu import option_menu
-import hashlib
 
+import sesiones
+from config import CRITERIOS
+import horarios
+from filtros import ConsultaFiltros
+from modelo import lector
+import estilos
+import exportacion
+import rendimiento
+from paginacion import COLUMNAS, CRITERIOS_ORDEN, formatear_fila
+import servicios
+# Datos, índices, ranking y autenticación viven en la capa de servicios compartida con main.py
+from servicios import (
+    obtener_datos, calcular_calificacion_ponderada, autenticar_usuario,
+    obtener_motor_ranking, obtener_indice_calificaciones, obtener_registro_proyectos,
+    obtener_historial_calificaciones, obtener_estadisticas, obtener_indice_horarios,
+    obtener_cola_presentaciones, obtener_indice_busqueda, obtener_motor_filtros, obtener_paginador
+)
 
+# pandas, numpy y streamlit_option_menu se importan dentro de las páginas que los usan:
+# la página de login no los necesita y el arranque en frío no espera por ellos
 
-# CSS mínimo y simple
-st.markdown("""
-<style>
-    .main-header {
-        text-align: center;
-        color: #ffffff;
-        margin-bottom: 2rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
-    }
-    
-    .form-container {
-        background: linear-gradient(135deg, #34495e, #2c3e50);
-        color: white;
-        padding: 2rem;
-        border-radius: 1rem;
-        box-shadow: 0 4px 20px rgba(0,0,0,0.3);
-        margin: 1rem 0;
-        border: 2px solid #3498db;
-    }
-    
-    .ranking-card {
-        background: linear-gradient(135deg, #2c3e50, #34495e);
-        color: white;
-        padding: 2rem;
-        border-radius: 1rem;
-        margin: 1rem 0;
-        text-align: center;
-        border: 2px solid #f39c12;
-        box-shadow: 0 4px 20px rgba(0,0,0,0.3);
-    }
-    
-    .gold-medal {
-        background: linear-gradient(135deg, #FFD700, #FFA500);
-        border-color: #FFD700;
-    }
-    
-    .silver-medal {
-        background: linear-gradient(135deg, #C0C0C0, #A9A9A9);
-        border-color: #C0C0C0;
-    }
-    
-    .bronze-medal {
-        background: linear-gradient(135deg, #CD7F32, #B8860B);
-        border-color: #CD7F32;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Función para cargar datos
-def cargar_datos():
-    """Carga los datos desde el archivo JSON"""
-    try:
-        with open('datos/data.json', 'r', encoding='utf-8') as file:
-            return json.load(file)
-    except FileNotFoundError:
-        # Crear estructura inicial si no existe
-        datos_iniciales = {
-            "usuarios": [
-                {
-                    "id": "user_001",
-                    "username": "admin",
-                    "password": hashlib.sha256("admin123".encode()).hexdigest(),
-                    "nombre": "Administrador",
-                    "email": "admin@universidad.edu",
-                    "rol": "admin",
-                    "fecha_registro": datetime.now().strftime("%Y-%m-%d")
-                }
-            ],
-            "proyectos": [],
-            "calificaciones": [],
-            "configuracion": {
-                "pesos_criterios": {
-                    "innovacion": 30,
-                    "viabilidad": 25,
-                    "impacto": 20,
-                    "ejecucion": 15,
-                    "pitch": 10
-                },
-                "max_calificacion": 10,
-                "min_calificacion": 0
-            },
-            "ranking": {
-                "fecha_actualizacion": datetime.now().strftime("%Y-%m-%d"),
-                "proyectos_ganadores": []
-            }
-        }
-        
-        # Crear directorio si no existe
-        os.makedirs('datos', exist_ok=True)
-        
-        # Guardar datos iniciales
-        with open('datos/data.json', 'w', encoding='utf-8') as file:
-            json.dump(datos_iniciales, file, indent=2, ensure_ascii=False)
-        
-        return datos_iniciales
-
-# Función para guardar datos
-def guardar_datos(datos):
-    """Guarda los datos en el archivo JSON"""
-    with open('datos/data.json', 'w', encoding='utf-8') as file:
-        json.dump(datos, file, indent=2, ensure_ascii=False)
-
-# Función para autenticar usuarios
-def autenticar_usuario(username, password, datos):
-    """Autentica un usuario con username y password"""
-    for usuario in datos['usuarios']:
-        if usuario['username'] == username:
-            hash_almacenado = usuario['password']
-            return hashlib.sha256(password.encode()).hexdigest() == hash_almacenado
-    return False
 
-# Función para generar IDs únicos
-def generar_id(prefix):
-    """Genera un ID único con timestamp"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-    return f"{prefix}_{timestamp}"
+# Colecciones que se pueden exportar desde la gestión de usuarios
+OPCIONES_EXPORTACION = {
+    "Documento completo": "documento",
+    "Proyectos": "proyectos",
+    "Calificaciones": "calificaciones",
+    "Usuarios (sin contraseñas)": "usuarios"
+}
 
-# Función para calcular calificación ponderada
-def calcular_calificacion_ponderada(criterios, pesos):
-    """Calcula la calificación ponderada según los criterios y pesos"""
-    total = 0
-    for criterio, calificacion in criterios.items():
-        if criterio in pesos:
-            # Convertir el peso de porcentaje a decimal y multiplicar por la calificación
-            peso_decimal = pesos[criterio] / 100
-            total += calificacion * peso_decimal
-    return round(total, 2)
+# Opciones de los filtros del dashboard y su código en ConsultaFiltros
+OPCIONES_FILTRO_CALIFICACION = {
+    "Todos los proyectos": None,
+    "Sin calificar": "sin_calificar",
+    "Calificados": "calificados"
+}
+OPCIONES_FILTRO_HORARIO = {
+    "Todos los horarios": None,
+    "En horario": "en_horario",
+    "Fuera de horario": "fuera_horario"
+}
+OPCIONES_FILTRO_INTELIGENTE = {
+    "Sin filtros automáticos": None,
+    "Proyectos prioritarios": "prioritarios",
+    "Proyectos atrasados": "atrasados",
+    "Mejores calificados": "mejores"
+}
 
-# Función para verificar si está en horario de presentación
-def esta_en_horario_presentacion(horas_presentacion):
-    """Verifica si la hora actual está dentro del horario de presentación"""
-    try:
-        if not horas_presentacion or ' - ' not in horas_presentacion:
-            return False
-        
-        hora_inicio_str, hora_fin_str = horas_presentacion.split(' - ')
-        hora_actual = datetime.now().strftime("%H:%M")
-        
-        # Convertir a objetos datetime para comparación
-        hora_inicio_time = datetime.strptime(hora_inicio_str, "%H:%M").time()
-        hora_fin_time = datetime.strptime(hora_fin_str, "%H:%M").time()
-        hora_actual_time = datetime.strptime(hora_actual, "%H:%M").time()
-        
-        return hora_inicio_time <= hora_actual_time <= hora_fin_time
-    except:
-        return False
-
-# Función para actualizar ranking
-def actualizar_ranking(datos):
-    """Actualiza el ranking de proyectos basado en las calificaciones"""
-    # Calcular calificación final para cada proyecto
-    for proyecto in datos['proyectos']:
-        if proyecto['calificaciones']:
-            # Obtener todas las calificaciones del proyecto
-            calificaciones_proyecto = [
-                cal for cal in datos['calificaciones'] 
-                if cal['proyecto_id'] == proyecto['id']
-            ]
-            
-            if calificaciones_proyecto:
-                # Calcular promedio de calificaciones ponderadas
-                calificaciones_ponderadas = [cal['calificacion_ponderada'] for cal in calificaciones_proyecto]
-                proyecto['calificacion_final'] = round(sum(calificaciones_ponderadas) / len(calificaciones_ponderadas), 2)
-            else:
-                proyecto['calificacion_final'] = 0
-        else:
-            proyecto['calificacion_final'] = 0
-    
-    # Ordenar proyectos por calificación final
-    proyectos_ordenados = sorted(
-        [p for p in datos['proyectos'] if p['calificacion_final'] > 0],
-        key=lambda x: x['calificacion_final'],
-        reverse=True
-    )
-    
-    # Actualizar top 3
-    datos['ranking']['proyectos_ganadores'] = []
-    premios = ["🥇 Oro", "🥈 Plata", "🥉 Bronce"]
-    
-    for i, proyecto in enumerate(proyectos_ordenados[:3]):
-        datos['ranking']['proyectos_ganadores'].append({
-            'premio': premios[i],
-            'nombre_proyecto': proyecto['nombre'],
-            'calificacion_final': proyecto['calificacion_final']
-        })
-    
-    datos['ranking']['fecha_actualizacion'] = datetime.now().strftime("%Y-%m-%d")
-    
-    return datos
+# Menú lateral
+def option_menu(*args, **kwargs):
+    """Muestra el menú lateral (streamlit_option_menu se importa solo tras iniciar sesión)"""
+    from streamlit_option_menu import option_menu as menu
+    return menu(*args, **kwargs)
 
+@rendimiento.rerun_medido("concurso")
 def main():
     """Función principal de la aplicación"""
     
@@ -209,26 +67,20 @@ def main():
         initial_sidebar_state="expanded"
     )
     
-    # Ocultar elementos de Streamlit
-    st.markdown("""
-    <style>
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    </style>
-    """, unsafe_allow_html=True)
+    # Estilos y ocultar elementos de Streamlit (un solo bloque ya compactado)
+    estilos.aplicar_estilos("concurso")
     
-    # Cargar datos
-    datos = cargar_datos()
+    # Obtener datos compartidos (solo lectura); las escrituras recargan una copia editable
+    datos = obtener_datos()
     
-    # Verificar autenticación
-    if 'usuario_actual' not in st.session_state:
+    # Verificar autenticación (token firmado en la sesión o en la URL)
+    usuario = sesiones.restaurar_sesion()
+    if usuario is None:
         # Página de login
         mostrar_login(datos)
         return
     
     # Usuario autenticado - mostrar sidebar y contenido
-    usuario = st.session_state.usuario_actual
     
     # Sidebar con menú
     with st.sidebar:
@@ -251,8 +103,8 @@ def main():
             # Administradores ven todas las opciones
             selected = option_menu(
                 menu_title="Menú Principal",
-                options=["Dashboard", "Registrar Proyecto", "Calificar Proyecto", "Ranking", "Usuarios", "Reportes"],
-                icons=["house", "file-earmark-plus", "star", "trophy", "people", "graph-up"],
+                options=["Dashboard", "Registrar Proyecto", "Calificar Proyecto", "Ranking", "Usuarios", "Reportes", "Rendimiento"],
+                icons=["house", "file-earmark-plus", "star", "trophy", "people", "graph-up", "speedometer2"],
                 menu_icon="cast",
                 default_index=0,
             )
@@ -268,9 +120,12 @@ def main():
         
         st.markdown("---")
         
+        # Datos del rerun para la página de Rendimiento
+        rendimiento.anotar(pagina=selected, rol=usuario['rol'])
+        
         # Botón de cerrar sesión
         if st.button(" Cerrar Sesión", use_container_width=True):
-            del st.session_state.usuario_actual
+            sesiones.cerrar_sesion()
             st.rerun()
     
     # Mostrar contenido según la selección
@@ -306,6 +161,13 @@ def main():
         else:
             st.error("❌ Solo los administradores pueden ver reportes")
             st.info("👆 Selecciona otra opción del menú")
+    elif selected == "Rendimiento":
+        # Solo administradores pueden ver los tiempos de ejecución
+        if usuario['rol'] == 'admin':
+            mostrar_rendimiento()
+        else:
+            st.error("❌ Solo los administradores pueden ver el rendimiento")
+            st.info("👆 Selecciona otra opción del menú")
     
     # Botón para reabrir sidebar en móviles
     st.markdown("""
@@ -346,6 +208,7 @@ def main():
     """, unsafe_allow_html=True)
 
 # Funciones para mostrar cada sección
+@rendimiento.medido()
 def mostrar_login(datos):
     """Muestra la página de login"""
     st.markdown('<h1 class="main-header">🔐 Iniciar Sesión</h1>', unsafe_allow_html=True)
@@ -361,10 +224,9 @@ def mostrar_login(datos):
         with col2:
             if st.form_submit_button("🚀 Iniciar Sesión", use_container_width=True):
                 if username and password:
-                    if autenticar_usuario(username, password, datos):
-                        st.session_state.usuario_actual = next(
-                            u for u in datos['usuarios'] if u['username'] == username
-                        )
+                    usuario = autenticar_usuario(username, password, datos)
+                    if usuario:
+                        sesiones.iniciar_sesion(usuario)
                         st.success("✅ ¡Bienvenido!")
                         st.rerun()
                     else:
@@ -384,8 +246,10 @@ def mostrar_login(datos):
         </div>
         """, unsafe_allow_html=True)
 
+@rendimiento.medido()
 def mostrar_dashboard(datos):
     """Muestra el dashboard principal"""
+    import pandas as pd
     st.markdown('<h1 class="main-header">🏠 Dashboard</h1>', unsafe_allow_html=True)
     
     # Mensaje de bienvenida según el rol
@@ -400,11 +264,10 @@ def mostrar_dashboard(datos):
     hora_actual = datetime.now().strftime("%H:%M")
     st.markdown(f"### 🕐 Hora Actual: {hora_actual}")
     
-    # Proyectos en horario de presentación
-    proyectos_en_horario = []
-    for proyecto in datos['proyectos']:
-        if esta_en_horario_presentacion(proyecto.get('horas_presentacion', '00:00 - 00:00')):
-            proyectos_en_horario.append(proyecto)
+    # Proyectos en horario de presentación (una sola consulta al índice por render)
+    indice_horarios = obtener_indice_horarios()
+    ids_en_horario = indice_horarios.presentando()
+    proyectos_en_horario = [p for p in datos['proyectos'] if p['id'] in ids_en_horario]
     
     # Métricas principales
     col1, col2, col3, col4, col5 = st.columns(5)
@@ -420,17 +283,28 @@ def mostrar_dashboard(datos):
         # Botón de descarga del JSON
         # Solo mostrar este botón si el usuario es admin
         if 'usuario_actual' in st.session_state and st.session_state.usuario_actual['rol'] == 'admin':
-            if st.button("📥 Descargar Datos", key="descargar_json", use_container_width=True):
-                # Crear archivo JSON para descarga
-                json_str = json.dumps(datos, indent=2, ensure_ascii=False)
-                st.download_button(
-                    label="💾 Descargar data.json",
-                    data=json_str.encode('utf-8'),
-                    file_name=f"datos_proyectos_{datetime.now().strftime('%Y%m%d_%H%M')}.json",
-                    mime="application/json",
-                    key="download_json"
-                )
+            # El JSON se genera una vez por versión de los datos y solo al pulsar la descarga
+            st.download_button(
+                label="📥 Descargar Datos",
+                data=lambda: exportacion.artefactos.abrir(datos, "documento", "json"),
+                file_name=f"datos_proyectos_{datetime.now().strftime('%Y%m%d_%H%M')}.json",
+                mime="application/json",
+                key="download_json",
+                use_container_width=True
+            )
     
+    # Horarios que no se pudieron interpretar (solo administradores)
+    if indice_horarios.errores and st.session_state.get('usuario_actual', {}).get('rol') == 'admin':
+        with st.expander(f"⚠️ {len(indice_horarios.errores)} proyecto(s) con horario no reconocido"):
+            for proyecto_id, texto, mensaje in indice_horarios.errores:
+                st.markdown(f"• **{proyecto_id}**: {mensaje}")
+
+    # Registros inválidos que la vista compartida omitió (solo administradores)
+    if datos.errores and st.session_state.get('usuario_actual', {}).get('rol') == 'admin':
+        with st.expander(f"⚠️ {len(datos.errores)} registro(s) inválido(s) omitido(s)"):
+            for coleccion, registro_id, mensaje in datos.errores:
+                st.markdown(f"• **{coleccion}** {registro_id}: {mensaje}")
+
     # Búsqueda rápida
     st.markdown("---")
     st.markdown("#### 🔍 **Búsqueda Rápida**")
@@ -458,19 +332,11 @@ def mostrar_dashboard(datos):
                     if len(st.session_state.historial_busquedas) > 10:  # Mantener solo 10 búsquedas
                         st.session_state.historial_busquedas.pop()
                 
-                # Buscar proyecto específico
-                proyecto_encontrado = None
-                proyectos_similares = []
-                
-                for proyecto in datos['proyectos']:
-                    nombre_proyecto = proyecto.get('nombre', '').lower()
-                    busqueda_lower = busqueda_rapida.lower()
-                    
-                    if busqueda_lower in nombre_proyecto:
-                        if not proyecto_encontrado:  # Primer match exacto
-                            proyecto_encontrado = proyecto
-                        else:
-                            proyectos_similares.append(proyecto)
+                # Buscar proyecto específico en el índice (sin tildes, por prefijo y ordenado por relevancia)
+                registro_proyectos = obtener_registro_proyectos()
+                ids_encontrados = obtener_indice_busqueda().buscar(busqueda_rapida, campos=("nombre",))
+                proyecto_encontrado = registro_proyectos.obtener(ids_encontrados[0]) if ids_encontrados else None
+                proyectos_similares = [registro_proyectos.obtener(proyecto_id) for proyecto_id in ids_encontrados[1:]]
                 
                 if proyecto_encontrado:
                     st.success(f"✅ **Proyecto encontrado:** {proyecto_encontrado['nombre']}")
@@ -504,16 +370,8 @@ def mostrar_dashboard(datos):
     with col_sugerencias:
         st.markdown("<br>", unsafe_allow_html=True)
         if st.button("💡 Sugerencias", key="btn_sugerencias", use_container_width=True):
-            # Generar sugerencias basadas en nombres de proyectos
-            nombres_proyectos = [p.get('nombre', '') for p in datos['proyectos']]
-            palabras_clave = []
-            for nombre in nombres_proyectos:
-                palabras = nombre.split()
-                palabras_clave.extend([p.lower() for p in palabras if len(p) > 3])
-            
-            # Contar frecuencia y mostrar más comunes
-            from collections import Counter
-            palabras_frecuentes = Counter(palabras_clave).most_common(5)
+            # Palabras clave más comunes, ya contadas en el índice de búsqueda
+            palabras_frecuentes = obtener_indice_busqueda().sugerencias(5)
             
             st.info("🔍 **Palabras clave populares:**")
             for palabra, frecuencia in palabras_frecuentes:
@@ -552,7 +410,8 @@ def mostrar_dashboard(datos):
             )
             
             # Filtro por asignatura
-            asignaturas_unicas = sorted(list(set([p.get('asignatura', '') for p in datos['proyectos']])))
+            motor_filtros = obtener_motor_filtros()
+            asignaturas_unicas = sorted(motor_filtros.por_asignatura)
             filtro_asignatura = st.selectbox(
                 "📚 Filtrar por asignatura",
                 ["Todas las asignaturas"] + asignaturas_unicas,
@@ -561,7 +420,7 @@ def mostrar_dashboard(datos):
         
         with col_filtros2:
             # Filtro por carrera
-            carreras_unicas = sorted(list(set([p.get('carrera', '') for p in datos['proyectos']])))
+            carreras_unicas = sorted(motor_filtros.por_carrera)
             filtro_carrera = st.selectbox(
                 "🎓 Filtrar por carrera",
                 ["Todas las carreras"] + carreras_unicas,
@@ -571,7 +430,7 @@ def mostrar_dashboard(datos):
             # Filtro por estado de calificación
             filtro_calificacion = st.selectbox(
                 "⭐ Filtrar por calificación",
-                ["Todos los proyectos", "Sin calificar", "Calificados"],
+                list(OPCIONES_FILTRO_CALIFICACION),
                 key="filtro_calificacion"
             )
         
@@ -579,14 +438,14 @@ def mostrar_dashboard(datos):
             # Filtro por estado de horario
             filtro_horario = st.selectbox(
                 "⏰ Filtrar por horario",
-                ["Todos los horarios", "En horario", "Fuera de horario"],
+                list(OPCIONES_FILTRO_HORARIO),
                 key="filtro_horario"
             )
             
             # Filtros automáticos inteligentes
             filtro_inteligente = st.selectbox(
                 "🧠 Filtros Inteligentes",
-                ["Sin filtros automáticos", "Proyectos prioritarios", "Proyectos atrasados", "Mejores calificados"],
+                list(OPCIONES_FILTRO_INTELIGENTE),
                 key="filtro_inteligente"
             )
             
@@ -594,75 +453,16 @@ def mostrar_dashboard(datos):
             if st.button("🗑️ Limpiar Filtros", key="limpiar_filtros", use_container_width=True):
                 st.rerun()
         
-        # Aplicar filtros
-        proyectos_filtrados = datos['proyectos']
-        
-        # Filtro por texto
-        if busqueda_texto and busqueda_texto.strip():
-            proyectos_filtrados = [
-                p for p in proyectos_filtrados 
-                if (busqueda_texto.lower() in p.get('nombre', '').lower() or
-                    busqueda_texto.lower() in p.get('asignatura', '').lower() or
-                    busqueda_texto.lower() in p.get('carrera', '').lower())
-            ]
-        
-        # Filtro por asignatura
-        if filtro_asignatura != "Todas las asignaturas":
-            proyectos_filtrados = [
-                p for p in proyectos_filtrados 
-                if p.get('asignatura', '') == filtro_asignatura
-            ]
-        
-        # Filtro por carrera
-        if filtro_carrera != "Todas las carreras":
-            proyectos_filtrados = [
-                p for p in proyectos_filtrados 
-                if p.get('carrera', '') == filtro_carrera
-            ]
-        
-        # Filtro por calificación
-        if filtro_calificacion == "Sin calificar":
-            proyectos_filtrados = [
-                p for p in proyectos_filtrados 
-                if p.get('calificacion_final', 0) == 0
-            ]
-        elif filtro_calificacion == "Calificados":
-            proyectos_filtrados = [
-                p for p in proyectos_filtrados 
-                if p.get('calificacion_final', 0) > 0
-            ]
-        
-        # Filtro por horario
-        if filtro_horario == "En horario":
-            proyectos_filtrados = [
-                p for p in proyectos_filtrados 
-                if esta_en_horario_presentacion(p.get('horas_presentacion', ''))
-            ]
-        elif filtro_horario == "Fuera de horario":
-            proyectos_filtrados = [
-                p for p in proyectos_filtrados 
-                if not esta_en_horario_presentacion(p.get('horas_presentacion', ''))
-            ]
-        
-        # Filtros inteligentes automáticos
-        if filtro_inteligente == "Proyectos prioritarios":
-            # Proyectos sin calificar que están en horario
-            proyectos_filtrados = [
-                p for p in proyectos_filtrados 
-                if p.get('calificacion_final', 0) == 0 and esta_en_horario_presentacion(p.get('horas_presentacion', ''))
-            ]
-        elif filtro_inteligente == "Proyectos atrasados":
-            # Proyectos sin calificar que están fuera de horario
-            proyectos_filtrados = [
-                p for p in proyectos_filtrados 
-                if p.get('calificacion_final', 0) == 0 and not esta_en_horario_presentacion(p.get('horas_presentacion', ''))
-            ]
-        elif filtro_inteligente == "Mejores calificados":
-            # Proyectos con calificación >= 8.0
-            proyectos_filtrados = [
-                p for p in proyectos_filtrados 
-                if p.get('calificacion_final', 0) >= 8.0
-            ]
+        # Aplicar todos los filtros en una sola pasada (resultado memorizado por consulta y versión)
+        consulta_filtros = ConsultaFiltros(
+            texto=busqueda_texto.strip() if busqueda_texto else "",
+            asignatura=None if filtro_asignatura == "Todas las asignaturas" else filtro_asignatura,
+            carrera=None if filtro_carrera == "Todas las carreras" else filtro_carrera,
+            calificacion=OPCIONES_FILTRO_CALIFICACION[filtro_calificacion],
+            horario=OPCIONES_FILTRO_HORARIO[filtro_horario],
+            inteligente=OPCIONES_FILTRO_INTELIGENTE[filtro_inteligente]
+        )
+        proyectos_filtrados = motor_filtros.filtrar(consulta_filtros)
         
         # Mostrar resumen de filtros aplicados
         filtros_activos = []
@@ -729,16 +529,9 @@ def mostrar_dashboard(datos):
             st.info(f"📊 Mostrando todos los **{len(proyectos_filtrados)}** proyectos")
         
         if proyectos_filtrados:
-            # Crear DataFrame
-            proyectos_df = pd.DataFrame(proyectos_filtrados)
-            proyectos_df['Estado Horario'] = proyectos_df['horas_presentacion'].apply(
-                lambda x: '🟢 En Horario' if esta_en_horario_presentacion(x) else '🔴 Fuera de Horario'
-            )
-            
-            # Agregar columna de calificación formateada
-            proyectos_df['Calificación'] = proyectos_df['calificacion_final'].apply(
-                lambda x: f"{x:.1f}/10" if x > 0 else "Sin calificar"
-            )
+            # El resultado se identifica por la consulta y el estado de horario actual
+            paginador = obtener_paginador()
+            clave_resultado = (consulta_filtros, frozenset(ids_en_horario))
             
             # Opciones de ordenamiento
             st.markdown("#### 📊 **Opciones de Visualización**")
@@ -747,77 +540,70 @@ def mostrar_dashboard(datos):
             with col_orden:
                 ordenar_por = st.selectbox(
                     "🔄 Ordenar por:",
-                    ["Nombre", "Asignatura", "Carrera", "Calificación", "Estado Horario"],
+                    list(CRITERIOS_ORDEN),
                     key="ordenar_por"
                 )
-                
-                # Mapear nombres de columnas
-                mapeo_orden = {
-                    "Nombre": "nombre",
-                    "Asignatura": "asignatura", 
-                    "Carrera": "carrera",
-                    "Calificación": "calificacion_final",
-                    "Estado Horario": "Estado Horario"
-                }
-                
-                # Aplicar ordenamiento
-                if ordenar_por in mapeo_orden:
-                    columna_orden = mapeo_orden[ordenar_por]
-                    if columna_orden == "Estado Horario":
-                        # Ordenar por estado de horario (En Horario primero)
-                        try:
-                            proyectos_df = proyectos_df.sort_values(
-                                by="Estado Horario", 
-                                key=lambda x: x.map({'🟢 En Horario': 0, '🔴 Fuera de Horario': 1})
-                            )
-                        except:
-                            # Si falla el ordenamiento, ordenar alfabéticamente
-                            proyectos_df = proyectos_df.sort_values("Estado Horario")
-                    else:
-                        try:
-                            proyectos_df = proyectos_df.sort_values(columna_orden)
-                        except:
-                            # Si falla el ordenamiento, no hacer nada
-                            pass
             
             with col_export:
-                # Botón de exportación
-                if st.button("📥 Exportar CSV", key="exportar_csv", use_container_width=True):
-                    csv_data = proyectos_df.to_csv(index=False).encode('utf-8')
-                    st.download_button(
-                        label="💾 Descargar CSV",
-                        data=csv_data,
-                        file_name=f"proyectos_filtrados_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-                        mime="text/csv",
-                        key="download_csv"
-                    )
-            
-            # Mostrar columnas relevantes
-            columnas_mostrar = ['nombre', 'asignatura', 'carrera', 'horas_presentacion', 'Estado Horario', 'Calificación']
-            proyectos_df_display = proyectos_df[columnas_mostrar].copy()
-            proyectos_df_display.columns = ['Nombre', 'Asignatura', 'Carrera', 'Horario', 'Estado Horario', 'Calificación']
+                # El CSV se escribe por partes solo cuando se pulsa la descarga
+                def csv_filtrado():
+                    proyectos_ordenados = paginador.ordenar(clave_resultado, proyectos_filtrados, ordenar_por, ids_en_horario)
+                    campos = exportacion.columnas(proyectos_ordenados) + ['Estado Horario', 'Calificación']
+
+                    def filas():
+                        for p in proyectos_ordenados:
+                            # Una sola llamada a formatear_fila por proyecto
+                            formateada = formatear_fila(p, ids_en_horario)
+                            yield dict(p, **{
+                                'Estado Horario': formateada['Estado Horario'],
+                                'Calificación': formateada['Calificación']
+                            })
+
+                    return b"".join(exportacion.fragmentos_csv(filas(), campos))
+                
+                st.download_button(
+                    label="📥 Exportar CSV",
+                    data=csv_filtrado,
+                    file_name=f"proyectos_filtrados_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
+                    mime="text/csv",
+                    key="download_csv",
+                    use_container_width=True
+                )
             
             # Mostrar tabla con paginación
             st.markdown("#### 📋 **Resultados de la Búsqueda**")
             
             # Paginación
+            total_proyectos = len(proyectos_filtrados)
             items_por_pagina = st.selectbox("📄 Proyectos por página:", [10, 25, 50, 100], key="items_por_pagina")
-            total_paginas = (len(proyectos_df_display) + items_por_pagina - 1) // items_por_pagina
+            total_paginas = (total_proyectos + items_por_pagina - 1) // items_por_pagina
             
+            pagina_actual = 1
             if total_paginas > 1:
                 pagina_actual = st.selectbox(f"📖 Página (de {total_paginas}):", 
                                            range(1, total_paginas + 1), 
-                                           key="pagina_actual")
+                                           key="pagina_dashboard")
                 inicio = (pagina_actual - 1) * items_por_pagina
                 fin = inicio + items_por_pagina
-                proyectos_pagina = proyectos_df_display.iloc[inicio:fin]
                 
-                st.info(f"📄 Mostrando proyectos {inicio + 1} a {min(fin, len(proyectos_df_display))} de {len(proyectos_df_display)}")
-            else:
-                proyectos_pagina = proyectos_df_display
+                st.info(f"📄 Mostrando proyectos {inicio + 1} a {min(fin, total_proyectos)} de {total_proyectos}")
+            
+            # Solo se ordenan claves ligeras y se formatean las filas de la página visible
+            filas_pagina = paginador.pagina(
+                clave_resultado, proyectos_filtrados, ordenar_por, ids_en_horario,
+                pagina_actual, items_por_pagina
+            )
+            inicio = (pagina_actual - 1) * items_por_pagina
+            with rendimiento.tramo("pandas.DataFrame"):
+                proyectos_pagina = pd.DataFrame(
+                    filas_pagina,
+                    columns=COLUMNAS,
+                    index=range(inicio, inicio + len(filas_pagina))
+                )
             
             # Mostrar tabla
-            st.dataframe(proyectos_pagina, use_container_width=True)
+            with rendimiento.tramo("st.dataframe"):
+                st.dataframe(proyectos_pagina, use_container_width=True)
             
             # Estadísticas de la búsqueda
             if filtros_activos:
@@ -830,7 +616,7 @@ def mostrar_dashboard(datos):
                     calificados = len([p for p in proyectos_filtrados if p.get('calificacion_final', 0) > 0])
                     st.metric("⭐ Proyectos Calificados", calificados)
                 with col_stats3:
-                    en_horario = len([p for p in proyectos_filtrados if esta_en_horario_presentacion(p.get('horas_presentacion', ''))])
+                    en_horario = len([p for p in proyectos_filtrados if p['id'] in ids_en_horario])
                     st.metric("⏰ En Horario", en_horario)
                 with col_stats4:
                     if len(proyectos_filtrados) > 0:
@@ -853,6 +639,7 @@ def mostrar_dashboard(datos):
     else:
         st.info("No hay proyectos registrados aún")
         
+@rendimiento.medido()
 def mostrar_registro_proyecto(datos):
     """Muestra el formulario de registro de proyectos"""
     st.markdown('<h1 class="main-header">📝 Registrar Nuevo Proyecto</h1>', unsafe_allow_html=True)
@@ -887,9 +674,18 @@ def mostrar_registro_proyecto(datos):
         descripcion = st.text_area("Descripción del Proyecto", placeholder="Describe brevemente tu proyecto...")
         
         if st.form_submit_button("💾 Registrar Proyecto", use_container_width=True):
-            if nombre and asignatura and carrera and estudiantes:
-                nuevo_proyecto = {
-                    "id": generar_id("proj"),
+            # Interpretar el turno (fecha, horario, sala) una sola vez al registrar
+            try:
+                turno = horarios.parsear_turno(horas_presentacion)
+                error_horario = None
+            except horarios.ErrorHorario as error:
+                turno = None
+                error_horario = str(error)
+            
+            if error_horario:
+                st.error(f"❌ {error_horario}")
+            elif nombre and asignatura and carrera and estudiantes:
+                servicios.registrar_proyecto({
                     "nombre": nombre,
                     "asignatura": asignatura,
                     "carrera": carrera,
@@ -897,14 +693,8 @@ def mostrar_registro_proyecto(datos):
                     "docente": docente,
                     "horas_presentacion": horas_presentacion,
                     "estudiantes": estudiantes,
-                    "descripcion": descripcion,
-                    "fecha_registro": datetime.now().strftime("%Y-%m-%d"),
-                    "calificaciones": [],
-                    "calificacion_final": 0
-                }
-                
-                datos["proyectos"].append(nuevo_proyecto)
-                guardar_datos(datos)
+                    "descripcion": descripcion
+                }, turno)
                 
                 st.success("✅ Proyecto registrado exitosamente!")
                 st.rerun()
@@ -913,6 +703,7 @@ def mostrar_registro_proyecto(datos):
         
         st.markdown('</div>', unsafe_allow_html=True)
     
+@rendimiento.medido()
 def mostrar_calificacion_proyecto(datos):
     """Muestra la sección de calificación de proyectos"""
     # colocamos un boton que lleve al dashboard
@@ -937,10 +728,7 @@ def mostrar_calificacion_proyecto(datos):
     # Verificar si hay un proyecto seleccionado
     if 'proyecto_seleccionado' in st.session_state:
         # Buscar el proyecto seleccionado
-        proyecto_seleccionado = next(
-            (p for p in datos['proyectos'] if p['id'] == st.session_state.proyecto_seleccionado), 
-            None
-        )
+        proyecto_seleccionado = obtener_registro_proyectos().obtener(st.session_state.proyecto_seleccionado)
         
         if proyecto_seleccionado:
             # Header del proyecto seleccionado
@@ -951,7 +739,7 @@ def mostrar_calificacion_proyecto(datos):
             st.markdown(f"**Carrera:** {proyecto_seleccionado['carrera']}")
             st.markdown(f"**Estudiantes:** {', '.join(proyecto_seleccionado['estudiantes'])}")
             st.markdown(f"**Horario:** {proyecto_seleccionado.get('horas_presentacion', 'Sin horario asignado')}")
-            st.markdown(f"**Estado:** {'🟢 En Horario de Presentación' if esta_en_horario_presentacion(proyecto_seleccionado.get('horas_presentacion', '00:00 - 00:00')) else '🔴 Fuera de Horario'}")
+            st.markdown(f"**Estado:** {'🟢 En Horario de Presentación' if obtener_indice_horarios().en_horario(proyecto_seleccionado['id']) else '🔴 Fuera de Horario'}")
             st.markdown('</div>', unsafe_allow_html=True)
             
             st.markdown("---")
@@ -1050,30 +838,21 @@ def mostrar_calificacion_proyecto(datos):
                 col_submit1, col_submit2, col_submit3 = st.columns([1, 2, 1])
                 with col_submit2:
                     if st.form_submit_button("Enviar Calificación", use_container_width=True):
-                        nueva_calificacion = {
-                            "id": generar_id("cal"),
-                            "proyecto_id": proyecto_seleccionado['id'],
-                            "docente_id": st.session_state.usuario_actual['id'],
-                            "fecha_calificacion": datetime.now().strftime("%Y-%m-%d"),
-                            "criterios": criterios,
-                            "calificacion_ponderada": calificacion_ponderada,
-                            "comentarios": comentarios
-                        }
-                        
-                        datos["calificaciones"].append(nueva_calificacion)
-                        
-                        # Actualizar proyecto
-                        proyecto_seleccionado["calificaciones"].append(nueva_calificacion["id"])
-                        
-                        # Actualizar ranking
-                        datos = actualizar_ranking(datos)
-                        
-                        guardar_datos(datos)
-                        
-                        st.success("Calificación enviada exitosamente!")
-                        # Limpiar selección y volver a la tabla
-                        del st.session_state.proyecto_seleccionado
-                        st.rerun()
+                        # Persiste la calificación y reubica el proyecto en el ranking
+                        try:
+                            servicios.registrar_calificacion(
+                                proyecto_seleccionado['id'],
+                                st.session_state.usuario_actual['id'],
+                                criterios,
+                                comentarios
+                            )
+                        except servicios.ErrorRegistro as error:
+                            st.error(f"❌ {error}")
+                        else:
+                            st.success("Calificación enviada exitosamente!")
+                            # Limpiar selección y volver a la tabla
+                            del st.session_state.proyecto_seleccionado
+                            st.rerun()
                 
                 st.markdown('</div>', unsafe_allow_html=True)
         
@@ -1100,104 +879,70 @@ def mostrar_calificacion_proyecto(datos):
                 # No modificar session_state directamente, usar rerun
                 st.rerun()
         
-        # Filtrar proyectos según búsqueda
-        proyectos_para_filtrar = datos['proyectos']
-        if busqueda_calificar and busqueda_calificar.strip():
-            proyectos_para_filtrar = [
-                p for p in datos['proyectos'] 
-                if busqueda_calificar.lower() in p['nombre'].lower()
-            ]
+        # La cola ya está ordenada por turno de presentación (fecha y hora de inicio)
+        cola_presentaciones = obtener_cola_presentaciones()
+        registro_proyectos = obtener_registro_proyectos()
+        indice_calificaciones = obtener_indice_calificaciones()
+        docente_id = st.session_state.usuario_actual['id']
+        
+        def pendiente(proyecto_id):
+            return not indice_calificaciones.ya_calificado(docente_id, proyecto_id)
+        
+        # Próximo proyecto a calificar según la hora actual
+        siguiente_id = cola_presentaciones.siguiente(pendiente)
+        if siguiente_id is not None:
+            siguiente = registro_proyectos.obtener(siguiente_id)
+            turno = cola_presentaciones.turnos.get(siguiente_id)
+            detalle_turno = ""
+            if turno is not None:
+                detalle_turno = f" — {turno.texto_horario()}"
+                if turno.fecha:
+                    detalle_turno += f" del {datetime.strptime(turno.fecha, '%Y-%m-%d').strftime('%d/%m/%Y')}"
+                if turno.sala:
+                    detalle_turno += f" en {turno.sala}"
+            col_siguiente, col_boton_siguiente = st.columns([3, 1])
+            with col_siguiente:
+                st.info(f"⏭️ **Siguiente:** {siguiente['nombre']}{detalle_turno}")
+            with col_boton_siguiente:
+                if st.button("⭐ Calificar siguiente", key="calificar_siguiente", use_container_width=True):
+                    st.session_state.proyecto_seleccionado = siguiente_id
+                    st.rerun()
         
-        # Crear DataFrame para la tabla
-        proyectos_tabla = []
-        for proyecto in proyectos_para_filtrar:
-            # Verificar si ya fue calificado por este usuario
-            ya_calificado = any(
-                cal['docente_id'] == st.session_state.usuario_actual['id'] and 
-                cal['proyecto_id'] == proyecto['id']
-                for cal in datos['calificaciones']
-            )
-            
-            proyectos_tabla.append({
-                'Hora de Exposición': proyecto.get('horas_presentacion', 'Sin horario asignado'),
-                'Nombre del Proyecto': proyecto['nombre'],
-                'Asignatura': proyecto['asignatura'],
-                'Carrera': proyecto['carrera'],
-                'Estado': 'Ya Calificado' if ya_calificado else 'Pendiente',
-                'Acción': '' if ya_calificado else 'Calificar'
-            })
+        # Filas de la tabla en orden de presentación, filtradas por la búsqueda
+        proyectos_tabla = construir_tabla_calificacion(docente_id, busqueda_calificar)
         
         # Mostrar resultados de búsqueda
         if busqueda_calificar and busqueda_calificar.strip():
             st.info(f"🔍 Mostrando {len(proyectos_tabla)} proyecto(s) que contiene(n) '{busqueda_calificar}'")
         
-        # Ordenar por hora de exposición
-        def ordenar_por_hora(proyecto):
-            try:
-                hora = proyecto['Hora de Exposición']
-                if ' - ' in hora and hora != 'Sin horario asignado':
-                    return datetime.strptime(hora.split(' - ')[0], '%H:%M')
-                else:
-                    return datetime.max
-            except:
-                return datetime.max
-        
-        proyectos_tabla.sort(key=ordenar_por_hora)
-        
         # Mostrar tabla
         if proyectos_tabla:
-            # Crear columnas para la tabla
-            col_hora, col_nombre, col_asignatura, col_carrera, col_estado, col_accion = st.columns([1, 2, 1, 1, 1, 1])
+            # Modo de vista y tamaño de página: limitan cuántos widgets se envían al navegador
+            col_modo, col_filas, col_pagina = st.columns([2, 1, 1])
+            with col_modo:
+                modo_tabla = st.radio(
+                    "Vista de la tabla",
+                    ["Compacta", "Detallada"],
+                    horizontal=True,
+                    key="modo_tabla_calificar",
+                    help="La vista compacta muestra una sola tabla con una columna para elegir el proyecto"
+                )
+            with col_filas:
+                filas_por_pagina = st.selectbox("Filas por página", [25, 50, 100, 200], key="filas_por_pagina_calificar")
             
-            # Header de la tabla
-            with col_hora:
-                st.markdown("**Hora de Exposición**")
-            with col_nombre:
-                st.markdown("**Nombre del Proyecto**")
-            with col_asignatura:
-                st.markdown("**Asignatura**")
-            with col_carrera:
-                st.markdown("**Carrera**")
-            with col_estado:
-                st.markdown("**Estado**")
-            with col_accion:
-                st.markdown("**Acción**")
+            total_paginas = (len(proyectos_tabla) + filas_por_pagina - 1) // filas_por_pagina
+            pagina_tabla = 1
+            with col_pagina:
+                if total_paginas > 1:
+                    pagina_tabla = st.selectbox(f"Página (de {total_paginas})", range(1, total_paginas + 1), key="pagina_calificar")
             
-            st.markdown("---")
+            inicio_tabla = (pagina_tabla - 1) * filas_por_pagina
+            filas_visibles = proyectos_tabla[inicio_tabla:inicio_tabla + filas_por_pagina]
             
-            # Filas de la tabla
-            for i, proyecto in enumerate(proyectos_tabla):
-                col_hora, col_nombre, col_asignatura, col_carrera, col_estado, col_accion = st.columns([1, 2, 1, 1, 1, 1])
-                
-                with col_hora:
-                    st.write(proyecto['Hora de Exposición'])
-                with col_nombre:
-                    st.write(proyecto['Nombre del Proyecto'])
-                with col_asignatura:
-                    st.write(proyecto['Asignatura'])
-                with col_carrera:
-                    st.write(proyecto['Carrera'])
-                with col_estado:
-                    if proyecto['Estado'] == 'Ya Calificado':
-                        st.success(proyecto['Estado'])
-                    else:
-                        st.info(proyecto['Estado'])
-                with col_accion:
-                    if proyecto['Acción'] == 'Calificar':
-                        # Buscar el proyecto original para obtener el ID
-                        proyecto_original = next((p for p in datos['proyectos'] if p['nombre'] == proyecto['Nombre del Proyecto']), None)
-                        if proyecto_original and 'id' in proyecto_original:
-                            if st.button("⭐ Calificar", key=f"calificar_{proyecto_original['id']}_{i}", use_container_width=True):
-                                st.session_state.proyecto_seleccionado = proyecto_original['id']
-                                st.rerun()
-                        else:
-                            st.warning("⚠️ ID del proyecto no encontrado")
-                    else:
-                        st.write("")
-                
-                # Separador entre filas
-                if i < len(proyectos_tabla) - 1:
-                    st.markdown("---")
+            if modo_tabla == "Compacta":
+                mostrar_tabla_calificacion_compacta(filas_visibles, pagina_tabla)
+            else:
+                mostrar_tabla_calificacion_detallada(filas_visibles)
             
             # Estadísticas
             st.markdown("---")
@@ -1220,19 +965,140 @@ def mostrar_calificacion_proyecto(datos):
             else:
                 st.info("No hay proyectos registrados para mostrar")
 
+@rendimiento.medido()
+def construir_tabla_calificacion(docente_id, busqueda=None):
+    """Devuelve las filas de la tabla de calificación del docente, en orden de presentación"""
+    cola_presentaciones = obtener_cola_presentaciones()
+    registro_proyectos = obtener_registro_proyectos()
+    indice_calificaciones = obtener_indice_calificaciones()
+    
+    proyectos = [registro_proyectos.obtener(proyecto_id) for proyecto_id in cola_presentaciones.ordenados()]
+    if busqueda and busqueda.strip():
+        proyectos = [p for p in proyectos if busqueda.lower() in p['nombre'].lower()]
+    
+    filas = []
+    for proyecto in proyectos:
+        # Verificar si ya fue calificado por este usuario (consulta O(1) al índice)
+        ya_calificado = indice_calificaciones.ya_calificado(docente_id, proyecto['id'])
+        
+        filas.append({
+            'id': proyecto['id'],
+            'Hora de Exposición': proyecto.get('horas_presentacion', 'Sin horario asignado'),
+            'Nombre del Proyecto': proyecto['nombre'],
+            'Asignatura': proyecto['asignatura'],
+            'Carrera': proyecto['carrera'],
+            'Estado': 'Ya Calificado' if ya_calificado else 'Pendiente',
+            'Acción': '' if ya_calificado else 'Calificar'
+        })
+    return filas
+
+def mostrar_tabla_calificacion_compacta(filas, pagina):
+    """Muestra las filas como una sola tabla editable con una columna para elegir el proyecto"""
+    import pandas as pd
+    with rendimiento.tramo("pandas.DataFrame"):
+        tabla_df = pd.DataFrame([
+            {
+                'Calificar': False,
+                'Hora de Exposición': fila['Hora de Exposición'],
+                'Nombre del Proyecto': fila['Nombre del Proyecto'],
+                'Asignatura': fila['Asignatura'],
+                'Carrera': fila['Carrera'],
+                'Estado': fila['Estado']
+            }
+            for fila in filas
+        ])
+    
+    clave_tabla = f"tabla_calificar_{pagina}"
+    with rendimiento.tramo("st.data_editor"):
+        tabla_editada = st.data_editor(
+            tabla_df,
+            key=clave_tabla,
+            hide_index=True,
+            use_container_width=True,
+            disabled=[columna for columna in tabla_df.columns if columna != 'Calificar'],
+            column_config={
+                'Calificar': st.column_config.CheckboxColumn("⭐ Calificar", help="Marca el proyecto que vas a calificar")
+            }
+        )
+    
+    # La posición de la fila marcada lleva directamente al id del proyecto
+    for posicion in tabla_editada.index[tabla_editada['Calificar']].tolist():
+        fila = filas[posicion]
+        if fila['Acción'] == 'Calificar':
+            del st.session_state[clave_tabla]
+            st.session_state.proyecto_seleccionado = fila['id']
+            st.rerun()
+        else:
+            st.warning(f"⚠️ Ya calificaste '{fila['Nombre del Proyecto']}'")
+
+def mostrar_tabla_calificacion_detallada(filas):
+    """Muestra las filas con columnas y un botón 'Calificar' por proyecto"""
+    # Crear columnas para la tabla
+    col_hora, col_nombre, col_asignatura, col_carrera, col_estado, col_accion = st.columns([1, 2, 1, 1, 1, 1])
+    
+    # Header de la tabla
+    with col_hora:
+        st.markdown("**Hora de Exposición**")
+    with col_nombre:
+        st.markdown("**Nombre del Proyecto**")
+    with col_asignatura:
+        st.markdown("**Asignatura**")
+    with col_carrera:
+        st.markdown("**Carrera**")
+    with col_estado:
+        st.markdown("**Estado**")
+    with col_accion:
+        st.markdown("**Acción**")
+    
+    st.markdown("---")
+    
+    # Filas de la tabla
+    for i, proyecto in enumerate(filas):
+        col_hora, col_nombre, col_asignatura, col_carrera, col_estado, col_accion = st.columns([1, 2, 1, 1, 1, 1])
+        
+        with col_hora:
+            st.write(proyecto['Hora de Exposición'])
+        with col_nombre:
+            st.write(proyecto['Nombre del Proyecto'])
+        with col_asignatura:
+            st.write(proyecto['Asignatura'])
+        with col_carrera:
+            st.write(proyecto['Carrera'])
+        with col_estado:
+            if proyecto['Estado'] == 'Ya Calificado':
+                st.success(proyecto['Estado'])
+            else:
+                st.info(proyecto['Estado'])
+        with col_accion:
+            if proyecto['Acción'] == 'Calificar':
+                # La fila lleva el id del proyecto, sin buscarlo por nombre
+                if st.button("⭐ Calificar", key=f"calificar_{proyecto['id']}", use_container_width=True):
+                    st.session_state.proyecto_seleccionado = proyecto['id']
+                    st.rerun()
+            else:
+                st.write("")
+        
+        # Separador entre filas
+        if i < len(filas) - 1:
+            st.markdown("---")
+
+@rendimiento.medido()
 def mostrar_ranking(datos):
     """Muestra el ranking de proyectos"""
+    import pandas as pd
     st.markdown('<h1 class="main-header">Ranking de Proyectos</h1>', unsafe_allow_html=True)
     
-    # Actualizar ranking
-    datos = actualizar_ranking(datos)
-    guardar_datos(datos)
+    # Persistir el ranking solo si lo guardado está desactualizado
+    servicios.sincronizar_ranking(datos)
+    motor_ranking = obtener_motor_ranking()
+    
+    ganadores = motor_ranking.ganadores()
     
-    if datos['ranking']['proyectos_ganadores']:
+    if ganadores:
         st.markdown("### Podium de Ganadores")
         
         # Top 3 con medallas
-        for i, ganador in enumerate(datos['ranking']['proyectos_ganadores']):
+        for i, ganador in enumerate(ganadores):
             if i == 0:  # Oro
                 st.markdown(f"""
                 <div class="ranking-card gold-medal">
@@ -1277,11 +1143,11 @@ def mostrar_ranking(datos):
                 # No modificar session_state directamente, usar rerun
                 st.rerun()
         
-        proyectos_ordenados = sorted(
-            [p for p in datos['proyectos'] if p['calificacion_final'] > 0],
-            key=lambda x: x['calificacion_final'],
-            reverse=True
-        )
+        # Orden ya mantenido por el motor de ranking
+        proyectos_ordenados = [
+            dict(motor_ranking.proyectos[proyecto_id], calificacion_final=motor_ranking.calificacion_final(proyecto_id))
+            for proyecto_id in motor_ranking.ordenados()
+        ]
         
         # Filtrar proyectos según búsqueda
         if busqueda_ranking and busqueda_ranking.strip():
@@ -1295,12 +1161,14 @@ def mostrar_ranking(datos):
             st.info(f"🔍 Mostrando {len(proyectos_ordenados)} proyecto(s) que contiene(n) '{busqueda_ranking}'")
         
         if proyectos_ordenados:
-            ranking_df = pd.DataFrame(proyectos_ordenados)
-            ranking_df['Posición'] = range(1, len(proyectos_ordenados) + 1)
-            ranking_df = ranking_df[['Posición', 'nombre', 'asignatura', 'carrera', 'calificacion_final']]
-            ranking_df.columns = ['Posición', 'Proyecto', 'Asignatura', 'Carrera', 'Calificación Final']
+            with rendimiento.tramo("pandas.DataFrame"):
+                ranking_df = pd.DataFrame(proyectos_ordenados)
+                ranking_df['Posición'] = range(1, len(proyectos_ordenados) + 1)
+                ranking_df = ranking_df[['Posición', 'nombre', 'asignatura', 'carrera', 'calificacion_final']]
+                ranking_df.columns = ['Posición', 'Proyecto', 'Asignatura', 'Carrera', 'Calificación Final']
             
-            st.dataframe(ranking_df, use_container_width=True)
+            with rendimiento.tramo("st.dataframe"):
+                st.dataframe(ranking_df, use_container_width=True)
         else:
             if busqueda_ranking and busqueda_ranking.strip():
                 st.warning(f"❌ No se encontraron proyectos que contengan '{busqueda_ranking}' en el ranking")
@@ -1309,24 +1177,37 @@ def mostrar_ranking(datos):
     else:
         st.info("No hay proyectos calificados aún para mostrar el ranking")
     
+@rendimiento.medido()
 def mostrar_usuarios(datos):
     """Muestra la gestión de usuarios"""
+    import pandas as pd
     st.markdown('<h1 class="main-header">Gestión de Usuarios</h1>', unsafe_allow_html=True)
     
     # Botón de descarga de datos (solo para administradores)
     if st.session_state.usuario_actual['rol'] == 'admin':
-        col_descarga, col_spacer = st.columns([1, 3])
+        col_coleccion, col_formato, col_gzip, col_descarga = st.columns([2, 1, 1, 2])
+        with col_coleccion:
+            coleccion = st.selectbox("Datos a exportar", list(OPCIONES_EXPORTACION), key="exportar_coleccion")
+        with col_formato:
+            formatos = exportacion.formatos_disponibles(OPCIONES_EXPORTACION[coleccion])
+            formato = st.selectbox("Formato", formatos, format_func=str.upper, key="exportar_formato")
+        with col_gzip:
+            st.markdown("<br>", unsafe_allow_html=True)  # Espaciado vertical
+            usar_gzip = st.checkbox("Comprimir (gzip)", key="exportar_gzip")
         with col_descarga:
-            if st.button("📥 Descargar Datos Completos", key="descargar_datos_completos", use_container_width=True):
-                # Crear archivo JSON para descarga
-                json_str = json.dumps(datos, indent=2, ensure_ascii=False)
-                st.download_button(
-                    label="💾 Descargar data.json",
-                    data=json_str.encode('utf-8'),
-                    file_name=f"datos_completos_{datetime.now().strftime('%Y%m%d_%H%M')}.json",
-                    mime="application/json",
-                    key="download_datos_completos"
-                )
+            st.markdown("<br>", unsafe_allow_html=True)  # Espaciado vertical
+            # El archivo se genera una vez por versión de los datos y solo al pulsar la descarga
+            nombre_coleccion = OPCIONES_EXPORTACION[coleccion]
+            st.download_button(
+                label="📥 Descargar Datos Completos",
+                data=lambda: exportacion.artefactos.abrir(datos, nombre_coleccion, formato, usar_gzip),
+                file_name=exportacion.nombre_archivo(
+                    f"{nombre_coleccion}_{datetime.now().strftime('%Y%m%d_%H%M')}", formato, usar_gzip
+                ),
+                mime=exportacion.tipo_mime(formato, usar_gzip),
+                key="download_datos_completos",
+                use_container_width=True
+            )
     
     st.markdown("---")
     
@@ -1348,23 +1229,12 @@ def mostrar_usuarios(datos):
             
             if st.form_submit_button("Registrar Usuario", use_container_width=True):
                 if username and password and nombre and email:
-                    # Verificar si el usuario ya existe
-                    if any(u['username'] == username for u in datos['usuarios']):
-                        st.error("El usuario ya existe")
+                    # La verificación de usuario existente se hace al guardar, sobre los datos más recientes
+                    try:
+                        servicios.registrar_usuario(username, password, nombre, email, rol)
+                    except servicios.ErrorRegistro as error:
+                        st.error(str(error))
                     else:
-                        nuevo_usuario = {
-                            "id": generar_id("user"),
-                            "username": username,
-                            "password": hashlib.sha256(password.encode()).hexdigest(),
-                            "nombre": nombre,
-                            "email": email,
-                            "rol": rol,
-                            "fecha_registro": datetime.now().strftime("%Y-%m-%d")
-                        }
-                        
-                        datos["usuarios"].append(nuevo_usuario)
-                        guardar_datos(datos)
-                        
                         st.success("Usuario registrado exitosamente!")
                         st.rerun()
                 else:
@@ -1382,10 +1252,15 @@ def mostrar_usuarios(datos):
     else:
         st.warning("⚠️ Solo los administradores pueden gestionar usuarios")
     
+@rendimiento.medido()
 def mostrar_reportes(datos):
     """Muestra los reportes y estadísticas"""
+    import pandas as pd
     st.markdown('<h1 class="main-header">Reportes y Estadísticas</h1>', unsafe_allow_html=True)
     
+    # Agregados precalculados: no se recorren los proyectos ni las calificaciones
+    estadisticas = obtener_estadisticas()
+    
     # Estadísticas generales
     col1, col2 = st.columns(2)
     
@@ -1393,71 +1268,191 @@ def mostrar_reportes(datos):
         st.markdown("### Estadísticas Generales")
         
         # Proyectos por asignatura
-        if datos['proyectos']:
-            asignaturas = {}
-            for proyecto in datos['proyectos']:
-                asignatura = proyecto['asignatura']
-                asignaturas[asignatura] = asignaturas.get(asignatura, 0) + 1
-            
+        if estadisticas.por_asignatura:
             st.markdown("**Proyectos por Asignatura:**")
-            for asignatura, cantidad in asignaturas.items():
+            for asignatura, cantidad in estadisticas.por_asignatura.items():
                 st.markdown(f"- {asignatura}: {cantidad}")
         
         # Proyectos por carrera
-        if datos['proyectos']:
-            carreras = {}
-            for proyecto in datos['proyectos']:
-                carrera = proyecto['carrera']
-                carreras[carrera] = carreras.get(carrera, 0) + 1
-            
+        if estadisticas.por_carrera:
             st.markdown("**Proyectos por Carrera:**")
-            for carrera, cantidad in carreras.items():
+            for carrera, cantidad in estadisticas.por_carrera.items():
                 st.markdown(f"- {carrera}: {cantidad}")
     
     with col2:
         st.markdown("### Análisis de Calificaciones")
         
-        if datos['calificaciones']:
-            # Promedio por criterio
-            promedios_criterios = {
-                'innovacion': [],
-                'viabilidad': [],
-                'impacto': [],
-                'ejecucion': [],
-                'pitch': []
-            }
-            
-            for cal in datos['calificaciones']:
-                for criterio, valor in cal['criterios'].items():
-                    promedios_criterios[criterio].append(valor)
-            
+        if estadisticas.cantidad_calificaciones:
+            # Promedio y dispersión por criterio
             st.markdown("**Promedio por Criterio:**")
-            for criterio, valores in promedios_criterios.items():
-                if valores:
-                    promedio = sum(valores) / len(valores)
+            for criterio, cantidad, promedio, varianza, desviacion in estadisticas.resumen_criterios():
+                if cantidad:
                     peso = datos['configuracion']['pesos_criterios'][criterio]
-                    st.markdown(f"- {criterio.title()} ({peso}%): {promedio:.2f}/10")
+                    st.markdown(f"- {criterio.title()} ({peso}%): {promedio:.2f}/10 (σ {desviacion:.2f}, varianza {varianza:.2f})")
             
             # Calificaciones totales
-            calificaciones_totales = [cal['calificacion_ponderada'] for cal in datos['calificaciones']]
-            if calificaciones_totales:
-                promedio_general = sum(calificaciones_totales) / len(calificaciones_totales)
-                st.markdown(f"**Promedio General:** {promedio_general:.2f}/10")
+            st.markdown(f"**Promedio General:** {estadisticas.ponderadas.media():.2f}/10")
+            st.markdown(f"**Desviación Estándar General:** {estadisticas.ponderadas.desviacion():.2f}")
     
     # Gráficos (si hay datos)
     if datos['proyectos'] and datos['calificaciones']:
         st.markdown("### Visualizaciones")
         
-        # DataFrame para análisis
-        proyectos_df = pd.DataFrame(datos['proyectos'])
-        calificaciones_df = pd.DataFrame(datos['calificaciones'])
+        # DataFrames solo con las columnas que se muestran
+        proyectos_df = pd.DataFrame(datos['proyectos'], columns=['id', 'nombre', 'asignatura', 'carrera', 'calificacion_final'])
+        proyectos_df['calificaciones'] = [
+            estadisticas.por_proyecto[proyecto_id].cantidad if proyecto_id in estadisticas.por_proyecto else 0
+            for proyecto_id in proyectos_df['id']
+        ]
+        # Columnas leídas por atributo de los registros del modelo (sin convertirlos a dict)
+        columnas_calificaciones = ['proyecto_id', 'calificacion_ponderada', 'fecha_calificacion']
+        calificaciones_df = pd.DataFrame(
+            list(map(lector(datos['calificaciones'], *columnas_calificaciones), datos['calificaciones'])),
+            columns=columnas_calificaciones
+        )
         
         # Mostrar datos en tablas
         st.markdown("**Proyectos y Calificaciones:**")
-        st.dataframe(proyectos_df[['nombre', 'asignatura', 'carrera', 'calificacion_final']], use_container_width=True)
+        st.dataframe(proyectos_df.drop(columns='id'), use_container_width=True)
         
         st.markdown("**Detalle de Calificaciones:**")
-        st.dataframe(calificaciones_df[['proyecto_id', 'calificacion_ponderada', 'fecha_calificacion']], use_container_width=True)
+        st.dataframe(calificaciones_df, use_container_width=True)
+        
+        # Simulación de pesos sobre todo el historial (cálculo vectorizado)
+        st.markdown("### Simulación de Pesos")
+        with st.expander("🧮 ¿Cómo quedaría el ranking con otros pesos?"):
+            pesos_actuales = datos['configuracion']['pesos_criterios']
+            pesos_simulados = {}
+            columnas_pesos = st.columns(len(CRITERIOS))
+            for columna, criterio in zip(columnas_pesos, CRITERIOS):
+                with columna:
+                    pesos_simulados[criterio] = st.number_input(
+                        f"{criterio.title()} (%)",
+                        min_value=0,
+                        max_value=100,
+                        value=int(pesos_actuales.get(criterio, 0)),
+                        key=f"peso_simulado_{criterio}"
+                    )
+            
+            total_pesos = sum(pesos_simulados.values())
+            if total_pesos != 100:
+                st.warning(f"⚠️ Los pesos suman {total_pesos}% (lo habitual es 100%)")
+            
+            registro_proyectos = obtener_registro_proyectos()
+            motor_ranking = obtener_motor_ranking()
+            simulacion = obtener_historial_calificaciones().simular_pesos(pesos_simulados)
+            
+            filas_simulacion = [
+                {
+                    'Posición': posicion,
+                    'Proyecto': registro_proyectos.obtener(proyecto_id)['nombre'],
+                    'Calificación Simulada': final,
+                    'Calificación Actual': motor_ranking.calificacion_final(proyecto_id)
+                }
+                for posicion, (proyecto_id, final) in enumerate(
+                    [fila for fila in simulacion if registro_proyectos.obtener(fila[0])], start=1
+                )
+            ]
+            if filas_simulacion:
+                st.dataframe(pd.DataFrame(filas_simulacion), use_container_width=True)
+
+def mostrar_rendimiento():
+    """Muestra los tiempos registrados por rerun (p50/p95 por tramo) y permite exportarlos"""
+    import pandas as pd
+    st.markdown('<h1 class="main-header">⏱️ Rendimiento</h1>', unsafe_allow_html=True)
+    
+    # El registro es del proceso: con varias instancias cada una muestra sus propios reruns
+    activo = st.toggle(
+        "Registrar tiempos de cada rerun",
+        value=rendimiento.activo(),
+        help="Desactivado, el registro no tiene un costo apreciable"
+    )
+    if activo != rendimiento.activo():
+        rendimiento.activar(activo)
+        st.rerun()
+    
+    # Caché compartida de datos (siempre activa, también por proceso)
+    cache = servicios.estadisticas_cache()
+    consultas = cache['aciertos'] + cache['fallos']
+    col_aciertos, col_fallos, col_tasa = st.columns(3)
+    with col_aciertos:
+        st.metric("🎯 Aciertos de caché", cache['aciertos'])
+    with col_fallos:
+        st.metric("📥 Recargas de datos", cache['fallos'])
+    with col_tasa:
+        st.metric("📈 Tasa de aciertos", f"{cache['aciertos'] / consultas:.1%}" if consultas else "—")
+    
+    registros = rendimiento.reruns()
+    if not registros:
+        st.info("📊 Aún no hay reruns registrados. Activa el registro y navega por la aplicación.")
+        return
+    
+    duraciones = sorted(registro['duracion'] for registro in registros)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("🔁 Reruns registrados", len(registros))
+    with col2:
+        st.metric("⏱️ Rerun p50", f"{rendimiento.percentil(duraciones, 50) * 1000:.1f} ms")
+    with col3:
+        st.metric("🐢 Rerun p95", f"{rendimiento.percentil(duraciones, 95) * 1000:.1f} ms")
+    
+    # Tiempos por tramo, del que más tiempo acumula al que menos
+    st.subheader("📋 Tiempos por tramo")
+    filas_resumen = [
+        {
+            'Tramo': nombre,
+            'Llamadas': llamadas,
+            'p50 (ms)': round(p50 * 1000, 2),
+            'p95 (ms)': round(p95 * 1000, 2),
+            'Máximo (ms)': round(maximo * 1000, 2),
+            'Total (ms)': round(total * 1000, 2)
+        }
+        for nombre, llamadas, p50, p95, maximo, total in rendimiento.resumen(registros)
+    ]
+    st.dataframe(pd.DataFrame(filas_resumen), hide_index=True, use_container_width=True)
+    
+    # Desglose del rerun más reciente (los tramos anidados se muestran con sangría)
+    ultimo = registros[-1]
+    st.subheader("🔍 Último rerun")
+    detalles = ", ".join(f"{clave}: {valor}" for clave, valor in ultimo['datos'].items())
+    st.caption(f"{ultimo['etiqueta']} · {ultimo['duracion'] * 1000:.1f} ms" + (f" · {detalles}" if detalles else ""))
+    filas_ultimo = [
+        {
+            'Tramo': "· " * profundidad + nombre,
+            'Inicio (ms)': round(desplazamiento * 1000, 2),
+            'Duración (ms)': round(duracion * 1000, 2)
+        }
+        for nombre, desplazamiento, duracion, profundidad in sorted(ultimo['tramos'], key=lambda tramo: tramo[1])
+    ]
+    if filas_ultimo:
+        st.dataframe(pd.DataFrame(filas_ultimo), hide_index=True, use_container_width=True)
+    
+    # Exportación de los tramos registrados
+    fecha = datetime.now().strftime('%Y%m%d_%H%M')
+    col_ndjson, col_chrome, col_limpiar = st.columns(3)
+    with col_ndjson:
+        st.download_button(
+            label="📥 Exportar NDJSON",
+            data=lambda: b"".join(rendimiento.fragmentos_ndjson(registros)),
+            file_name=f"rendimiento_{fecha}.ndjson",
+            mime="application/x-ndjson",
+            key="download_rendimiento_ndjson",
+            use_container_width=True
+        )
+    with col_chrome:
+        # Se abre en chrome://tracing o en ui.perfetto.dev
+        st.download_button(
+            label="📥 Exportar traza de Chrome",
+            data=lambda: rendimiento.traza_chrome(registros),
+            file_name=f"rendimiento_{fecha}.json",
+            mime="application/json",
+            key="download_rendimiento_chrome",
+            use_container_width=True
+        )
+    with col_limpiar:
+        if st.button("🗑️ Limpiar registros", key="limpiar_rendimiento", use_container_width=True):
+            rendimiento.limpiar()
+            st.rerun()
 
 # Ejecutar la aplicación
 if __name__ == "__main__":
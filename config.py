@@ -52,6 +52,9 @@ CRITERIOS_CALIFICACION = {
     }
 }
 
+# Orden fijo de los criterios (columnas de las matrices de puntuación)
+CRITERIOS = tuple(CRITERIOS_CALIFICACION)
+
 # Configuración de roles
 ROLES = {
     "admin": {
@@ -88,9 +91,57 @@ COLORES_DASHBOARD = {
 ARCHIVOS = {
     "datos": "datos/data.json",
     "backup": "datos/backup/",
+    "exportaciones": "datos/exportaciones/",
     "logs": "logs/"
 }
 
+# Configuración del almacenamiento ("json" o "sqlite")
+# Se puede sobrescribir con la variable de entorno CONCURSO_ALMACENAMIENTO
+ALMACENAMIENTO = {
+    "motor": "json",
+    "sqlite": "datos/data.db",
+    # Journal de calificaciones del motor JSON y cada cuántas entradas se compacta
+    "journal": "datos/calificaciones.journal.jsonl",
+    "umbral_compactacion": 200
+}
+
+# Configuración del hash de contraseñas ("scrypt" o "pbkdf2_sha256")
+# El costo se puede calibrar con: python seguridad.py
+SEGURIDAD = {
+    "hasher": "scrypt",
+    "scrypt_n": 2 ** 14,
+    "scrypt_r": 8,
+    "scrypt_p": 1,
+    "pbkdf2_iteraciones": 600000,
+    # Latencia de login aceptable cuando todo el panel de docentes entra a la vez
+    "presupuesto_login_ms": 1000,
+    "panel_docentes": 20,
+    # Hashes simultáneos (0 = número de CPUs); limita la memoria que usa scrypt
+    "hashes_concurrentes": 0
+}
+
+# Configuración de las sesiones firmadas (HMAC)
+# El secreto se puede fijar con la variable de entorno CONCURSO_SECRETO_SESION
+# El token viaja en la URL (historial, registros de proxies): dura poco y se
+# renueva mientras la sesión se usa; cerrar sesión revoca todos los del usuario
+SESION = {
+    "secreto": "datos/sesion.key",
+    "duracion_horas": 2,
+    # Generación de sesión por usuario; un token de una generación anterior queda revocado
+    "revocaciones": "datos/sesiones.revocadas.json",
+    # Parámetro de la URL que conserva la sesión al recargar la página
+    "parametro": "sesion"
+}
+
+# Registro de tiempos por rerun (página "Rendimiento" de los administradores)
+# Se puede activar con la variable de entorno CONCURSO_PERFILADO=1
+RENDIMIENTO = {
+    "activo": False,
+    # Reruns que se conservan en memoria y tramos como máximo por rerun
+    "reruns": 200,
+    "tramos_por_rerun": 500
+}
+
 # Configuración de paginación
 PAGINACION = {
     "proyectos_por_pagina": 10,
@@ -0,0 +1,133 @@
+import math
+from collections import Counter
+
+from config import CRITERIOS
+
+class Acumulador:
+    """Cantidad, suma y suma de cuadrados de una serie de valores"""
+
+    def __init__(self, cantidad=0, suma=0.0, suma_cuadrados=0.0):
+        self.cantidad = cantidad
+        self.suma = suma
+        self.suma_cuadrados = suma_cuadrados
+
+    def agregar(self, valor):
+        """Suma un valor a la serie"""
+        self.cantidad += 1
+        self.suma += valor
+        self.suma_cuadrados += valor * valor
+
+    def copia(self):
+        """Devuelve una copia independiente del acumulador"""
+        return Acumulador(self.cantidad, self.suma, self.suma_cuadrados)
+
+    def media(self):
+        """Devuelve el promedio (0 si no hay valores)"""
+        return self.suma / self.cantidad if self.cantidad else 0.0
+
+    def varianza(self):
+        """Devuelve la varianza poblacional (0 si no hay valores)"""
+        if not self.cantidad:
+            return 0.0
+        media = self.media()
+        # Evitar negativos pequeños por redondeo
+        return max(self.suma_cuadrados / self.cantidad - media * media, 0.0)
+
+    def desviacion(self):
+        """Devuelve la desviación estándar poblacional"""
+        return math.sqrt(self.varianza())
+
+class EstadisticasConcurso:
+    """Agregados de proyectos y calificaciones para la página de reportes
+
+    Se mantienen de forma incremental: al registrar proyectos o calificaciones
+    solo se suman los nuevos, y las consultas no recorren los datos. Se
+    calculan sobre la vista compartida, cuyas calificaciones son registros de modelo.py.
+    """
+
+    def __init__(self):
+        self.por_asignatura = Counter()
+        self.por_carrera = Counter()
+        self.criterios = {criterio: Acumulador() for criterio in CRITERIOS}
+        self.ponderadas = Acumulador()
+        self.por_proyecto = {}
+        self.cantidad_proyectos = 0
+        self.cantidad_calificaciones = 0
+        self.ultimo_proyecto = None
+        self.ultima_calificacion = None
+
+    @classmethod
+    def desde_datos(cls, datos):
+        """Calcula los agregados de todos los proyectos y calificaciones"""
+        estadisticas = cls()
+        for proyecto in datos['proyectos']:
+            estadisticas.agregar_proyecto(proyecto)
+        for cal in datos['calificaciones']:
+            estadisticas.agregar_calificacion(cal)
+        return estadisticas
+
+    @classmethod
+    def extender(cls, anterior, datos):
+        """Devuelve agregados nuevos sumando a los anteriores solo lo recién registrado
+
+        Devuelve None si los datos ya agregados no coinciden (hay que recalcular).
+        """
+        proyectos = datos['proyectos']
+        calificaciones = datos['calificaciones']
+        if len(proyectos) < anterior.cantidad_proyectos or len(calificaciones) < anterior.cantidad_calificaciones:
+            return None
+        if anterior.cantidad_proyectos and proyectos[anterior.cantidad_proyectos - 1]['id'] != anterior.ultimo_proyecto:
+            return None
+        if anterior.cantidad_calificaciones and calificaciones[anterior.cantidad_calificaciones - 1].id != anterior.ultima_calificacion:
+            return None
+
+        estadisticas = anterior.copia()
+        for proyecto in proyectos[anterior.cantidad_proyectos:]:
+            estadisticas.agregar_proyecto(proyecto)
+        for cal in calificaciones[anterior.cantidad_calificaciones:]:
+            estadisticas.agregar_calificacion(cal)
+        return estadisticas
+
+    def copia(self):
+        """Devuelve una copia independiente de los agregados"""
+        estadisticas = EstadisticasConcurso()
+        estadisticas.por_asignatura = Counter(self.por_asignatura)
+        estadisticas.por_carrera = Counter(self.por_carrera)
+        estadisticas.criterios = {criterio: acumulador.copia() for criterio, acumulador in self.criterios.items()}
+        estadisticas.ponderadas = self.ponderadas.copia()
+        estadisticas.por_proyecto = {proyecto_id: acumulador.copia() for proyecto_id, acumulador in self.por_proyecto.items()}
+        estadisticas.cantidad_proyectos = self.cantidad_proyectos
+        estadisticas.cantidad_calificaciones = self.cantidad_calificaciones
+        estadisticas.ultimo_proyecto = self.ultimo_proyecto
+        estadisticas.ultima_calificacion = self.ultima_calificacion
+        return estadisticas
+
+    def agregar_proyecto(self, proyecto):
+        """Suma un proyecto a los conteos por asignatura y carrera"""
+        self.por_asignatura[proyecto.get('asignatura', '')] += 1
+        self.por_carrera[proyecto.get('carrera', '')] += 1
+        self.cantidad_proyectos += 1
+        self.ultimo_proyecto = proyecto['id']
+
+    def agregar_calificacion(self, cal):
+        """Suma una calificación (registro del modelo) a los acumuladores por criterio, general y del proyecto"""
+        # Los criterios del registro ya vienen en el orden de CRITERIOS; NaN marca un criterio ausente
+        for acumulador, valor in zip(self.criterios.values(), cal.criterios):
+            if not math.isnan(valor):
+                acumulador.agregar(valor)
+        self.ponderadas.agregar(cal.calificacion_ponderada)
+        self.por_proyecto.setdefault(cal.proyecto_id, Acumulador()).agregar(cal.calificacion_ponderada)
+        self.cantidad_calificaciones += 1
+        self.ultima_calificacion = cal.id
+
+    def promedio_proyecto(self, proyecto_id):
+        """Devuelve el promedio de calificaciones ponderadas del proyecto (0 si no tiene)"""
+        acumulador = self.por_proyecto.get(proyecto_id)
+        return acumulador.media() if acumulador else 0.0
+
+    def resumen_criterios(self):
+        """Devuelve [(criterio, cantidad, promedio, varianza, desviación)] en el orden de CRITERIOS"""
+        return [
+            (criterio, acumulador.cantidad, acumulador.media(), acumulador.varianza(), acumulador.desviacion())
+            for criterio, acumulador in self.criterios.items()
+        ]
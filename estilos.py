@@ -0,0 +1,156 @@
+import re
+
+import streamlit as st
+
+# Ocultar el menú, el pie y la cabecera de Streamlit
+OCULTAR_STREAMLIT = """
+#MainMenu {visibility: hidden;}
+footer {visibility: hidden;}
+header {visibility: hidden;}
+"""
+
+# Estilos de concurso.py
+ESTILOS_CONCURSO = """
+    .main-header {
+        text-align: center;
+        color: #ffffff;
+        margin-bottom: 2rem;
+        text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
+    }
+    
+    .form-container {
+        background: linear-gradient(135deg, #34495e, #2c3e50);
+        color: white;
+        padding: 2rem;
+        border-radius: 1rem;
+        box-shadow: 0 4px 20px rgba(0,0,0,0.3);
+        margin: 1rem 0;
+        border: 2px solid #3498db;
+    }
+    
+    .ranking-card {
+        background: linear-gradient(135deg, #2c3e50, #34495e);
+        color: white;
+        padding: 2rem;
+        border-radius: 1rem;
+        margin: 1rem 0;
+        text-align: center;
+        border: 2px solid #f39c12;
+        box-shadow: 0 4px 20px rgba(0,0,0,0.3);
+    }
+    
+    .gold-medal {
+        background: linear-gradient(135deg, #FFD700, #FFA500);
+        border-color: #FFD700;
+    }
+    
+    .silver-medal {
+        background: linear-gradient(135deg, #C0C0C0, #A9A9A9);
+        border-color: #C0C0C0;
+    }
+    
+    .bronze-medal {
+        background: linear-gradient(135deg, #CD7F32, #B8860B);
+        border-color: #CD7F32;
+    }
+"""
+
+# Estilos de main.py
+ESTILOS_MAIN = """
+.main-header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 2rem;
+    border-radius: 1rem;
+    text-align: center;
+    margin-bottom: 2rem;
+    box-shadow: 0 4px 20px rgba(0,0,0,0.1);
+}
+
+.form-container {
+    background: #f8f9fa;
+    padding: 2rem;
+    border-radius: 1rem;
+    border: 2px solid #e9ecef;
+    margin: 1rem 0;
+}
+
+.login-container {
+    max-width: 400px;
+    margin: 0 auto;
+    padding: 2rem;
+    background: white;
+    border-radius: 1rem;
+    box-shadow: 0 4px 20px rgba(0,0,0,0.1);
+}
+
+.btn-primary {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    border: none;
+    padding: 0.75rem 1.5rem;
+    border-radius: 0.5rem;
+    cursor: pointer;
+    transition: all 0.3s;
+    width: 100%;
+}
+
+.btn-primary:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 4px 15px rgba(0,0,0,0.2);
+}
+
+.sidebar-menu {
+    background: #f8f9fa;
+    padding: 1rem;
+    border-radius: 0.5rem;
+    margin: 1rem 0;
+}
+
+.menu-item {
+    padding: 0.5rem 1rem;
+    margin: 0.25rem 0;
+    border-radius: 0.25rem;
+    cursor: pointer;
+    transition: all 0.3s;
+}
+
+.menu-item:hover {
+    background: #e9ecef;
+}
+
+.menu-item.active {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+}
+
+.logout-btn {
+    background: #dc3545;
+    color: white;
+    border: none;
+    padding: 0.5rem 1rem;
+    border-radius: 0.25rem;
+    cursor: pointer;
+    width: 100%;
+    margin-top: 1rem;
+}
+
+.logout-btn:hover {
+    background: #c82333;
+}
+"""
+
+def compactar(css):
+    """Quita espacios y saltos de línea innecesarios del CSS"""
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};:,])\s*", r"\1", css).strip()
+
+# Se compactan una sola vez al importar; en cada rerun solo se envía el bloque ya listo
+_BLOQUES = {
+    "concurso": f"<style>{compactar(OCULTAR_STREAMLIT + ESTILOS_CONCURSO)}</style>",
+    "main": f"<style>{compactar(OCULTAR_STREAMLIT + ESTILOS_MAIN)}</style>"
+}
+
+def aplicar_estilos(nombre):
+    """Inyecta en la página, en un solo bloque, los estilos de 'concurso' o 'main'"""
+    st.markdown(_BLOQUES[nombre], unsafe_allow_html=True)
@@ -0,0 +1,258 @@
+import csv
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from gzip import GzipFile
+
+import modelo
+from config import ARCHIVOS
+
+# Tamaño aproximado de cada fragmento entregado por los generadores
+TAMANO_FRAGMENTO = 64 * 1024
+
+# Filas por lote al escribir Parquet
+FILAS_POR_LOTE = 1000
+
+# Campos que nunca se exportan por colección
+CAMPOS_PRIVADOS = {
+    "usuarios": ("password",)
+}
+
+# Segundos que se conservan los artefactos de versiones anteriores: una
+# descarga diferida de otra sesión puede estar por abrirlos
+PERIODO_GRACIA = 300
+
+# Intentos de abrir un artefacto que otro proceso eliminó entre generarlo y abrirlo
+INTENTOS_APERTURA = 3
+
+# Formatos disponibles: extensión y tipo MIME
+FORMATOS = {
+    "json": ("json", "application/json"),
+    "ndjson": ("ndjson", "application/x-ndjson"),
+    "csv": ("csv", "text/csv"),
+    "parquet": ("parquet", "application/vnd.apache.parquet")
+}
+
+class ErrorExportacion(Exception):
+    """No se pudo generar la exportación solicitada"""
+
+def formatos_disponibles(coleccion):
+    """Devuelve los formatos que se pueden exportar para la colección ('documento' solo en JSON)"""
+    if coleccion == "documento":
+        return ["json"]
+    formatos = ["ndjson", "csv"]
+    # Parquet es opcional: solo se ofrece si pyarrow está instalado
+    if importlib.util.find_spec("pyarrow") is not None:
+        formatos.append("parquet")
+    return formatos
+
+def agrupar(fragmentos, tamano=TAMANO_FRAGMENTO):
+    """Junta fragmentos de texto en bloques de bytes de aproximadamente 'tamano'"""
+    bloque = []
+    acumulado = 0
+    for fragmento in fragmentos:
+        datos = fragmento.encode('utf-8') if isinstance(fragmento, str) else fragmento
+        bloque.append(datos)
+        acumulado += len(datos)
+        if acumulado >= tamano:
+            yield b"".join(bloque)
+            bloque = []
+            acumulado = 0
+    if bloque:
+        yield b"".join(bloque)
+
+def comprimir(fragmentos):
+    """Comprime en gzip un flujo de bloques de bytes sin juntarlos en memoria"""
+    compresor = zlib.compressobj(wbits=31)
+    for fragmento in fragmentos:
+        comprimido = compresor.compress(fragmento)
+        if comprimido:
+            yield comprimido
+    yield compresor.flush()
+
+def registros(datos, coleccion):
+    """Recorre los registros de una colección sin los campos privados"""
+    privados = CAMPOS_PRIVADOS.get(coleccion, ())
+    for registro in datos[coleccion]:
+        if isinstance(registro, modelo.Registro):
+            registro = registro.a_dict()
+        if privados:
+            registro = {campo: valor for campo, valor in registro.items() if campo not in privados}
+        yield registro
+
+def columnas(filas):
+    """Devuelve la unión de claves de las filas, en orden de aparición"""
+    vistas = {}
+    for fila in filas:
+        for campo in fila:
+            vistas.setdefault(campo, None)
+    return list(vistas)
+
+def fragmentos_json(datos):
+    """Genera el documento completo como JSON con sangría, por partes"""
+    codificador = json.JSONEncoder(indent=2, ensure_ascii=False, default=modelo.a_json)
+    return agrupar(codificador.iterencode(datos))
+
+def fragmentos_ndjson(filas):
+    """Genera un registro JSON por línea"""
+    return agrupar(json.dumps(fila, ensure_ascii=False) + "\n" for fila in filas)
+
+def _valor_csv(valor):
+    # Listas y diccionarios se escriben como JSON dentro de la celda
+    if isinstance(valor, (list, dict)):
+        return json.dumps(valor, ensure_ascii=False)
+    return valor
+
+def fragmentos_csv(filas, campos):
+    """Genera un CSV con encabezado a partir de filas (dicts) y la lista de columnas"""
+    def lineas():
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        escritor.writerow(campos)
+        for fila in filas:
+            escritor.writerow([_valor_csv(fila.get(campo, "")) for campo in campos])
+            if buffer.tell() >= TAMANO_FRAGMENTO:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    return agrupar(lineas())
+
+def escribir_parquet(destino, filas, campos):
+    """Escribe las filas en Parquet por lotes (requiere pyarrow)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ErrorExportacion("La exportación a Parquet requiere el paquete 'pyarrow'")
+
+    esquema = pa.schema([(campo, pa.string()) for campo in campos])
+    with pq.ParquetWriter(destino, esquema) as escritor:
+        lote = []
+        for fila in filas:
+            lote.append(fila)
+            if len(lote) >= FILAS_POR_LOTE:
+                escritor.write_table(_tabla_parquet(pa, lote, campos, esquema))
+                lote = []
+        if lote:
+            escritor.write_table(_tabla_parquet(pa, lote, campos, esquema))
+
+def _tabla_parquet(pa, lote, campos, esquema):
+    # Todas las columnas como texto: los registros no tienen un esquema fijo
+    columnas_lote = {
+        campo: [None if fila.get(campo) is None else str(_valor_csv(fila.get(campo))) for fila in lote]
+        for campo in campos
+    }
+    return pa.table(columnas_lote, schema=esquema)
+
+def fragmentos(datos, coleccion, formato):
+    """Genera la exportación de una colección ('documento' para todo el JSON) en el formato dado"""
+    if coleccion == "documento":
+        if formato != "json":
+            raise ErrorExportacion("El documento completo solo se exporta en JSON")
+        # Los usuarios se exportan sin sus campos privados (hash de contraseña)
+        return fragmentos_json(dict(datos, usuarios=list(registros(datos, "usuarios"))))
+    if formato == "ndjson":
+        return fragmentos_ndjson(registros(datos, coleccion))
+    if formato == "csv":
+        return fragmentos_csv(registros(datos, coleccion), columnas(registros(datos, coleccion)))
+    raise ErrorExportacion(f"Formato no soportado para flujo: {formato}")
+
+def nombre_archivo(prefijo, formato, gzip=False):
+    """Devuelve el nombre del archivo de descarga con su extensión"""
+    extension = FORMATOS[formato][0]
+    return f"{prefijo}.{extension}.gz" if gzip else f"{prefijo}.{extension}"
+
+def tipo_mime(formato, gzip=False):
+    """Devuelve el tipo MIME de la descarga"""
+    return "application/gzip" if gzip else FORMATOS[formato][1]
+
+class ArtefactosExportacion:
+    """Exportaciones generadas en disco una sola vez por versión de los datos
+
+    Cada artefacto se escribe por partes en un archivo temporal y se publica
+    con os.replace, así varias sesiones comparten el mismo archivo hasta que
+    cambie la versión; las versiones anteriores se eliminan al regenerar,
+    una vez pasado PERIODO_GRACIA.
+    """
+
+    def __init__(self, directorio=None):
+        self.directorio = directorio or ARCHIVOS["exportaciones"]
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _lock_de(self, nombre):
+        with self._lock:
+            return self._locks.setdefault(nombre, threading.Lock())
+
+    def ruta(self, datos, coleccion, formato, gzip=False):
+        """Devuelve la ruta del artefacto de la versión de 'datos', generándolo si no existe"""
+        version = datos.get('version')
+        base = f"{coleccion}-v{version}" if version is not None else f"{coleccion}-sin-version"
+        nombre = nombre_archivo(base, formato, gzip)
+        ruta = os.path.join(self.directorio, nombre)
+
+        with self._lock_de(nombre):
+            # Sin versión no se puede saber si el archivo está al día
+            if version is None or not os.path.exists(ruta):
+                self._generar(ruta, datos, coleccion, formato, gzip)
+                self._limpiar(coleccion, nombre)
+        return ruta
+
+    def abrir(self, datos, coleccion, formato, gzip=False):
+        """Abre el artefacto en modo binario (para st.download_button) sin cargarlo en memoria"""
+        # Un archivo abierto sigue siendo legible aunque otra sesión publique una versión nueva;
+        # si otro proceso lo eliminó antes de abrirlo, se vuelve a generar
+        for intento in range(INTENTOS_APERTURA):
+            try:
+                return open(self.ruta(datos, coleccion, formato, gzip), 'rb')
+            except FileNotFoundError:
+                if intento == INTENTOS_APERTURA - 1:
+                    raise
+
+    def _generar(self, ruta, datos, coleccion, formato, gzip):
+        os.makedirs(self.directorio, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, 'wb') as archivo:
+                if formato == "parquet":
+                    if coleccion == "documento":
+                        raise ErrorExportacion("El documento completo solo se exporta en JSON")
+                    # Parquet ya comprime por columnas; gzip se aplica igual si se pide, por lotes
+                    campos = columnas(registros(datos, coleccion))
+                    if gzip:
+                        with GzipFile(fileobj=archivo, mode='wb') as comprimido:
+                            escribir_parquet(comprimido, registros(datos, coleccion), campos)
+                    else:
+                        escribir_parquet(archivo, registros(datos, coleccion), campos)
+                else:
+                    flujo = fragmentos(datos, coleccion, formato)
+                    for bloque in (comprimir(flujo) if gzip else flujo):
+                        archivo.write(bloque)
+            os.replace(temporal, ruta)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+
+    def _limpiar(self, coleccion, vigente):
+        """Elimina los artefactos de otras versiones de la misma colección y formato pasado el período de gracia"""
+        sufijo = vigente.split(".", 1)[1]
+        limite = time.time() - PERIODO_GRACIA
+        for nombre in os.listdir(self.directorio):
+            if nombre != vigente and nombre.startswith(f"{coleccion}-") and nombre.split(".", 1)[-1] == sufijo:
+                ruta = os.path.join(self.directorio, nombre)
+                try:
+                    if os.path.getmtime(ruta) < limite:
+                        os.remove(ruta)
+                except OSError:
+                    pass
+
+# Instancia compartida por todas las sesiones
+artefactos = ArtefactosExportacion()
@@ -0,0 +1,134 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import rendimiento
+
+# Calificación mínima para "Mejores calificados"
+CALIFICACION_DESTACADA = 8.0
+
+# Cantidad máxima de resultados memorizados por versión de los datos
+MAX_RESULTADOS_MEMORIZADOS = 64
+
+@dataclass(frozen=True)
+class ConsultaFiltros:
+    """Combinación de filtros seleccionados en el dashboard
+
+    calificacion: None, "sin_calificar" o "calificados"
+    horario: None, "en_horario" o "fuera_horario"
+    inteligente: None, "prioritarios", "atrasados" o "mejores"
+    """
+    texto: str = ""
+    asignatura: str = None
+    carrera: str = None
+    calificacion: str = None
+    horario: str = None
+    inteligente: str = None
+
+    def usa_horario(self):
+        """Indica si el resultado depende de la hora actual"""
+        return self.horario is not None or self.inteligente in ("prioritarios", "atrasados")
+
+    def vacia(self):
+        """Indica si no hay ningún filtro activo"""
+        return self == ConsultaFiltros()
+
+class MotorFiltros:
+    """Aplica una ConsultaFiltros en una sola pasada usando conjuntos de ids por campo
+
+    Se construye una vez por versión de los datos; los resultados se memorizan
+    por consulta (y por el conjunto de proyectos en horario si dependen de la hora).
+    """
+
+    def __init__(self, datos, indice_busqueda, indice_horarios):
+        self.proyectos = datos['proyectos']
+        self.indice_busqueda = indice_busqueda
+        self.indice_horarios = indice_horarios
+        self.version = datos.get('version')
+
+        self.todos = set()
+        self.por_asignatura = {}
+        self.por_carrera = {}
+        self.calificados = set()
+        self.destacados = set()
+        for proyecto in self.proyectos:
+            proyecto_id = proyecto['id']
+            self.todos.add(proyecto_id)
+            self.por_asignatura.setdefault(proyecto.get('asignatura', ''), set()).add(proyecto_id)
+            self.por_carrera.setdefault(proyecto.get('carrera', ''), set()).add(proyecto_id)
+            calificacion_final = proyecto.get('calificacion_final', 0)
+            if calificacion_final > 0:
+                self.calificados.add(proyecto_id)
+            if calificacion_final >= CALIFICACION_DESTACADA:
+                self.destacados.add(proyecto_id)
+
+        self._memoria = OrderedDict()
+        self._lock = threading.Lock()
+
+    @rendimiento.medido("filtros.filtrar")
+    def filtrar(self, consulta, minuto=None):
+        """Devuelve la lista de proyectos que cumplen la consulta, en orden de registro"""
+        if consulta.vacia():
+            return self.proyectos
+
+        en_horario = None
+        clave = (consulta, None)
+        if consulta.usa_horario():
+            en_horario = self.indice_horarios.presentando(minuto)
+            clave = (consulta, frozenset(en_horario))
+
+        with self._lock:
+            resultado = self._memoria.get(clave)
+            if resultado is not None:
+                self._memoria.move_to_end(clave)
+                return resultado
+
+        resultado = self._aplicar(consulta, en_horario)
+
+        with self._lock:
+            self._memoria[clave] = resultado
+            if len(self._memoria) > MAX_RESULTADOS_MEMORIZADOS:
+                self._memoria.popitem(last=False)
+        return resultado
+
+    def _aplicar(self, consulta, en_horario):
+        """Combina los conjuntos de los filtros activos y recorre los proyectos una sola vez"""
+        incluidos = []
+        excluidos = []
+
+        if consulta.texto and consulta.texto.strip():
+            incluidos.append(set(self.indice_busqueda.buscar(consulta.texto)))
+        if consulta.asignatura is not None:
+            incluidos.append(self.por_asignatura.get(consulta.asignatura, set()))
+        if consulta.carrera is not None:
+            incluidos.append(self.por_carrera.get(consulta.carrera, set()))
+
+        if consulta.calificacion == "calificados":
+            incluidos.append(self.calificados)
+        elif consulta.calificacion == "sin_calificar":
+            excluidos.append(self.calificados)
+
+        if consulta.horario == "en_horario":
+            incluidos.append(en_horario)
+        elif consulta.horario == "fuera_horario":
+            excluidos.append(en_horario)
+
+        if consulta.inteligente == "prioritarios":
+            excluidos.append(self.calificados)
+            incluidos.append(en_horario)
+        elif consulta.inteligente == "atrasados":
+            excluidos.append(self.calificados)
+            excluidos.append(en_horario)
+        elif consulta.inteligente == "mejores":
+            incluidos.append(self.destacados)
+
+        # Intersecar empezando por el conjunto más pequeño
+        candidatos = self.todos
+        for conjunto in sorted(incluidos, key=len):
+            candidatos = candidatos & conjunto
+            if not candidatos:
+                return []
+        for conjunto in excluidos:
+            candidatos = candidatos - conjunto
+
+        return [proyecto for proyecto in self.proyectos if proyecto['id'] in candidatos]
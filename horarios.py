@@ -0,0 +1,309 @@
+import bisect
+import heapq
+import logging
+import re
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import chain
+
+logger = logging.getLogger(__name__)
+
+# Textos que indican que el proyecto no tiene horario
+SIN_HORARIO = ("", "Sin horario asignado")
+
+# "14:00 - 15:00", "11:00 a 13:00" (también dentro de un texto más largo)
+PATRON_RANGO = re.compile(r"(\d{1,2}):(\d{2})\s*(?:-|–|a|hasta)\s*(\d{1,2}):(\d{2})")
+PATRON_HORA = re.compile(r"(\d{1,2}):(\d{2})")
+
+# "15 de agosto de 2025", "2025-08-15" o "15/08/2025"
+PATRON_FECHA_TEXTO = re.compile(r"(\d{1,2})\s+de\s+([a-záéíóú]+)(?:\s+del?\s+(\d{4}))?", re.IGNORECASE)
+PATRON_FECHA_ISO = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+PATRON_FECHA_BARRAS = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+
+# "... en el aula C10", "... en el Auditorio" (después de la hora)
+PATRON_SALA = re.compile(r"\ben\s+(?:el\s+|la\s+)?(.+?)[\s.]*$", re.IGNORECASE)
+
+MESES = {
+    "enero": 1, "febrero": 2, "marzo": 3, "abril": 4, "mayo": 5, "junio": 6, "julio": 7,
+    "agosto": 8, "septiembre": 9, "setiembre": 9, "octubre": 10, "noviembre": 11, "diciembre": 12
+}
+
+# Duración asumida cuando solo se indica la hora de inicio
+DURACION_POR_DEFECTO = 60
+
+# Clave de orden de los proyectos sin turno (van al final de la cola)
+SIN_TURNO = "~"
+
+class ErrorHorario(ValueError):
+    """El texto del horario de presentación no se pudo interpretar"""
+
+def _minutos(hora, minuto, texto):
+    hora, minuto = int(hora), int(minuto)
+    if hora > 23 or minuto > 59:
+        raise ErrorHorario(f"Hora inválida en el horario '{texto}'")
+    return hora * 60 + minuto
+
+@lru_cache(maxsize=4096)
+def parsear_horario(texto):
+    """Convierte un horario en (inicio, fin) en minutos del día; None si no tiene horario
+
+    Lanza ErrorHorario si el texto no contiene un horario reconocible.
+    """
+    if texto is None or texto.strip() in SIN_HORARIO:
+        return None
+
+    rango = PATRON_RANGO.search(texto)
+    if rango:
+        inicio = _minutos(rango.group(1), rango.group(2), texto)
+        fin = _minutos(rango.group(3), rango.group(4), texto)
+        if fin < inicio:
+            raise ErrorHorario(f"La hora de fin es anterior a la de inicio en '{texto}'")
+        return (inicio, fin)
+
+    horas = PATRON_HORA.findall(texto)
+    if len(horas) == 1:
+        # Si solo hay una hora, considerar 1 hora de presentación
+        inicio = _minutos(horas[0][0], horas[0][1], texto)
+        return (inicio, min(inicio + DURACION_POR_DEFECTO, 24 * 60 - 1))
+
+    raise ErrorHorario(f"No se reconoce el horario '{texto}' (formato esperado: HH:MM - HH:MM)")
+
+@dataclass(frozen=True)
+class Turno:
+    """Turno de presentación de un proyecto: fecha ISO (o None), inicio y fin en minutos del día y sala"""
+    fecha: str
+    inicio: int
+    fin: int
+    sala: str = None
+
+    def a_dict(self):
+        """Devuelve el turno como dict para guardarlo en el proyecto"""
+        return asdict(self)
+
+    def texto_horario(self):
+        """Devuelve el horario como 'HH:MM - HH:MM'"""
+        return f"{self.inicio // 60:02d}:{self.inicio % 60:02d} - {self.fin // 60:02d}:{self.fin % 60:02d}"
+
+def _fecha(texto):
+    """Extrae la fecha del texto del horario en formato ISO; None si no tiene"""
+    try:
+        coincidencia = PATRON_FECHA_ISO.search(texto)
+        if coincidencia:
+            return date(int(coincidencia.group(1)), int(coincidencia.group(2)), int(coincidencia.group(3))).isoformat()
+        coincidencia = PATRON_FECHA_BARRAS.search(texto)
+        if coincidencia:
+            return date(int(coincidencia.group(3)), int(coincidencia.group(2)), int(coincidencia.group(1))).isoformat()
+        coincidencia = PATRON_FECHA_TEXTO.search(texto)
+        if coincidencia and coincidencia.group(2).lower() in MESES:
+            anio = int(coincidencia.group(3)) if coincidencia.group(3) else date.today().year
+            return date(anio, MESES[coincidencia.group(2).lower()], int(coincidencia.group(1))).isoformat()
+    except ValueError:
+        raise ErrorHorario(f"Fecha inválida en el horario '{texto}'")
+    return None
+
+@lru_cache(maxsize=4096)
+def parsear_turno(texto):
+    """Convierte el texto del horario en un Turno (fecha, inicio, fin, sala); None si no tiene horario
+
+    Lanza ErrorHorario si el texto no contiene un horario reconocible.
+    """
+    intervalo = parsear_horario(texto)
+    if intervalo is None:
+        return None
+
+    # La sala se busca después de la última hora del texto
+    fin_horas = max(coincidencia.end() for coincidencia in PATRON_HORA.finditer(texto))
+    sala = PATRON_SALA.search(texto[fin_horas:])
+    return Turno(_fecha(texto), intervalo[0], intervalo[1], sala.group(1) if sala else None)
+
+def turno_de_proyecto(proyecto):
+    """Devuelve el Turno guardado en el proyecto o, si no lo tiene, el interpretado de su horario"""
+    turno = proyecto.get('presentacion')
+    if turno:
+        return Turno(turno.get('fecha'), turno['inicio'], turno['fin'], turno.get('sala'))
+    return parsear_turno(proyecto.get('horas_presentacion'))
+
+def minuto_actual():
+    """Devuelve el minuto del día actual"""
+    ahora = datetime.now()
+    return ahora.hour * 60 + ahora.minute
+
+def esta_en_horario(texto, minuto=None, fecha=None):
+    """Indica si el minuto dado (por defecto, hoy y ahora) está dentro del turno del texto
+
+    Un turno con fecha solo está en horario ese día.
+    """
+    try:
+        turno = parsear_turno(texto)
+    except ErrorHorario:
+        return False
+    if turno is None or turno.fecha not in (None, fecha or date.today().isoformat()):
+        return False
+    minuto = minuto_actual() if minuto is None else minuto
+    return turno.inicio <= minuto <= turno.fin
+
+class IndiceHorarios:
+    """Intervalos de presentación de los proyectos ordenados por hora de inicio, por fecha
+
+    Permite responder qué proyectos están presentando ahora o en los próximos
+    minutos con una búsqueda binaria en lugar de reinterpretar cada horario.
+    Como en ColaPresentaciones, un turno sin fecha vale para cualquier día y uno
+    con fecha solo para ese día.
+    """
+
+    def __init__(self):
+        self.intervalos = {}
+        self.errores = []
+        # Fecha ISO ("" para los turnos sin fecha) -> [(inicio, fin, id)] ordenada
+        self._inicios = {}
+        self._duracion_maxima = 0
+
+    @classmethod
+    def desde_datos(cls, datos):
+        """Interpreta una sola vez el horario de cada proyecto"""
+        indice = cls()
+        for proyecto in datos['proyectos']:
+            indice.agregar_proyecto(proyecto)
+        return indice
+
+    def agregar_proyecto(self, proyecto):
+        """Registra el turno de un proyecto; los errores quedan en self.errores"""
+        try:
+            turno = turno_de_proyecto(proyecto)
+        except ErrorHorario as error:
+            self.errores.append((proyecto['id'], proyecto.get('horas_presentacion'), str(error)))
+            logger.warning("Proyecto %s: %s", proyecto['id'], error)
+            return
+        if turno is None:
+            return
+
+        fecha = turno.fecha or ""
+        self.intervalos[proyecto['id']] = (turno.inicio, turno.fin, fecha)
+        bisect.insort(self._inicios.setdefault(fecha, []), (turno.inicio, turno.fin, proyecto['id']))
+        self._duracion_maxima = max(self._duracion_maxima, turno.fin - turno.inicio)
+
+    def _del_dia(self, fecha):
+        # Listas de turnos que valen en la fecha dada: los sin fecha y los de ese día
+        fecha = fecha or date.today().isoformat()
+        return [self._inicios[clave] for clave in ("", fecha) if clave in self._inicios]
+
+    def en_horario(self, proyecto_id, minuto=None, fecha=None):
+        """Indica si el proyecto está en su horario de presentación (por defecto, hoy y ahora)"""
+        intervalo = self.intervalos.get(proyecto_id)
+        if intervalo is None:
+            return False
+        inicio, fin, fecha_turno = intervalo
+        if fecha_turno not in ("", fecha or date.today().isoformat()):
+            return False
+        minuto = minuto_actual() if minuto is None else minuto
+        return inicio <= minuto <= fin
+
+    def presentando(self, minuto=None, fecha=None):
+        """Devuelve el conjunto de ids de proyectos que presentan en el minuto dado (por defecto, hoy)"""
+        minuto = minuto_actual() if minuto is None else minuto
+        resultado = set()
+        for inicios in self._del_dia(fecha):
+            # Solo pueden estar en curso los que empezaron como mucho 'duración máxima' antes
+            desde = bisect.bisect_left(inicios, (minuto - self._duracion_maxima,))
+            hasta = bisect.bisect_right(inicios, (minuto, float('inf')))
+            resultado.update(proyecto_id for inicio, fin, proyecto_id in inicios[desde:hasta] if fin >= minuto)
+        return resultado
+
+    def proximos(self, minutos, minuto=None, fecha=None):
+        """Devuelve los ids de proyectos que empiezan en los próximos 'minutos' (por defecto, hoy), por hora de inicio"""
+        minuto = minuto_actual() if minuto is None else minuto
+        tramos = []
+        for inicios in self._del_dia(fecha):
+            desde = bisect.bisect_right(inicios, (minuto, float('inf')))
+            hasta = bisect.bisect_right(inicios, (minuto + minutos, float('inf')))
+            tramos.append(inicios[desde:hasta])
+        return [proyecto_id for _, _, proyecto_id in heapq.merge(*tramos)]
+
+class ColaPresentaciones:
+    """Proyectos en orden de presentación (fecha, hora de inicio), mantenido al registrar proyectos
+
+    Cada docente recorre la misma cola filtrando los proyectos que le quedan
+    pendientes; 'siguiente' ubica con búsqueda binaria el primer turno que
+    todavía no terminó. Los proyectos sin turno van al final, en orden de registro.
+    """
+
+    def __init__(self):
+        self.orden = []
+        self.turnos = {}
+        self.textos = {}
+
+    @classmethod
+    def desde_datos(cls, datos):
+        """Ordena todos los proyectos por turno"""
+        cola = cls()
+        for proyecto in datos['proyectos']:
+            cola.agregar_proyecto(proyecto)
+        return cola
+
+    @classmethod
+    def extender(cls, anterior, datos):
+        """Devuelve una cola nueva que añade a la anterior solo los proyectos recién registrados
+
+        Devuelve None si el horario de algún proyecto ya ordenado cambió (hay que reconstruir).
+        """
+        proyectos = datos['proyectos']
+        if len(proyectos) < len(anterior.textos):
+            return None
+        for proyecto in proyectos[:len(anterior.textos)]:
+            if anterior.textos.get(proyecto['id'], False) != proyecto.get('horas_presentacion'):
+                return None
+
+        cola = cls()
+        cola.orden = list(anterior.orden)
+        cola.turnos = dict(anterior.turnos)
+        cola.textos = dict(anterior.textos)
+        for proyecto in proyectos[len(anterior.textos):]:
+            cola.agregar_proyecto(proyecto)
+        return cola
+
+    def agregar_proyecto(self, proyecto):
+        """Inserta el proyecto en su posición de la cola"""
+        proyecto_id = proyecto['id']
+        try:
+            turno = turno_de_proyecto(proyecto)
+        except ErrorHorario:
+            # El error ya se informa en IndiceHorarios
+            turno = None
+
+        posicion = len(self.textos)
+        self.textos[proyecto_id] = proyecto.get('horas_presentacion')
+        if turno is None:
+            bisect.insort(self.orden, (SIN_TURNO, 0, 0, posicion, proyecto_id))
+            return
+        self.turnos[proyecto_id] = turno
+        bisect.insort(self.orden, (turno.fecha or "", turno.inicio, turno.fin, posicion, proyecto_id))
+
+    def ordenados(self):
+        """Devuelve los ids de todos los proyectos en orden de presentación"""
+        return [proyecto_id for *_, proyecto_id in self.orden]
+
+    def cola(self, pendiente):
+        """Devuelve los ids para los que 'pendiente(id)' es verdadero, en orden de presentación"""
+        return [proyecto_id for *_, proyecto_id in self.orden if pendiente(proyecto_id)]
+
+    def siguiente(self, pendiente, fecha=None, minuto=None):
+        """Devuelve el id del próximo proyecto pendiente (en curso o por empezar)
+
+        Los turnos sin fecha se consideran del día indicado. Si todos los
+        turnos pendientes ya pasaron, devuelve el primer pendiente de la cola.
+        """
+        fecha = fecha or date.today().isoformat()
+        minuto = minuto_actual() if minuto is None else minuto
+
+        sin_fecha = bisect.bisect_left(self.orden, ("0",))
+        desde_hoy = bisect.bisect_left(self.orden, (fecha,))
+        for fecha_turno, _, fin, _, proyecto_id in chain(self.orden[:sin_fecha], self.orden[desde_hoy:]):
+            if fecha_turno == SIN_TURNO:
+                break
+            if fecha_turno in ("", fecha) and fin < minuto:
+                continue
+            if pendiente(proyecto_id):
+                return proyecto_id
+
+        return next((proyecto_id for *_, proyecto_id in self.orden if pendiente(proyecto_id)), None)
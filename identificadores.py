@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+# Base32 de Crockford: el orden de los caracteres coincide con el orden ASCII
+ALFABETO = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+LONGITUD = 26
+
+# Distribución de los 128 bits: milisegundos | secuencia | nodo
+BITS_TIEMPO = 48
+BITS_SECUENCIA = 16
+BITS_NODO = 64
+MAX_SECUENCIA = (1 << BITS_SECUENCIA) - 1
+
+_lock = threading.Lock()
+_estado = {"ultimo_ms": 0, "secuencia": 0, "nodo": None}
+
+def _nuevo_nodo():
+    # Aleatorio por proceso: dos workers no comparten nodo aunque generen en el mismo milisegundo
+    _estado["nodo"] = int.from_bytes(os.urandom(BITS_NODO // 8), "big")
+    _estado["secuencia"] = 0
+
+_nuevo_nodo()
+if hasattr(os, "register_at_fork"):
+    # Un proceso hijo no debe heredar el nodo del padre
+    os.register_at_fork(after_in_child=_nuevo_nodo)
+
+def _codificar(valor):
+    caracteres = []
+    for _ in range(LONGITUD):
+        caracteres.append(ALFABETO[valor & 31])
+        valor >>= 5
+    return "".join(reversed(caracteres))
+
+def _decodificar(codigo):
+    valor = 0
+    for caracter in codigo.upper():
+        valor = (valor << 5) | ALFABETO.index(caracter)
+    return valor
+
+def _siguiente():
+    """Devuelve (milisegundos, secuencia, nodo) estrictamente creciente dentro del proceso"""
+    with _lock:
+        ahora = time.time_ns() // 1_000_000
+        # Si el reloj retrocede se sigue usando el último milisegundo emitido
+        if ahora <= _estado["ultimo_ms"]:
+            ahora = _estado["ultimo_ms"]
+            if _estado["secuencia"] >= MAX_SECUENCIA:
+                # Secuencia agotada en este milisegundo: pasar al siguiente
+                ahora += 1
+                _estado["secuencia"] = 0
+            else:
+                _estado["secuencia"] += 1
+        else:
+            _estado["secuencia"] = 0
+        _estado["ultimo_ms"] = ahora
+        return ahora, _estado["secuencia"], _estado["nodo"]
+
+def generar_codigo():
+    """Devuelve un código de 26 caracteres ordenable por momento de creación"""
+    milisegundos, secuencia, nodo = _siguiente()
+    valor = (milisegundos << (BITS_SECUENCIA + BITS_NODO)) | (secuencia << BITS_NODO) | nodo
+    return _codificar(valor)
+
+def generar_id(prefix):
+    """Genera un ID único, monótono dentro del proceso y ordenable por tiempo: 'prefijo_<código>'"""
+    return f"{prefix}_{generar_codigo()}"
+
+def es_id_ordenable(identificador):
+    """Indica si el id fue generado por este módulo (y no es un id antiguo)"""
+    codigo = identificador.rsplit("_", 1)[-1]
+    return len(codigo) == LONGITUD and all(caracter in ALFABETO for caracter in codigo.upper())
+
+def fecha_de_id(identificador):
+    """Devuelve el datetime (UTC) en que se generó el id, o None si es un id antiguo"""
+    if not es_id_ordenable(identificador):
+        return None
+    milisegundos = _decodificar(identificador.rsplit("_", 1)[-1]) >> (BITS_SECUENCIA + BITS_NODO)
+    return datetime.fromtimestamp(milisegundos / 1000, tz=timezone.utc)
+
+def limite_id(prefix, momento):
+    """Devuelve el menor id posible de 'momento' para consultas por rango (id >= limite_id(...))"""
+    milisegundos = int(momento.timestamp() * 1000)
+    return f"{prefix}_{_codificar(milisegundos << (BITS_SECUENCIA + BITS_NODO))}"
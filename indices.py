@@ -0,0 +1,168 @@
+from modelo import lector
+
+class IndiceCalificaciones:
+    """Índices de calificaciones por proyecto, por docente y por (docente, proyecto)
+
+    Se construye una vez por versión de los datos y se mantiene al agregar
+    calificaciones, de modo que las consultas no recorren toda la lista.
+    """
+
+    def __init__(self):
+        self.por_id = {}
+        self.por_proyecto = {}
+        self.por_docente = {}
+        self.por_docente_proyecto = {}
+        self.cantidad = 0
+        self.ultima_calificacion = None
+
+    @classmethod
+    def desde_datos(cls, datos):
+        """Construye los índices a partir de datos['calificaciones']"""
+        indice = cls()
+        calificaciones = datos['calificaciones']
+        claves = lector(calificaciones, 'id', 'proyecto_id', 'docente_id')
+        for cal in calificaciones:
+            indice._registrar(cal, *claves(cal))
+        return indice
+
+    @classmethod
+    def extender(cls, anterior, datos):
+        """Devuelve índices nuevos que añaden a los anteriores solo las calificaciones recién registradas
+
+        Los dicts se copian (en C, sin recorrer las calificaciones) y solo se
+        reemplazan las listas que reciben una calificación nueva, así los
+        índices anteriores no cambian. Devuelve None si las calificaciones ya
+        indexadas no coinciden (hay que reconstruir).
+        """
+        calificaciones = datos['calificaciones']
+        if len(calificaciones) < anterior.cantidad:
+            return None
+        if anterior.cantidad and (
+            lector(calificaciones, 'id')(calificaciones[anterior.cantidad - 1]) != anterior.ultima_calificacion
+        ):
+            return None
+
+        indice = cls()
+        indice.por_id = dict(anterior.por_id)
+        indice.por_proyecto = dict(anterior.por_proyecto)
+        indice.por_docente = dict(anterior.por_docente)
+        indice.por_docente_proyecto = dict(anterior.por_docente_proyecto)
+        indice.cantidad = anterior.cantidad
+        indice.ultima_calificacion = anterior.ultima_calificacion
+        for cal in calificaciones[anterior.cantidad:]:
+            indice.agregar_calificacion(cal, compartidas=True)
+        return indice
+
+    def agregar_calificacion(self, calificacion, compartidas=False):
+        """Registra una calificación en todos los índices
+
+        Con 'compartidas', las listas existentes se reemplazan por copias en
+        lugar de modificarse (pueden pertenecer a otro índice).
+        """
+        self._registrar(
+            calificacion, calificacion.get('id'), calificacion.get('proyecto_id'), calificacion.get('docente_id'),
+            compartidas
+        )
+
+    def _registrar(self, calificacion, calificacion_id, proyecto_id, docente_id, compartidas=False):
+        self.por_id[calificacion_id] = calificacion
+        self.cantidad += 1
+        self.ultima_calificacion = calificacion_id
+        if compartidas:
+            for indice, clave in (
+                (self.por_proyecto, proyecto_id),
+                (self.por_docente, docente_id),
+                (self.por_docente_proyecto, (docente_id, proyecto_id))
+            ):
+                indice[clave] = indice.get(clave, []) + [calificacion]
+            return
+        self.por_proyecto.setdefault(proyecto_id, []).append(calificacion)
+        self.por_docente.setdefault(docente_id, []).append(calificacion)
+        self.por_docente_proyecto.setdefault((docente_id, proyecto_id), []).append(calificacion)
+
+    def de_proyecto(self, proyecto_id):
+        """Devuelve las calificaciones de un proyecto"""
+        return self.por_proyecto.get(proyecto_id, [])
+
+    def de_docente(self, docente_id):
+        """Devuelve las calificaciones emitidas por un docente"""
+        return self.por_docente.get(docente_id, [])
+
+    def ya_calificado(self, docente_id, proyecto_id):
+        """Indica si el docente ya calificó el proyecto"""
+        return (docente_id, proyecto_id) in self.por_docente_proyecto
+
+class RegistroProyectos:
+    """Registro de proyectos por id con índices secundarios por nombre, asignatura y carrera"""
+
+    def __init__(self):
+        self.por_id = {}
+        self.por_nombre = {}
+        self.por_asignatura = {}
+        self.por_carrera = {}
+
+    @classmethod
+    def desde_datos(cls, datos):
+        """Construye el registro a partir de datos['proyectos']"""
+        registro = cls()
+        for proyecto in datos['proyectos']:
+            registro.agregar_proyecto(proyecto)
+        return registro
+
+    def agregar_proyecto(self, proyecto):
+        """Registra un proyecto en todos los índices"""
+        proyecto_id = proyecto['id']
+        self.por_id[proyecto_id] = proyecto
+        self.por_nombre.setdefault(proyecto.get('nombre', ''), []).append(proyecto_id)
+        self.por_asignatura.setdefault(proyecto.get('asignatura', ''), []).append(proyecto_id)
+        self.por_carrera.setdefault(proyecto.get('carrera', ''), []).append(proyecto_id)
+
+    def obtener(self, proyecto_id):
+        """Devuelve el proyecto con ese id o None"""
+        return self.por_id.get(proyecto_id)
+
+    def con_nombre(self, nombre):
+        """Devuelve los proyectos con ese nombre exacto (puede haber varios)"""
+        return [self.por_id[proyecto_id] for proyecto_id in self.por_nombre.get(nombre, [])]
+
+    def de_asignatura(self, asignatura):
+        """Devuelve los proyectos de una asignatura"""
+        return [self.por_id[proyecto_id] for proyecto_id in self.por_asignatura.get(asignatura, [])]
+
+    def de_carrera(self, carrera):
+        """Devuelve los proyectos de una carrera"""
+        return [self.por_id[proyecto_id] for proyecto_id in self.por_carrera.get(carrera, [])]
+
+    def __len__(self):
+        return len(self.por_id)
+
+class IndiceUsuarios:
+    """Usuarios por username y por id para autenticar sin recorrer la lista"""
+
+    def __init__(self):
+        self.por_username = {}
+        self.por_id = {}
+
+    @classmethod
+    def desde_datos(cls, datos):
+        """Construye el índice a partir de datos['usuarios']"""
+        indice = cls()
+        for usuario in datos['usuarios']:
+            indice.agregar_usuario(usuario)
+        return indice
+
+    def agregar_usuario(self, usuario):
+        """Registra un usuario en el índice (el primero con cada username prevalece)"""
+        self.por_username.setdefault(usuario['username'], usuario)
+        self.por_id[usuario['id']] = usuario
+
+    def con_username(self, username):
+        """Devuelve el usuario con ese username o None"""
+        return self.por_username.get(username)
+
+    def obtener(self, usuario_id):
+        """Devuelve el usuario con ese id o None"""
+        return self.por_id.get(usuario_id)
+
+    def __contains__(self, username):
+        return username in self.por_username
@@ -5,8 +5,11 @@ import os
 # Agregar el directorio actual al path para importar las funciones
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from utils import cargar_datos, autenticar_usuario, obtener_usuario_por_username
+from servicios import obtener_datos, autenticar_usuario
 from config import PAGE_CONFIG
+import estilos
+import rendimiento
+import sesiones
 
 # Configuración de la página
 st.set_page_config(
@@ -16,110 +19,18 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Ocultar la navegación automática de páginas
-st.markdown("""
-<style>
-#MainMenu {visibility: hidden;}
-footer {visibility: hidden;}
-header {visibility: hidden;}
-</style>
-""", unsafe_allow_html=True)
-
-# CSS principal
-st.markdown("""
-<style>
-.main-header {
-    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-    color: white;
-    padding: 2rem;
-    border-radius: 1rem;
-    text-align: center;
-    margin-bottom: 2rem;
-    box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-}
-
-.form-container {
-    background: #f8f9fa;
-    padding: 2rem;
-    border-radius: 1rem;
-    border: 2px solid #e9ecef;
-    margin: 1rem 0;
-}
-
-.login-container {
-    max-width: 400px;
-    margin: 0 auto;
-    padding: 2rem;
-    background: white;
-    border-radius: 1rem;
-    box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-}
-
-.btn-primary {
-    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-    color: white;
-    border: none;
-    padding: 0.75rem 1.5rem;
-    border-radius: 0.5rem;
-    cursor: pointer;
-    transition: all 0.3s;
-    width: 100%;
-}
-
-.btn-primary:hover {
-    transform: translateY(-2px);
-    box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-}
-
-.sidebar-menu {
-    background: #f8f9fa;
-    padding: 1rem;
-    border-radius: 0.5rem;
-    margin: 1rem 0;
-}
-
-.menu-item {
-    padding: 0.5rem 1rem;
-    margin: 0.25rem 0;
-    border-radius: 0.25rem;
-    cursor: pointer;
-    transition: all 0.3s;
-}
-
-.menu-item:hover {
-    background: #e9ecef;
-}
-
-.menu-item.active {
-    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-    color: white;
-}
-
-.logout-btn {
-    background: #dc3545;
-    color: white;
-    border: none;
-    padding: 0.5rem 1rem;
-    border-radius: 0.25rem;
-    cursor: pointer;
-    width: 100%;
-    margin-top: 1rem;
-}
-
-.logout-btn:hover {
-    background: #c82333;
-}
-</style>
-""", unsafe_allow_html=True)
+# Estilos de la aplicación (un solo bloque ya compactado)
+estilos.aplicar_estilos("main")
 
+@rendimiento.rerun_medido("main")
 def main():
     """Función principal que controla la navegación según el rol"""
     
-    # Verificar autenticación
-    if 'usuario_actual' not in st.session_state:
+    # Verificar autenticación (token firmado en la sesión o en la URL)
+    usuario = sesiones.restaurar_sesion()
+    if usuario is None:
         mostrar_login()
     else:
-        usuario = st.session_state.usuario_actual
         
         # Mostrar sidebar con navegación según el rol
         mostrar_sidebar(usuario)
@@ -184,7 +95,7 @@ def mostrar_sidebar(usuario):
         
         # Botón de logout
         if st.button("🚪 Cerrar Sesión", key="logout", use_container_width=True):
-            del st.session_state.usuario_actual
+            sesiones.cerrar_sesion()
             if 'pagina_actual' in st.session_state:
                 del st.session_state.pagina_actual
             st.rerun()
@@ -270,19 +181,15 @@ def mostrar_login():
             
             if st.form_submit_button("🚀 Iniciar Sesión", use_container_width=True):
                 if username and password:
-                    # Cargar datos
-                    datos = cargar_datos()
+                    # Obtener datos compartidos (solo lectura)
+                    datos = obtener_datos()
                     
-                    # Autenticar usuario
-                    if autenticar_usuario(username, password, datos):
-                        # Obtener información completa del usuario
-                        usuario = obtener_usuario_por_username(username, datos)
-                        if usuario:
-                            st.session_state.usuario_actual = usuario
-                            st.success("✅ ¡Bienvenido!")
-                            st.rerun()
-                        else:
-                            st.error("❌ Error al obtener información del usuario")
+                    # Autenticar usuario (devuelve el usuario o None)
+                    usuario = autenticar_usuario(username, password, datos)
+                    if usuario:
+                        sesiones.iniciar_sesion(usuario)
+                        st.success("✅ ¡Bienvenido!")
+                        st.rerun()
                     else:
                         st.error("❌ Usuario o contraseña incorrectos")
                 else:
@@ -0,0 +1,234 @@
+import math
+from array import array
+from collections.abc import Mapping
+from operator import attrgetter, itemgetter
+from sys import intern
+
+from config import CRITERIOS
+
+# Modelo tipado de usuarios, proyectos y calificaciones: registros con __slots__
+# (sin dict por instancia) que se leen por atributo en los recorridos intensivos
+# y, como un dict de solo lectura, por clave en el resto
+
+_CONJUNTO_CRITERIOS = frozenset(CRITERIOS)
+_NUMEROS = (int, float)
+
+# Máscara de criterios enteros por combinación de tipos de los valores
+_MASCARAS_ENTEROS = {}
+
+class ErrorModelo(ValueError):
+    """Registro con un campo obligatorio ausente o de tipo inválido"""
+
+class Registro(Mapping):
+    """Registro tipado con __slots__; se lee por atributo o por clave (solo lectura)
+
+    Los campos de CAMPOS ausentes en el documento valen None como atributo y no
+    aparecen como clave; las claves desconocidas se conservan en 'extra'.
+    """
+
+    __slots__ = ("_presentes", "extra")
+    CAMPOS = ()
+    OBLIGATORIOS = ()
+    NUMERICOS = ()
+    NOMBRE = "Registro"
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Un bit por campo para saber cuáles venían en el documento
+        cls._BITS = {campo: bit for bit, campo in enumerate(cls.CAMPOS)}
+
+    @classmethod
+    def desde_dict(cls, datos):
+        """Construye y valida el registro a partir de su dict guardado (lanza ErrorModelo si no es válido)"""
+        if not isinstance(datos, dict):
+            raise ErrorModelo(f"{cls.NOMBRE}: se esperaba un objeto y se encontró {type(datos).__name__}")
+        registro = cls.__new__(cls)
+        bits = cls._BITS
+        presentes = 0
+        extra = None
+        for clave, valor in datos.items():
+            bit = bits.get(clave)
+            if bit is None:
+                if extra is None:
+                    extra = {}
+                extra[clave] = valor
+            else:
+                presentes |= 1 << bit
+                setattr(registro, clave, valor)
+        for campo, bit in bits.items():
+            if not presentes >> bit & 1:
+                setattr(registro, campo, None)
+        registro._presentes = presentes
+        registro.extra = extra
+        registro._validar()
+        return registro
+
+    def _validar(self):
+        for campo in self.OBLIGATORIOS:
+            if type(getattr(self, campo)) is not str:
+                raise ErrorModelo(f"{self.NOMBRE} {self.id!r}: el campo '{campo}' es obligatorio y debe ser texto")
+        for campo in self.NUMERICOS:
+            valor = getattr(self, campo)
+            if valor is not None and type(valor) not in _NUMEROS:
+                raise ErrorModelo(f"{self.NOMBRE} {self.id!r}: el campo '{campo}' debe ser numérico")
+
+    def _valor(self, campo):
+        return getattr(self, campo)
+
+    def __getitem__(self, clave):
+        bit = self._BITS.get(clave)
+        if bit is not None:
+            if self._presentes >> bit & 1:
+                return self._valor(clave)
+        elif self.extra is not None and clave in self.extra:
+            return self.extra[clave]
+        raise KeyError(clave)
+
+    def __iter__(self):
+        presentes = self._presentes
+        for campo, bit in self._BITS.items():
+            if presentes >> bit & 1:
+                yield campo
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self):
+        return self._presentes.bit_count() + (len(self.extra) if self.extra is not None else 0)
+
+    def a_dict(self):
+        """Devuelve el registro como dict con el formato de almacenamiento"""
+        return {campo: self[campo] for campo in self}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.a_dict()!r})"
+
+class Usuario(Registro):
+    """Usuario del sistema (admin o docente)"""
+
+    __slots__ = CAMPOS = ("id", "username", "password", "nombre", "email", "rol", "fecha_registro")
+    OBLIGATORIOS = ("id", "username", "password", "rol")
+    NOMBRE = "Usuario"
+
+class Proyecto(Registro):
+    """Proyecto registrado en el concurso"""
+
+    __slots__ = CAMPOS = (
+        "id", "nombre", "asignatura", "semestre", "carrera", "docente", "docente_responsable", "estudiantes",
+        "horas_presentacion", "presentacion", "descripcion", "estado", "fecha_registro", "calificaciones",
+        "calificacion_final", "posicion_ranking"
+    )
+    OBLIGATORIOS = ("id", "nombre")
+    NUMERICOS = ("calificacion_final", "posicion_ranking")
+    NOMBRE = "Proyecto"
+
+    def _validar(self):
+        super()._validar()
+        for campo in ("estudiantes", "calificaciones"):
+            if getattr(self, campo) is not None and not isinstance(getattr(self, campo), list):
+                raise ErrorModelo(f"Proyecto {self.id!r}: el campo '{campo}' debe ser una lista")
+
+class Calificacion(Registro):
+    """Calificación de un docente; los criterios son un array de floats en el orden de CRITERIOS
+
+    Un criterio ausente se guarda como NaN y no aparece en el dict de criterios.
+    Un bit por criterio recuerda cuáles estaban guardados como int, para que el
+    dict devuelva 7 y 7.0 tal como venían.
+    """
+
+    CAMPOS = (
+        "id", "proyecto_id", "docente_id", "fecha_calificacion", "criterios", "calificacion_ponderada", "comentarios"
+    )
+    __slots__ = CAMPOS + ("_enteros", "_dict_criterios")
+    NOMBRE = "Calificación"
+
+    @classmethod
+    def desde_dict(cls, datos):
+        """Construye y valida la calificación a partir de su dict guardado (lanza ErrorModelo si no es válida)"""
+        # Versión directa del constructor genérico: es el registro más numeroso
+        if not isinstance(datos, dict):
+            raise ErrorModelo(f"Calificación: se esperaba un objeto y se encontró {type(datos).__name__}")
+        cal = cls.__new__(cls)
+        try:
+            cal.id = datos['id']
+            # Los ids de proyecto y docente y las fechas se repiten en muchas calificaciones
+            cal.proyecto_id = intern(datos['proyecto_id'])
+            cal.docente_id = intern(datos['docente_id'])
+            criterios = datos['criterios']
+            valores = [criterios.get(criterio, math.nan) for criterio in CRITERIOS]
+            cal.criterios = array('d', valores)
+            cal.calificacion_ponderada = datos['calificacion_ponderada']
+        except KeyError as error:
+            raise ErrorModelo(f"Calificación {datos.get('id')!r}: falta el campo {error}") from None
+        except (TypeError, AttributeError):
+            raise ErrorModelo(
+                f"Calificación {datos.get('id')!r}: proyecto_id y docente_id deben ser texto y los criterios, números"
+            ) from None
+        if type(cal.id) is not str or type(cal.calificacion_ponderada) not in _NUMEROS:
+            raise ErrorModelo(f"Calificación {cal.id!r}: id o calificacion_ponderada con tipo inválido")
+        if not criterios.keys() <= _CONJUNTO_CRITERIOS:
+            desconocidos = sorted(set(criterios) - _CONJUNTO_CRITERIOS)
+            raise ErrorModelo(f"Calificación {cal.id!r}: criterios desconocidos {desconocidos}")
+
+        # Siempre presentes: id, proyecto_id, docente_id, criterios y calificacion_ponderada
+        presentes = 0b0110111
+        fecha = datos.get('fecha_calificacion')
+        cal.fecha_calificacion = intern(fecha) if type(fecha) is str else fecha
+        cal.comentarios = datos.get('comentarios')
+        if 'fecha_calificacion' in datos:
+            presentes |= 0b0001000
+        if 'comentarios' in datos:
+            presentes |= 0b1000000
+        cal._presentes = presentes
+        # Pocas combinaciones de tipos se repiten en todas las calificaciones: la máscara se calcula una vez por combinación
+        tipos = tuple(map(type, valores))
+        enteros = _MASCARAS_ENTEROS.get(tipos)
+        if enteros is None:
+            enteros = _MASCARAS_ENTEROS[tipos] = sum(1 << bit for bit, tipo in enumerate(tipos) if tipo is int)
+        cal._enteros = enteros
+        cal._dict_criterios = None
+        cal.extra = None
+        if len(datos) != presentes.bit_count():
+            cal.extra = {clave: valor for clave, valor in datos.items() if clave not in cls._BITS}
+        return cal
+
+    def _valor(self, campo):
+        if campo == "criterios":
+            # Se arma una sola vez: los recorridos intensivos leen el array por atributo
+            if self._dict_criterios is None:
+                enteros = self._enteros
+                self._dict_criterios = {
+                    criterio: int(valor) if enteros >> bit & 1 else valor
+                    for bit, (criterio, valor) in enumerate(zip(CRITERIOS, self.criterios))
+                    if not math.isnan(valor)
+                }
+            return self._dict_criterios
+        return getattr(self, campo)
+
+# Clase de registro de cada colección del documento
+REGISTROS = {
+    "usuarios": Usuario,
+    "proyectos": Proyecto,
+    "calificaciones": Calificacion
+}
+
+def lector(registros, *campos):
+    """Devuelve una función que extrae los campos de cada registro de la colección
+
+    Lee por atributo sobre registros del modelo (vista compartida) y por clave
+    sobre dicts (copias editables); en ambos casos sin llamadas en Python.
+    """
+    if registros and isinstance(registros[0], Registro):
+        return attrgetter(*campos)
+    return itemgetter(*campos)
+
+def a_json(valor):
+    """Función 'default' para json: serializa los registros del modelo como dicts"""
+    if isinstance(valor, Registro):
+        return valor.a_dict()
+    raise TypeError(f"Object of type {type(valor).__name__} is not JSON serializable")
+
+def validar_documento(datos):
+    """Valida todos los registros de un documento; lanza ErrorModelo con el primero inválido"""
+    for coleccion, clase in REGISTROS.items():
+        for registro in datos.get(coleccion, []):
+            clase.desde_dict(registro)
@@ -0,0 +1,88 @@
+import threading
+from collections import OrderedDict
+
+import rendimiento
+
+# Columnas visibles de la tabla de proyectos del dashboard
+COLUMNAS = ['Nombre', 'Asignatura', 'Carrera', 'Horario', 'Estado Horario', 'Calificación']
+
+# Criterios de orden disponibles y el campo del proyecto que usa cada uno
+CRITERIOS_ORDEN = {
+    "Nombre": "nombre",
+    "Asignatura": "asignatura",
+    "Carrera": "carrera",
+    "Calificación": "calificacion_final",
+    "Estado Horario": None
+}
+
+# Cantidad máxima de ordenamientos y páginas memorizados
+MAX_ENTRADAS = 32
+
+def formatear_fila(proyecto, en_horario):
+    """Convierte un proyecto en la fila visible de la tabla"""
+    calificacion_final = proyecto.get('calificacion_final', 0)
+    return {
+        'Nombre': proyecto.get('nombre', ''),
+        'Asignatura': proyecto.get('asignatura', ''),
+        'Carrera': proyecto.get('carrera', ''),
+        'Horario': proyecto.get('horas_presentacion', ''),
+        'Estado Horario': '🟢 En Horario' if proyecto['id'] in en_horario else '🔴 Fuera de Horario',
+        'Calificación': f"{calificacion_final:.1f}/10" if calificacion_final > 0 else "Sin calificar"
+    }
+
+def clave_orden(criterio, en_horario):
+    """Devuelve la función de clave ligera para ordenar por el criterio dado"""
+    campo = CRITERIOS_ORDEN[criterio]
+    if campo is None:
+        # En horario primero
+        return lambda proyecto: 0 if proyecto['id'] in en_horario else 1
+    if campo == "calificacion_final":
+        return lambda proyecto: proyecto.get(campo, 0)
+    return lambda proyecto: proyecto.get(campo, '')
+
+class PaginadorProyectos:
+    """Ordena los proyectos filtrados por claves ligeras y formatea solo la página visible
+
+    Los ordenamientos y las páginas ya formateadas se memorizan por
+    (resultado, criterio, página, tamaño), de modo que cambiar de página o
+    volver a una ya vista no reconstruye toda la tabla.
+    """
+
+    def __init__(self):
+        self._ordenados = OrderedDict()
+        self._paginas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _memorizado(self, memoria, clave, calcular):
+        with self._lock:
+            valor = memoria.get(clave)
+            if valor is not None:
+                memoria.move_to_end(clave)
+                return valor
+
+        valor = calcular()
+
+        with self._lock:
+            memoria[clave] = valor
+            if len(memoria) > MAX_ENTRADAS:
+                memoria.popitem(last=False)
+        return valor
+
+    @rendimiento.medido("paginacion.ordenar")
+    def ordenar(self, clave_resultado, proyectos, criterio, en_horario):
+        """Devuelve los proyectos ordenados por el criterio"""
+        return self._memorizado(
+            self._ordenados,
+            (clave_resultado, criterio),
+            lambda: sorted(proyectos, key=clave_orden(criterio, en_horario))
+        )
+
+    @rendimiento.medido("paginacion.pagina")
+    def pagina(self, clave_resultado, proyectos, criterio, en_horario, numero, tamano):
+        """Devuelve las filas formateadas de la página 'numero' (empezando en 1)"""
+        def calcular():
+            ordenados = self.ordenar(clave_resultado, proyectos, criterio, en_horario)
+            inicio = (numero - 1) * tamano
+            return [formatear_fila(proyecto, en_horario) for proyecto in ordenados[inicio:inicio + tamano]]
+
+        return self._memorizado(self._paginas, (clave_resultado, criterio, numero, tamano), calcular)
@@ -0,0 +1,64 @@
+import numpy as np
+
+from config import CRITERIOS
+from modelo import Calificacion, lector
+
+def vector_pesos(pesos):
+    """Convierte un dict de pesos en porcentaje a un vector en el orden de CRITERIOS"""
+    return np.array([pesos.get(criterio, 0) for criterio in CRITERIOS], dtype=np.float64) / 100
+
+def matriz_criterios(calificaciones):
+    """Construye la matriz (calificaciones × criterios); los criterios ausentes valen 0"""
+    if calificaciones and isinstance(calificaciones[0], Calificacion):
+        # Los registros del modelo ya guardan sus criterios como floats en el orden de CRITERIOS:
+        # se concatenan los buffers sin recorrer criterio por criterio
+        matriz = np.frombuffer(b"".join(cal.criterios for cal in calificaciones), dtype=np.float64)
+        return np.nan_to_num(matriz.reshape(len(calificaciones), len(CRITERIOS)), nan=0.0)
+    matriz = np.zeros((len(calificaciones), len(CRITERIOS)), dtype=np.float64)
+    for fila, cal in enumerate(calificaciones):
+        criterios = cal.get('criterios', {})
+        matriz[fila] = [criterios.get(criterio, 0) for criterio in CRITERIOS]
+    return matriz
+
+def calcular_lote(matriz, pesos):
+    """Calcula todas las calificaciones ponderadas de una matriz en una sola operación"""
+    if isinstance(pesos, dict):
+        pesos = vector_pesos(pesos)
+    return np.round(matriz @ pesos, 2)
+
+class HistorialCalificaciones:
+    """Matriz de criterios de todo el historial, lista para re-ponderar en bloque"""
+
+    def __init__(self, calificaciones):
+        self.matriz = matriz_criterios(calificaciones)
+        # Código entero de proyecto por fila para promediar con bincount
+        proyecto_ids = np.array(list(map(lector(calificaciones, 'proyecto_id'), calificaciones)), dtype=str)
+        self.proyecto_ids, self.codigos = np.unique(proyecto_ids, return_inverse=True)
+
+    @classmethod
+    def desde_datos(cls, datos):
+        """Construye el historial a partir de datos['calificaciones']"""
+        return cls(datos['calificaciones'])
+
+    def ponderadas(self, pesos):
+        """Devuelve la calificación ponderada de cada calificación con los pesos dados"""
+        return calcular_lote(self.matriz, pesos)
+
+    def finales(self, pesos):
+        """Devuelve {proyecto_id: calificación final} promediando por proyecto con los pesos dados"""
+        if not len(self.matriz):
+            return {}
+        ponderadas = self.ponderadas(pesos)
+        sumas = np.bincount(self.codigos, weights=ponderadas, minlength=len(self.proyecto_ids))
+        cantidades = np.bincount(self.codigos, minlength=len(self.proyecto_ids))
+        promedios = np.round(sumas / cantidades, 2)
+        return dict(zip(self.proyecto_ids.tolist(), promedios.tolist()))
+
+    def simular_pesos(self, pesos):
+        """Devuelve [(proyecto_id, calificación final)] ordenado como quedaría el ranking"""
+        finales = self.finales(pesos)
+        return sorted(
+            ((proyecto_id, final) for proyecto_id, final in finales.items() if final > 0),
+            key=lambda x: x[1],
+            reverse=True
+        )
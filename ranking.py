@@ -0,0 +1,175 @@
+import bisect
+from datetime import datetime
+
+from modelo import lector
+
+# Premios para los tres primeros lugares
+PREMIOS = ["🥇 Oro", "🥈 Plata", "🥉 Bronce"]
+
+class MotorRanking:
+    """Mantiene suma y cantidad de calificaciones por proyecto y el orden del ranking
+
+    El orden se guarda como una lista ordenada de claves (-calificación final,
+    posición del proyecto, id), de modo que agregar una calificación solo
+    reubica al proyecto afectado en lugar de recalcular y reordenar todo.
+    La posición se busca en O(log P), pero insertar o quitar de la lista
+    desplaza los elementos siguientes: cada reubicación cuesta O(P) en el
+    peor caso (un memmove de punteros, de microsegundos con miles de proyectos).
+    """
+
+    def __init__(self, proyectos, version=None):
+        self.version = version
+        self.proyectos = {}
+        self.posiciones = {}
+        for posicion, (proyecto_id, proyecto) in enumerate(zip(map(lector(proyectos, 'id'), proyectos), proyectos)):
+            self.proyectos[proyecto_id] = proyecto
+            self.posiciones[proyecto_id] = posicion
+        self.sumas = {}
+        self.cantidades = {}
+        self.finales = {}
+        self.orden = []
+        self.cantidad_calificaciones = 0
+        self.ultima_calificacion = None
+
+    @classmethod
+    def desde_datos(cls, datos):
+        """Construye el motor recorriendo una sola vez proyectos y calificaciones"""
+        motor = cls(datos['proyectos'], datos.get('version'))
+
+        # Lectura por atributo sobre la vista compartida y por clave sobre copias editables
+        calificaciones = datos['calificaciones']
+        for proyecto_id, ponderada in map(lector(calificaciones, 'proyecto_id', 'calificacion_ponderada'), calificaciones):
+            if proyecto_id not in motor.posiciones:
+                continue
+            motor.sumas[proyecto_id] = motor.sumas.get(proyecto_id, 0) + ponderada
+            motor.cantidades[proyecto_id] = motor.cantidades.get(proyecto_id, 0) + 1
+
+        for proyecto_id, suma in motor.sumas.items():
+            motor.finales[proyecto_id] = round(suma / motor.cantidades[proyecto_id], 2)
+
+        motor.orden = sorted(
+            motor._clave(proyecto_id)
+            for proyecto_id, final in motor.finales.items() if final > 0
+        )
+        motor.cantidad_calificaciones = len(calificaciones)
+        if calificaciones:
+            motor.ultima_calificacion = lector(calificaciones, 'id')(calificaciones[-1])
+        return motor
+
+    @classmethod
+    def extender(cls, anterior, datos):
+        """Devuelve un motor nuevo sumando al anterior solo las calificaciones recién registradas
+
+        Cada calificación nueva reubica a su proyecto con agregar_calificacion;
+        el resto del costo es copiar los dicts por proyecto (O(P), sin recorrer
+        las calificaciones anteriores). Devuelve None si los proyectos o las calificaciones ya incorporadas no
+        coinciden (hay que reconstruir).
+        """
+        proyectos = datos['proyectos']
+        calificaciones = datos['calificaciones']
+        cantidad_proyectos = len(anterior.posiciones)
+        if len(proyectos) < cantidad_proyectos or len(calificaciones) < anterior.cantidad_calificaciones:
+            return None
+        ids_proyectos = lector(proyectos, 'id')
+        if cantidad_proyectos and (
+            anterior.posiciones.get(ids_proyectos(proyectos[cantidad_proyectos - 1])) != cantidad_proyectos - 1
+        ):
+            return None
+        ids_calificaciones = lector(calificaciones, 'id')
+        if anterior.cantidad_calificaciones and (
+            ids_calificaciones(calificaciones[anterior.cantidad_calificaciones - 1]) != anterior.ultima_calificacion
+        ):
+            return None
+
+        motor = anterior.copia()
+        motor.version = datos.get('version')
+        # Las referencias a los proyectos se renuevan (pueden haber cambiado sus datos, no su orden)
+        motor.proyectos = dict(zip(map(ids_proyectos, proyectos), proyectos))
+        for posicion in range(cantidad_proyectos, len(proyectos)):
+            motor.posiciones[ids_proyectos(proyectos[posicion])] = posicion
+
+        nuevas = calificaciones[anterior.cantidad_calificaciones:]
+        for proyecto_id, ponderada in map(lector(nuevas, 'proyecto_id', 'calificacion_ponderada'), nuevas):
+            if proyecto_id in motor.posiciones:
+                motor.agregar_calificacion(proyecto_id, ponderada)
+        motor.cantidad_calificaciones = len(calificaciones)
+        if nuevas:
+            motor.ultima_calificacion = ids_calificaciones(calificaciones[-1])
+        return motor
+
+    def copia(self):
+        """Devuelve una copia independiente para aplicar cambios sin afectar al motor compartido"""
+        motor = MotorRanking.__new__(MotorRanking)
+        motor.version = self.version
+        motor.proyectos = dict(self.proyectos)
+        motor.posiciones = dict(self.posiciones)
+        motor.sumas = dict(self.sumas)
+        motor.cantidades = dict(self.cantidades)
+        motor.finales = dict(self.finales)
+        motor.orden = list(self.orden)
+        motor.cantidad_calificaciones = self.cantidad_calificaciones
+        motor.ultima_calificacion = self.ultima_calificacion
+        return motor
+
+    def _clave(self, proyecto_id):
+        """Clave de orden: mayor calificación primero y, en empate, orden de registro"""
+        return (-self.finales[proyecto_id], self.posiciones[proyecto_id], proyecto_id)
+
+    def agregar_calificacion(self, proyecto_id, calificacion_ponderada):
+        """Incorpora una calificación nueva y devuelve la calificación final del proyecto"""
+        if self.finales.get(proyecto_id, 0) > 0:
+            indice = bisect.bisect_left(self.orden, self._clave(proyecto_id))
+            del self.orden[indice]
+
+        self.sumas[proyecto_id] = self.sumas.get(proyecto_id, 0) + calificacion_ponderada
+        self.cantidades[proyecto_id] = self.cantidades.get(proyecto_id, 0) + 1
+        self.finales[proyecto_id] = round(self.sumas[proyecto_id] / self.cantidades[proyecto_id], 2)
+
+        if self.finales[proyecto_id] > 0:
+            bisect.insort(self.orden, self._clave(proyecto_id))
+        return self.finales[proyecto_id]
+
+    def calificacion_final(self, proyecto_id):
+        """Devuelve la calificación final actual de un proyecto (0 si no tiene calificaciones)"""
+        return self.finales.get(proyecto_id, 0)
+
+    def ordenados(self):
+        """Devuelve los ids de los proyectos calificados, del mejor al peor"""
+        return [proyecto_id for _, _, proyecto_id in self.orden]
+
+    def ganadores(self):
+        """Devuelve la lista de ganadores con el formato de datos['ranking']"""
+        return [
+            {
+                'premio': PREMIOS[i],
+                'nombre_proyecto': self.proyectos[proyecto_id]['nombre'],
+                'calificacion_final': self.finales[proyecto_id]
+            }
+            for i, (_, _, proyecto_id) in enumerate(self.orden[:len(PREMIOS)])
+        ]
+
+    def difiere(self, datos):
+        """Indica si las calificaciones finales o los ganadores guardados están desactualizados"""
+        if datos['ranking'].get('proyectos_ganadores') != self.ganadores():
+            return True
+        return any(
+            proyecto.get('calificacion_final', 0) != self.calificacion_final(proyecto['id'])
+            for proyecto in datos['proyectos']
+        )
+
+    def aplicar(self, datos):
+        """Escribe en los datos las calificaciones finales y los ganadores"""
+        for proyecto in datos['proyectos']:
+            proyecto['calificacion_final'] = self.calificacion_final(proyecto['id'])
+        self._aplicar_ganadores(datos)
+        return datos
+
+    def aplicar_proyecto(self, datos, proyecto):
+        """Escribe solo la calificación final de un proyecto y los ganadores"""
+        proyecto['calificacion_final'] = self.calificacion_final(proyecto['id'])
+        self._aplicar_ganadores(datos)
+        return datos
+
+    def _aplicar_ganadores(self, datos):
+        datos['ranking']['proyectos_ganadores'] = self.ganadores()
+        datos['ranking']['fecha_actualizacion'] = datetime.now().strftime("%Y-%m-%d")
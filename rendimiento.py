@@ -0,0 +1,171 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+from config import RENDIMIENTO
+
+# Contexto vacío reutilizado cuando el registro está desactivado (no crea objetos por llamada)
+_NULO = nullcontext()
+
+_estado = {"activo": RENDIMIENTO["activo"] or os.environ.get("CONCURSO_PERFILADO") == "1"}
+_reruns = deque(maxlen=RENDIMIENTO["reruns"])
+_lock = threading.Lock()
+# Cada sesión de Streamlit ejecuta su script en su propio hilo
+_local = threading.local()
+
+def activo():
+    """Indica si se están registrando tiempos"""
+    return _estado["activo"]
+
+def activar(valor=True):
+    """Activa o desactiva el registro de tiempos en este proceso"""
+    _estado["activo"] = bool(valor)
+
+def limpiar():
+    """Descarta los reruns registrados"""
+    with _lock:
+        _reruns.clear()
+
+@contextmanager
+def _medir_rerun(etiqueta):
+    registro = {
+        "etiqueta": etiqueta,
+        "inicio": time.time(),
+        "reloj": time.perf_counter(),
+        "hilo": threading.get_ident(),
+        "datos": {},
+        "tramos": []
+    }
+    _local.rerun = registro
+    _local.profundidad = 0
+    try:
+        yield registro
+    finally:
+        registro["duracion"] = time.perf_counter() - registro["reloj"]
+        _local.rerun = None
+        with _lock:
+            _reruns.append(registro)
+
+def rerun(etiqueta):
+    """Contexto que agrupa los tramos de un rerun completo del script"""
+    # Un rerun anidado (main.py ejecutando concurso.main) forma parte del que lo contiene
+    if not _estado["activo"] or getattr(_local, "rerun", None) is not None:
+        return _NULO
+    return _medir_rerun(etiqueta)
+
+def rerun_medido(etiqueta):
+    """Decorador que registra cada llamada de la función como un rerun completo"""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with rerun(etiqueta):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+def anotar(**datos):
+    """Agrega datos (página, usuario...) al rerun en curso"""
+    registro = getattr(_local, "rerun", None)
+    if registro is not None:
+        registro["datos"].update(datos)
+
+@contextmanager
+def _medir_tramo(registro, nombre):
+    profundidad = _local.profundidad
+    _local.profundidad = profundidad + 1
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracion = time.perf_counter() - inicio
+        _local.profundidad = profundidad
+        if len(registro["tramos"]) < RENDIMIENTO["tramos_por_rerun"]:
+            # (nombre, desplazamiento desde el inicio del rerun, duración, profundidad)
+            registro["tramos"].append((nombre, inicio - registro["reloj"], duracion, profundidad))
+
+def tramo(nombre):
+    """Contexto que mide un tramo del rerun en curso; no hace nada si el registro está desactivado"""
+    if not _estado["activo"]:
+        return _NULO
+    registro = getattr(_local, "rerun", None)
+    if registro is None:
+        return _NULO
+    return _medir_tramo(registro, nombre)
+
+def medido(nombre=None):
+    """Decorador que mide cada llamada de la función como un tramo"""
+    def decorador(funcion):
+        etiqueta = nombre or funcion.__name__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _estado["activo"]:
+                return funcion(*args, **kwargs)
+            with tramo(etiqueta):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+def reruns():
+    """Devuelve una copia de los reruns registrados, del más antiguo al más reciente"""
+    with _lock:
+        return list(_reruns)
+
+def percentil(valores, p):
+    """Percentil por rango más cercano de una lista ya ordenada"""
+    posicion = max(0, -(-p * len(valores) // 100) - 1)
+    return valores[posicion]
+
+def resumen(registros=None):
+    """Devuelve [(nombre, llamadas, p50, p95, máximo, total)] en segundos, del más costoso al menos"""
+    registros = reruns() if registros is None else registros
+    duraciones = {}
+    for registro in registros:
+        duraciones.setdefault(f"rerun:{registro['etiqueta']}", []).append(registro["duracion"])
+        for nombre, _, duracion, _ in registro["tramos"]:
+            duraciones.setdefault(nombre, []).append(duracion)
+
+    filas = []
+    for nombre, valores in duraciones.items():
+        valores.sort()
+        filas.append((nombre, len(valores), percentil(valores, 50), percentil(valores, 95), valores[-1], sum(valores)))
+    return sorted(filas, key=lambda fila: fila[5], reverse=True)
+
+def fragmentos_ndjson(registros=None):
+    """Genera un tramo por línea (JSON) con los datos de su rerun"""
+    registros = reruns() if registros is None else registros
+    for numero, registro in enumerate(registros):
+        base = {"rerun": numero, "etiqueta": registro["etiqueta"], **registro["datos"]}
+        yield (json.dumps({
+            **base, "tramo": "rerun", "inicio": registro["inicio"], "duracion_ms": registro["duracion"] * 1000
+        }, ensure_ascii=False) + "\n").encode("utf-8")
+        for nombre, desplazamiento, duracion, profundidad in registro["tramos"]:
+            yield (json.dumps({
+                **base,
+                "tramo": nombre,
+                "inicio": registro["inicio"] + desplazamiento,
+                "duracion_ms": duracion * 1000,
+                "profundidad": profundidad
+            }, ensure_ascii=False) + "\n").encode("utf-8")
+
+def traza_chrome(registros=None):
+    """Devuelve los tramos en formato Chrome trace (chrome://tracing, Perfetto)"""
+    registros = reruns() if registros is None else registros
+    proceso = os.getpid()
+    eventos = []
+    for registro in registros:
+        inicio_us = registro["inicio"] * 1_000_000
+        eventos.append({
+            "name": f"rerun:{registro['etiqueta']}", "ph": "X", "pid": proceso, "tid": registro["hilo"],
+            "ts": inicio_us, "dur": registro["duracion"] * 1_000_000, "args": registro["datos"]
+        })
+        for nombre, desplazamiento, duracion, _ in registro["tramos"]:
+            eventos.append({
+                "name": nombre, "ph": "X", "pid": proceso, "tid": registro["hilo"],
+                "ts": inicio_us + desplazamiento * 1_000_000, "dur": duracion * 1_000_000
+            })
+    return json.dumps({"traceEvents": eventos, "displayTimeUnit": "ms"}, ensure_ascii=False).encode("utf-8")
@@ -0,0 +1,188 @@
+import base64
+import hashlib
+import hmac
+import math
+import os
+import statistics
+import threading
+import time
+
+from config import SEGURIDAD
+
+def _b64(valor):
+    return base64.b64encode(valor).decode('ascii')
+
+def _desde_b64(texto):
+    return base64.b64decode(texto.encode('ascii'))
+
+class HasherScrypt:
+    """Hash de contraseñas con scrypt y sal aleatoria: 'scrypt$n$r$p$sal$hash'"""
+
+    algoritmo = "scrypt"
+
+    def __init__(self, n=2 ** 14, r=8, p=1):
+        self.n = n
+        self.r = r
+        self.p = p
+
+    def _derivar(self, password, sal, n, r, p):
+        # scrypt necesita ~128·n·r bytes; se deja margen sobre el límite por defecto de hashlib
+        return hashlib.scrypt(
+            password.encode(), salt=sal, n=n, r=r, p=p,
+            maxmem=128 * n * r * (p + 1) + 1024 * 1024, dklen=32
+        )
+
+    def hashear(self, password):
+        """Devuelve el hash codificado de la contraseña con una sal nueva"""
+        sal = os.urandom(16)
+        derivado = self._derivar(password, sal, self.n, self.r, self.p)
+        return f"{self.algoritmo}${self.n}${self.r}${self.p}${_b64(sal)}${_b64(derivado)}"
+
+    def verificar(self, password, codificado):
+        """Compara en tiempo constante la contraseña con el hash codificado"""
+        _, n, r, p, sal, esperado = codificado.split("$")
+        derivado = self._derivar(password, _desde_b64(sal), int(n), int(r), int(p))
+        return hmac.compare_digest(derivado, _desde_b64(esperado))
+
+    def necesita_rehash(self, codificado):
+        """Indica si el hash no usa este algoritmo o sus parámetros actuales"""
+        return not codificado.startswith(f"{self.algoritmo}${self.n}${self.r}${self.p}$")
+
+class HasherPBKDF2:
+    """Hash de contraseñas con PBKDF2-HMAC-SHA256 y sal aleatoria: 'pbkdf2_sha256$iteraciones$sal$hash'"""
+
+    algoritmo = "pbkdf2_sha256"
+
+    def __init__(self, iteraciones=600000):
+        self.iteraciones = iteraciones
+
+    def hashear(self, password):
+        """Devuelve el hash codificado de la contraseña con una sal nueva"""
+        sal = os.urandom(16)
+        derivado = hashlib.pbkdf2_hmac("sha256", password.encode(), sal, self.iteraciones)
+        return f"{self.algoritmo}${self.iteraciones}${_b64(sal)}${_b64(derivado)}"
+
+    def verificar(self, password, codificado):
+        """Compara en tiempo constante la contraseña con el hash codificado"""
+        _, iteraciones, sal, esperado = codificado.split("$")
+        derivado = hashlib.pbkdf2_hmac("sha256", password.encode(), _desde_b64(sal), int(iteraciones))
+        return hmac.compare_digest(derivado, _desde_b64(esperado))
+
+    def necesita_rehash(self, codificado):
+        """Indica si el hash no usa este algoritmo o sus iteraciones actuales"""
+        return not codificado.startswith(f"{self.algoritmo}${self.iteraciones}$")
+
+class HasherSHA256Legado:
+    """Verifica los hashes SHA-256 sin sal de versiones anteriores (solo lectura)"""
+
+    algoritmo = "sha256"
+
+    def verificar(self, password, codificado):
+        """Compara en tiempo constante la contraseña con el hash hexadecimal"""
+        return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), codificado)
+
+HASHERS = {
+    HasherScrypt.algoritmo: HasherScrypt,
+    HasherPBKDF2.algoritmo: HasherPBKDF2
+}
+
+def hasher_configurado():
+    """Devuelve el hasher y el costo definidos en config.SEGURIDAD"""
+    if SEGURIDAD["hasher"] == HasherPBKDF2.algoritmo:
+        return HasherPBKDF2(SEGURIDAD["pbkdf2_iteraciones"])
+    return HasherScrypt(SEGURIDAD["scrypt_n"], SEGURIDAD["scrypt_r"], SEGURIDAD["scrypt_p"])
+
+def hasher_de(codificado):
+    """Devuelve el hasher capaz de verificar un hash codificado"""
+    algoritmo = codificado.split("$", 1)[0]
+    if algoritmo in HASHERS:
+        return HASHERS[algoritmo]()
+    return HasherSHA256Legado()
+
+# Hashes lentos simultáneos: el resto de logins espera en lugar de agotar memoria y CPU
+_limite_hashes = threading.BoundedSemaphore(SEGURIDAD["hashes_concurrentes"] or os.cpu_count() or 1)
+
+def hashear_password(password):
+    """Devuelve el hash de la contraseña con el hasher configurado"""
+    with _limite_hashes:
+        return hasher_configurado().hashear(password)
+
+def verificar_password(password, codificado):
+    """Devuelve (válida, necesita_rehash) para la contraseña y el hash guardado"""
+    try:
+        with _limite_hashes:
+            valida = hasher_de(codificado).verificar(password, codificado)
+    except (ValueError, TypeError):
+        # Hash corrupto o con otro formato
+        return False, False
+    return valida, valida and hasher_configurado().necesita_rehash(codificado)
+
+_hash_ficticio = []
+
+def _verificar_ficticio(password):
+    # Igualar el tiempo de respuesta cuando el usuario no existe
+    hasher = hasher_configurado()
+    if not _hash_ficticio or hasher.necesita_rehash(_hash_ficticio[0]):
+        _hash_ficticio[:] = [hasher.hashear("")]
+    verificar_password(password, _hash_ficticio[0])
+
+def autenticar(usuario, password):
+    """Verifica la contraseña de un usuario (o None si no existe)
+
+    Devuelve (válida, nuevo_hash); nuevo_hash es el hash a guardar si el
+    actual es de un algoritmo o costo anterior, o None.
+    """
+    if usuario is None:
+        _verificar_ficticio(password)
+        return False, None
+    valida, rehash = verificar_password(password, usuario.get('password', ''))
+    if not valida:
+        return False, None
+    return True, hashear_password(password) if rehash else None
+
+def medir(hasher, repeticiones=3):
+    """Devuelve la mediana en milisegundos de verificar una contraseña con el hasher"""
+    codificado = hasher.hashear("contraseña de prueba")
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        hasher.verificar("contraseña de prueba", codificado)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+def latencia_panel(milisegundos, panel=None, concurrentes=None):
+    """Estima la latencia del último login cuando 'panel' docentes entran a la vez"""
+    panel = panel or SEGURIDAD["panel_docentes"]
+    concurrentes = concurrentes or SEGURIDAD["hashes_concurrentes"] or os.cpu_count() or 1
+    return milisegundos * math.ceil(panel / concurrentes)
+
+def calibrar(presupuesto_ms=None, panel=None, concurrentes=None):
+    """Busca el costo de scrypt más alto cuyo login de panel completo queda dentro del presupuesto
+
+    Devuelve [(n, ms por hash, ms del panel)] medidos y el n elegido (None si ninguno entra).
+    """
+    presupuesto_ms = presupuesto_ms or SEGURIDAD["presupuesto_login_ms"]
+    mediciones = []
+    elegido = None
+    for exponente in range(12, 21):
+        n = 2 ** exponente
+        milisegundos = medir(HasherScrypt(n, SEGURIDAD["scrypt_r"], SEGURIDAD["scrypt_p"]))
+        total = latencia_panel(milisegundos, panel, concurrentes)
+        mediciones.append((n, milisegundos, total))
+        if total > presupuesto_ms:
+            break
+        elegido = n
+    return mediciones, elegido
+
+if __name__ == "__main__":
+    actual = hasher_configurado()
+    milisegundos = medir(actual)
+    print(f"Hasher actual: {actual.algoritmo} ({milisegundos:.1f} ms por login, "
+          f"{latencia_panel(milisegundos):.0f} ms para un panel de {SEGURIDAD['panel_docentes']})")
+    mediciones, elegido = calibrar()
+    for n, por_hash, total in mediciones:
+        print(f"  scrypt n=2^{int(math.log2(n))}: {por_hash:.1f} ms por login, {total:.0f} ms el panel")
+    if elegido:
+        print(f"Costo recomendado para {SEGURIDAD['presupuesto_login_ms']} ms: scrypt_n = 2 ** {int(math.log2(elegido))}")
+    else:
+        print("Ningún costo de scrypt entra en el presupuesto; considere subirlo o usar más hashes concurrentes")
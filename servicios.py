@@ -0,0 +1,246 @@
+from datetime import datetime
+
+import almacenamiento
+import horarios
+import identificadores
+import rendimiento
+import seguridad
+from busqueda import IndiceBusqueda
+from estadisticas import EstadisticasConcurso
+from filtros import MotorFiltros
+from indices import IndiceCalificaciones, IndiceUsuarios, RegistroProyectos
+from paginacion import PaginadorProyectos
+from ranking import MotorRanking
+
+# Capa de servicios compartida por concurso.py y main.py (a través de utils.py):
+# las cachés, los índices y las escrituras se resuelven una sola vez aquí
+
+class ErrorRegistro(ValueError):
+    """No se pudo registrar el dato (por ejemplo, el proyecto ya no existe)"""
+
+# Función para cargar datos
+def cargar_datos():
+    """Carga una copia editable de los datos desde el backend de almacenamiento configurado"""
+    return almacenamiento.cargar_datos()
+
+# Función para obtener la vista compartida de los datos
+def obtener_datos():
+    """Devuelve los datos en caché compartida (solo lectura) para renderizar páginas"""
+    return almacenamiento.obtener_datos()
+
+# Función para guardar datos
+def guardar_datos(datos):
+    """Guarda los datos en el backend de almacenamiento configurado"""
+    return almacenamiento.guardar_datos(datos)
+
+# Función para editar registros existentes
+def modificar_datos(funcion):
+    """Aplica funcion(datos) sobre los datos más recientes dentro del bloqueo de escritura y los guarda"""
+    return almacenamiento.modificar_datos(funcion)
+
+# Función para consultar la caché compartida
+def estadisticas_cache():
+    """Devuelve los aciertos y fallos de la caché compartida de datos del proceso"""
+    return almacenamiento.estadisticas_cache()
+
+# Función para generar IDs únicos
+def generar_id(prefix):
+    """Genera un ID único y ordenable por momento de creación"""
+    return identificadores.generar_id(prefix)
+
+# Función para calcular calificación ponderada
+def calcular_calificacion_ponderada(criterios, pesos):
+    """Calcula la calificación ponderada según los criterios y pesos"""
+    total = 0
+    for criterio, calificacion in criterios.items():
+        if criterio in pesos:
+            # Convertir el peso de porcentaje a decimal y multiplicar por la calificación
+            total += calificacion * (pesos[criterio] / 100)
+    return round(total, 2)
+
+# Función para verificar si está en horario de presentación
+def esta_en_horario_presentacion(horas_presentacion):
+    """Verifica si la hora actual está dentro del horario de presentación"""
+    # El horario se interpreta una sola vez por texto (caché en horarios.parsear_horario)
+    return horarios.esta_en_horario(horas_presentacion)
+
+# Función para actualizar ranking
+@rendimiento.medido()
+def actualizar_ranking(datos):
+    """Recalcula las calificaciones finales y el ranking de proyectos"""
+    # Un solo recorrido de calificaciones en lugar de filtrarlas por cada proyecto
+    return MotorRanking.desde_datos(datos).aplicar(datos)
+
+# Recalcular calificaciones finales y ranking cuando el almacenamiento fusiona escrituras concurrentes
+almacenamiento.registrar_recalculo(actualizar_ranking)
+
+# Estructuras derivadas de la vista compartida (se reconstruyen solo cuando cambian los datos)
+
+def obtener_motor_ranking(datos=None):
+    """Devuelve el motor de ranking de la vista compartida o una copia editable para 'datos'"""
+    motor = almacenamiento.obtener_derivado("ranking", MotorRanking.desde_datos, MotorRanking.extender)
+    if datos is None:
+        return motor
+    if motor.version != datos.get('version'):
+        # Los datos editables son de otra versión: reconstruir sobre ellos
+        return MotorRanking.desde_datos(datos)
+    return motor.copia()
+
+def obtener_indice_usuarios(datos=None):
+    """Devuelve el índice de usuarios por username (en caché si 'datos' es la vista compartida)"""
+    return almacenamiento.derivado_de(
+        obtener_datos() if datos is None else datos, "usuarios", IndiceUsuarios.desde_datos
+    )
+
+def obtener_indice_calificaciones():
+    """Devuelve los índices de calificaciones de la vista compartida, extendidos al registrar calificaciones"""
+    return almacenamiento.obtener_derivado(
+        "calificaciones", IndiceCalificaciones.desde_datos, IndiceCalificaciones.extender
+    )
+
+def obtener_registro_proyectos():
+    """Devuelve el registro de proyectos (id → proyecto) de la vista compartida"""
+    return almacenamiento.obtener_derivado("proyectos", RegistroProyectos.desde_datos)
+
+def obtener_historial_calificaciones():
+    """Devuelve el historial de calificaciones en forma de matriz para re-ponderar en bloque"""
+    # numpy se importa solo al abrir la página de reportes
+    from puntuacion import HistorialCalificaciones
+    return almacenamiento.obtener_derivado("historial", HistorialCalificaciones.desde_datos)
+
+def obtener_estadisticas():
+    """Devuelve los agregados de proyectos y calificaciones, actualizados de forma incremental"""
+    return almacenamiento.obtener_derivado("estadisticas", EstadisticasConcurso.desde_datos, EstadisticasConcurso.extender)
+
+def obtener_indice_horarios():
+    """Devuelve el índice de horarios de presentación de la vista compartida"""
+    return almacenamiento.obtener_derivado("horarios", horarios.IndiceHorarios.desde_datos)
+
+def obtener_cola_presentaciones():
+    """Devuelve los proyectos en orden de presentación, extendida al registrar proyectos nuevos"""
+    return almacenamiento.obtener_derivado(
+        "presentaciones",
+        horarios.ColaPresentaciones.desde_datos,
+        horarios.ColaPresentaciones.extender
+    )
+
+def obtener_indice_busqueda():
+    """Devuelve el índice invertido de búsqueda, extendido al registrar proyectos nuevos"""
+    return almacenamiento.obtener_derivado("busqueda", IndiceBusqueda.desde_datos, IndiceBusqueda.extender)
+
+def obtener_motor_filtros():
+    """Devuelve el motor de filtros (con resultados memorizados) de la versión actual de los datos"""
+    return almacenamiento.obtener_derivado(
+        "filtros",
+        lambda datos: MotorFiltros(datos, obtener_indice_busqueda(), obtener_indice_horarios())
+    )
+
+def obtener_paginador():
+    """Devuelve el paginador (con páginas memorizadas) de la versión actual de los datos"""
+    return almacenamiento.obtener_derivado("paginacion", lambda datos: PaginadorProyectos())
+
+# Usuarios
+
+def obtener_usuario_por_username(username, datos=None):
+    """Obtiene un usuario por su nombre de usuario o None"""
+    return obtener_indice_usuarios(datos).con_username(username)
+
+def autenticar_usuario(username, password, datos=None):
+    """Autentica un usuario con username y password; devuelve el usuario o None"""
+    usuario = obtener_usuario_por_username(username, datos)
+    valido, nuevo_hash = seguridad.autenticar(usuario, password)
+    if not valido:
+        return None
+    if nuevo_hash:
+        # Guardar el hash con el algoritmo y costo actuales
+        actualizar_password(usuario['id'], nuevo_hash)
+    return usuario
+
+def actualizar_password(usuario_id, nuevo_hash):
+    """Reemplaza el hash de contraseña de un usuario (algoritmo o costo actualizado)"""
+    def aplicar(datos):
+        usuario = IndiceUsuarios.desde_datos(datos).obtener(usuario_id)
+        if usuario is not None:
+            usuario['password'] = nuevo_hash
+
+    # Editar sobre la versión más reciente: la fusión de guardar_datos descartaría el cambio
+    modificar_datos(aplicar)
+
+def registrar_usuario(username, password, nombre, email, rol):
+    """Crea un usuario con la contraseña hasheada y lo guarda; devuelve el usuario
+
+    Lanza ErrorRegistro si el nombre de usuario ya existe en los datos más recientes.
+    """
+    nuevo_usuario = {
+        "id": generar_id("user"),
+        "username": username,
+        "password": seguridad.hashear_password(password),
+        "nombre": nombre,
+        "email": email,
+        "rol": rol,
+        "fecha_registro": datetime.now().strftime("%Y-%m-%d")
+    }
+    def aplicar(datos):
+        # La unicidad se comprueba dentro del bloqueo: otra sesión pudo registrarlo después de la vista en caché
+        if username in IndiceUsuarios.desde_datos(datos):
+            raise ErrorRegistro("El usuario ya existe")
+        datos["usuarios"].append(nuevo_usuario)
+
+    modificar_datos(aplicar)
+    return nuevo_usuario
+
+# Proyectos
+
+def registrar_proyecto(campos, turno=None):
+    """Crea un proyecto con los campos del formulario y su turno ya interpretado; devuelve el proyecto"""
+    nuevo_proyecto = {
+        "id": generar_id("proj"),
+        **campos,
+        "presentacion": turno.a_dict() if turno else None,
+        "fecha_registro": datetime.now().strftime("%Y-%m-%d"),
+        "calificaciones": [],
+        "calificacion_final": 0
+    }
+    modificar_datos(lambda datos: datos["proyectos"].append(nuevo_proyecto))
+    return nuevo_proyecto
+
+# Calificaciones
+
+@rendimiento.medido()
+def registrar_calificacion(proyecto_id, docente_id, criterios, comentarios=""):
+    """Registra la calificación de un docente y reubica el proyecto en el ranking; devuelve la calificación
+
+    Lanza ErrorRegistro si el proyecto ya no existe (otra sesión lo eliminó).
+    """
+    # Trabajar sobre una copia editable y actualizada de los datos
+    datos = cargar_datos()
+    proyecto = next((p for p in datos['proyectos'] if p['id'] == proyecto_id), None)
+    if proyecto is None:
+        raise ErrorRegistro("El proyecto ya no existe; vuelva a la tabla y elija otro")
+    motor_ranking = obtener_motor_ranking(datos)
+    calificacion_ponderada = calcular_calificacion_ponderada(criterios, datos['configuracion']['pesos_criterios'])
+
+    nueva_calificacion = {
+        "id": generar_id("cal"),
+        "proyecto_id": proyecto_id,
+        "docente_id": docente_id,
+        "fecha_calificacion": datetime.now().strftime("%Y-%m-%d"),
+        "criterios": criterios,
+        "calificacion_ponderada": calificacion_ponderada,
+        "comentarios": comentarios
+    }
+    datos["calificaciones"].append(nueva_calificacion)
+    proyecto.setdefault("calificaciones", []).append(nueva_calificacion["id"])
+
+    # Actualizar ranking de forma incremental (solo se reubica este proyecto)
+    motor_ranking.agregar_calificacion(proyecto_id, calificacion_ponderada)
+    motor_ranking.aplicar_proyecto(datos, proyecto)
+
+    # Persistir solo la calificación nueva y las filas afectadas
+    almacenamiento.registrar_calificacion(datos, nueva_calificacion, proyecto)
+    return nueva_calificacion
+
+def sincronizar_ranking(datos):
+    """Guarda el ranking recalculado solo si el guardado en 'datos' está desactualizado"""
+    if obtener_motor_ranking().difiere(datos):
+        guardar_datos(actualizar_ranking(cargar_datos()))
@@ -0,0 +1,220 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+import threading
+import time
+
+import streamlit as st
+
+from almacenamiento import BloqueoArchivo
+from config import SESION
+
+# Sesiones sin estado en el servidor: el usuario viaja en un token firmado con
+# HMAC que se conserva en el parámetro de la URL para sobrevivir a las recargas.
+# Riesgo: quien obtenga la URL (historial, registros de proxies, enlaces copiados)
+# entra como el usuario hasta que el token venza o se revoque. Por eso el token
+# dura poco, se renueva mientras se usa y cerrar sesión sube la generación del
+# usuario, lo que invalida todos sus tokens en todos los procesos.
+
+# Datos del usuario que viajan en el token (nunca el hash de la contraseña)
+CAMPOS_USUARIO = ("id", "username", "nombre", "rol")
+
+# Lecturas del secreto antes de darlo por inválido, y espera entre ellas
+INTENTOS_SECRETO = 5
+ESPERA_SECRETO = 0.05
+
+_secreto = []
+_lock = threading.Lock()
+
+def _b64(valor):
+    return base64.urlsafe_b64encode(valor).decode('ascii').rstrip("=")
+
+def _desde_b64(texto):
+    return base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4))
+
+def obtener_secreto(ruta=None):
+    """Devuelve la clave de firma, creándola en disco la primera vez
+
+    Todos los procesos que comparten el archivo (o la variable de entorno)
+    aceptan los tokens emitidos por cualquiera de ellos.
+    """
+    with _lock:
+        if _secreto:
+            return _secreto[0]
+
+        desde_entorno = os.environ.get("CONCURSO_SECRETO_SESION")
+        if desde_entorno:
+            _secreto.append(desde_entorno.encode())
+            return _secreto[0]
+
+        ruta = ruta or SESION["secreto"]
+        if not os.path.exists(ruta):
+            _crear_secreto(ruta)
+
+        # El archivo solo aparece completo, pero se reintenta por si otro proceso lo está reemplazando
+        for intento in range(INTENTOS_SECRETO):
+            with open(ruta, 'rb') as archivo:
+                secreto = archivo.read()
+            if secreto:
+                _secreto.append(secreto)
+                return secreto
+            time.sleep(ESPERA_SECRETO)
+        raise RuntimeError(f"El secreto de sesión '{ruta}' está vacío")
+
+def _crear_secreto(ruta):
+    """Escribe un secreto nuevo en un temporal y lo publica sin pisar el de otro proceso"""
+    directorio = os.path.dirname(ruta) or "."
+    os.makedirs(directorio, exist_ok=True)
+    # mkstemp abre con O_EXCL y permisos 0o600
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, 'wb') as archivo:
+            archivo.write(os.urandom(32))
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        try:
+            # link (y rename en Windows) es atómico y falla si el destino ya existe:
+            # si otro proceso lo publicó antes, se usa el suyo
+            if hasattr(os, "link"):
+                os.link(temporal, ruta)
+            else:
+                os.rename(temporal, ruta)
+        except FileExistsError:
+            pass
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+class RevocacionesSesion:
+    """Generación de sesión por usuario, compartida por los procesos en un archivo JSON
+
+    Cada token lleva la generación vigente al emitirlo; cerrar sesión la sube
+    y los tokens anteriores dejan de validarse. El archivo se relee solo cuando
+    cambia (inodo, mtime y tamaño).
+    """
+
+    def __init__(self, ruta=None):
+        self.ruta = ruta or SESION["revocaciones"]
+        self._bloqueo = BloqueoArchivo(self.ruta + ".lock")
+        self._lock = threading.Lock()
+        self._firma = None
+        self._generaciones = {}
+
+    def _leer(self):
+        try:
+            with open(self.ruta, encoding='utf-8') as archivo:
+                return json.load(archivo)
+        except FileNotFoundError:
+            return {}
+
+    def generacion(self, usuario_id):
+        """Devuelve la generación vigente del usuario (0 si nunca cerró sesión)"""
+        try:
+            estado = os.stat(self.ruta)
+            # os.replace crea un inodo nuevo en cada revocación
+            firma = (estado.st_ino, estado.st_mtime_ns, estado.st_size)
+        except FileNotFoundError:
+            firma = None
+        with self._lock:
+            if firma != self._firma:
+                self._generaciones = self._leer() if firma is not None else {}
+                self._firma = firma
+            return self._generaciones.get(usuario_id, 0)
+
+    def revocar(self, usuario_id):
+        """Sube la generación del usuario e invalida todos sus tokens emitidos"""
+        directorio = os.path.dirname(self.ruta) or "."
+        with self._bloqueo():
+            generaciones = self._leer()
+            generaciones[usuario_id] = generaciones.get(usuario_id, 0) + 1
+            descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix=".tmp")
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as archivo:
+                json.dump(generaciones, archivo)
+            os.replace(temporal, self.ruta)
+        with self._lock:
+            self._firma = None
+
+# Instancia compartida por todas las sesiones
+revocaciones = RevocacionesSesion()
+
+def _firma(contenido):
+    return hmac.new(obtener_secreto(), contenido.encode('ascii'), hashlib.sha256).digest()
+
+def emitir_token(usuario, duracion_horas=None):
+    """Devuelve un token firmado con los datos básicos del usuario y su vencimiento"""
+    duracion_horas = duracion_horas or SESION["duracion_horas"]
+    carga = {campo: usuario.get(campo) for campo in CAMPOS_USUARIO}
+    carga["exp"] = int(time.time() + duracion_horas * 3600)
+    carga["gen"] = revocaciones.generacion(usuario.get("id"))
+    contenido = _b64(json.dumps(carga, ensure_ascii=False, separators=(",", ":")).encode())
+    return f"{contenido}.{_b64(_firma(contenido))}"
+
+def validar_token(token, ahora=None):
+    """Devuelve el usuario del token si la firma es válida, no venció ni fue revocado; None en otro caso
+
+    No consulta el almacenamiento: basta con el secreto y las revocaciones compartidas.
+    """
+    if not token or token.count(".") != 1:
+        return None
+    contenido, firma = token.split(".")
+    try:
+        if not hmac.compare_digest(_firma(contenido), _desde_b64(firma)):
+            return None
+        carga = json.loads(_desde_b64(contenido))
+    except (ValueError, UnicodeError):
+        return None
+
+    ahora = time.time() if ahora is None else ahora
+    if not isinstance(carga, dict) or carga.get("exp", 0) < ahora:
+        return None
+    if carga.get("gen", 0) != revocaciones.generacion(carga.get("id")):
+        return None
+    return {campo: carga.get(campo) for campo in CAMPOS_USUARIO}
+
+def _por_vencer(token):
+    # El token ya fue validado: solo se lee su vencimiento
+    carga = json.loads(_desde_b64(token.split(".")[0]))
+    return carga["exp"] - time.time() < SESION["duracion_horas"] * 3600 / 2
+
+def iniciar_sesion(usuario):
+    """Emite el token del usuario y lo guarda en la sesión y en la URL"""
+    token = emitir_token(usuario)
+    st.session_state.token_sesion = token
+    st.session_state.usuario_actual = validar_token(token)
+    st.query_params[SESION["parametro"]] = token
+
+def restaurar_sesion():
+    """Valida el token de la sesión o de la URL y deja el usuario en st.session_state
+
+    Devuelve el usuario autenticado o None (token ausente, alterado o vencido).
+    """
+    token = st.session_state.get("token_sesion") or st.query_params.get(SESION["parametro"])
+    usuario = validar_token(token)
+    if usuario is None:
+        # Token ausente o inválido: no hay sesión que revocar
+        cerrar_sesion(revocar=False)
+        return None
+
+    # Pasada la mitad de su duración se emite uno nuevo: la sesión activa no vence
+    if _por_vencer(token):
+        token = emitir_token(usuario)
+
+    st.session_state.token_sesion = token
+    st.session_state.usuario_actual = usuario
+    if st.query_params.get(SESION["parametro"]) != token:
+        st.query_params[SESION["parametro"]] = token
+    return usuario
+
+def cerrar_sesion(revocar=True):
+    """Revoca los tokens del usuario y los elimina de la sesión y de la URL"""
+    usuario = st.session_state.get("usuario_actual")
+    if revocar and usuario is not None:
+        revocaciones.revocar(usuario["id"])
+    for clave in ("usuario_actual", "token_sesion"):
+        if clave in st.session_state:
+            del st.session_state[clave]
+    if SESION["parametro"] in st.query_params:
+        del st.query_params[SESION["parametro"]]
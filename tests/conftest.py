@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Los módulos de la aplicación están en la raíz del repositorio y el generador en benchmarks/
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for ruta in (RAIZ, os.path.join(RAIZ, "benchmarks")):
+    if ruta not in sys.path:
+        sys.path.insert(0, ruta)
@@ -0,0 +1,73 @@
+import json
+import os
+
+import pytest
+
+import almacenamiento
+from generar_datos import generar
+
+@pytest.fixture
+def backend(tmp_path):
+    """Backend JSON en un directorio temporal, sin compactación automática"""
+    backend = almacenamiento.BackendJSON(
+        str(tmp_path / "data.json"), str(tmp_path / "calificaciones.journal.jsonl"), umbral_compactacion=10**6
+    )
+    backend.guardar(generar(5, 8, 20, semilla=3))
+    return backend
+
+def calificar(backend, datos, numero):
+    """Agrega una calificación al journal como lo hace servicios.registrar_calificacion"""
+    proyecto = datos['proyectos'][numero % len(datos['proyectos'])]
+    calificacion = {
+        "id": f"cal_prueba_{numero}",
+        "proyecto_id": proyecto['id'],
+        "docente_id": datos['usuarios'][1]['id'],
+        "fecha_calificacion": "2025-08-15",
+        "criterios": {"innovacion": 8, "viabilidad": 7.5},
+        "calificacion_ponderada": 7.8,
+        "comentarios": ""
+    }
+    datos['calificaciones'].append(calificacion)
+    proyecto.setdefault('calificaciones', []).append(calificacion['id'])
+    proyecto['calificacion_final'] = 7.8
+    backend.agregar_calificacion(datos, calificacion, proyecto)
+
+def sin_version(datos):
+    return {clave: valor for clave, valor in datos.items() if clave != 'version'}
+
+def test_el_journal_se_reproduce_al_cargar(backend):
+    datos = backend.cargar()
+    version = datos['version']
+    for numero in range(5):
+        calificar(backend, datos, numero)
+
+    # Otro proceso (otra instancia) ve el snapshot más el journal
+    recargados = almacenamiento.BackendJSON(backend.ruta, backend.ruta_journal).cargar()
+    assert recargados == datos
+    assert recargados['version'] == version + 5
+
+def test_la_compactacion_conserva_los_datos(backend):
+    datos = backend.cargar()
+    for numero in range(5):
+        calificar(backend, datos, numero)
+    with open(backend.ruta_journal, encoding='utf-8') as archivo:
+        journal = archivo.read()
+
+    backend.compactar()
+    assert not os.path.exists(backend.ruta_journal)
+    compactados = backend.cargar()
+    assert sin_version(compactados) == sin_version(datos)
+
+    # Si el journal sobrevive a la compactación (corte antes de vaciarlo), no se duplica nada;
+    # una última línea incompleta se ignora
+    with open(backend.ruta_journal, 'w', encoding='utf-8') as archivo:
+        archivo.write(journal + journal.splitlines()[0][:40])
+    assert sin_version(backend.cargar()) == sin_version(datos)
+
+def test_la_calificacion_se_guarda_en_una_linea(backend):
+    datos = backend.cargar()
+    calificar(backend, datos, 0)
+    with open(backend.ruta_journal, encoding='utf-8') as archivo:
+        lineas = archivo.read().splitlines()
+    assert len(lineas) == 1
+    assert json.loads(lineas[0])['calificacion']['id'] == "cal_prueba_0"
@@ -0,0 +1,72 @@
+import pytest
+
+import almacenamiento
+from busqueda import IndiceBusqueda
+from estadisticas import EstadisticasConcurso
+from generar_datos import generar
+from indices import IndiceCalificaciones
+from ranking import MotorRanking
+
+# Las estructuras derivadas se extienden al registrar proyectos y calificaciones:
+# extender sobre un prefijo de los datos debe dar lo mismo que reconstruir desde cero
+
+@pytest.fixture(scope="module")
+def versiones():
+    """(anterior, actual): vistas compartidas donde 'actual' añade proyectos y calificaciones al final"""
+    datos = generar(12, 60, 400, semilla=7)
+    # Como en la aplicación, un proyecto se registra antes de recibir calificaciones
+    proyectos = datos['proyectos']
+    registrados = {proyecto['id'] for proyecto in proyectos[:45]}
+    previas = [cal for cal in datos['calificaciones'] if cal['proyecto_id'] in registrados]
+    posteriores = [cal for cal in datos['calificaciones'] if cal['proyecto_id'] not in registrados]
+    anterior = dict(datos, proyectos=proyectos[:45], calificaciones=previas[:len(previas) // 2])
+    actual = dict(datos, calificaciones=previas + posteriores)
+    return almacenamiento.congelar_documento(anterior), almacenamiento.congelar_documento(actual)
+
+def extendido(clase, versiones):
+    anterior, actual = versiones
+    resultado = clase.extender(clase.desde_datos(anterior), actual)
+    assert resultado is not None, f"{clase.__name__}.extender pidió reconstruir"
+    return resultado, clase.desde_datos(actual)
+
+def test_ranking(versiones):
+    motor, reconstruido = extendido(MotorRanking, versiones)
+    assert motor.finales == reconstruido.finales
+    assert motor.cantidades == reconstruido.cantidades
+    assert motor.orden == reconstruido.orden
+    assert motor.ganadores() == reconstruido.ganadores()
+
+def test_indice_calificaciones(versiones):
+    indice, reconstruido = extendido(IndiceCalificaciones, versiones)
+
+    def ids(por_clave):
+        return {clave: [cal['id'] for cal in lista] for clave, lista in por_clave.items()}
+
+    assert indice.por_id.keys() == reconstruido.por_id.keys()
+    for campo in ("por_proyecto", "por_docente", "por_docente_proyecto"):
+        assert ids(getattr(indice, campo)) == ids(getattr(reconstruido, campo))
+
+def test_indice_calificaciones_no_modifica_el_anterior(versiones):
+    anterior, actual = versiones
+    indice = IndiceCalificaciones.desde_datos(anterior)
+    antes = {clave: list(lista) for clave, lista in indice.por_proyecto.items()}
+    IndiceCalificaciones.extender(indice, actual)
+    assert {clave: list(lista) for clave, lista in indice.por_proyecto.items()} == antes
+
+def test_indice_busqueda(versiones):
+    indice, reconstruido = extendido(IndiceBusqueda, versiones)
+    assert indice.postings == reconstruido.postings
+    assert indice.orden == reconstruido.orden
+    assert indice.frecuencias == reconstruido.frecuencias
+    for consulta in ("sistema", "gest", "plataforma de"):
+        assert indice.buscar(consulta) == reconstruido.buscar(consulta)
+    assert indice.sugerencias() == reconstruido.sugerencias()
+
+def test_estadisticas(versiones):
+    estadisticas, reconstruidas = extendido(EstadisticasConcurso, versiones)
+    assert estadisticas.por_asignatura == reconstruidas.por_asignatura
+    assert estadisticas.por_carrera == reconstruidas.por_carrera
+    assert estadisticas.resumen_criterios() == pytest.approx(reconstruidas.resumen_criterios())
+    assert estadisticas.por_proyecto.keys() == reconstruidas.por_proyecto.keys()
+    for proyecto_id in reconstruidas.por_proyecto:
+        assert estadisticas.promedio_proyecto(proyecto_id) == pytest.approx(reconstruidas.promedio_proyecto(proyecto_id))
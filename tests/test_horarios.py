@@ -0,0 +1,32 @@
+from horarios import IndiceHorarios, esta_en_horario
+
+TEXTO_CON_FECHA = "Viernes, 15 de agosto de 2025, 11:00 a 13:00 en el Auditorio"
+
+def indice(*proyectos):
+    return IndiceHorarios.desde_datos({"proyectos": list(proyectos)})
+
+def test_turno_con_fecha_solo_esta_en_horario_ese_dia():
+    ix = indice({"id": "p1", "horas_presentacion": TEXTO_CON_FECHA})
+    assert ix.presentando(12 * 60, fecha="2025-08-15") == {"p1"}
+    assert ix.presentando(12 * 60, fecha="2025-08-16") == set()
+    assert ix.en_horario("p1", 12 * 60, fecha="2025-08-15")
+    assert not ix.en_horario("p1", 12 * 60, fecha="2025-08-16")
+    assert ix.proximos(120, 10 * 60, fecha="2025-08-16") == []
+    assert not esta_en_horario(TEXTO_CON_FECHA, 12 * 60, fecha="2025-08-16")
+
+def test_turno_sin_fecha_vale_cualquier_dia_y_se_mezcla_por_hora():
+    ix = indice(
+        {"id": "p1", "horas_presentacion": TEXTO_CON_FECHA},
+        {"id": "p2", "horas_presentacion": "10:30 - 11:30"}
+    )
+    assert ix.presentando(11 * 60, fecha="2025-08-16") == {"p2"}
+    assert ix.presentando(11 * 60 + 15, fecha="2025-08-15") == {"p1", "p2"}
+    assert ix.proximos(120, 10 * 60, fecha="2025-08-15") == ["p2", "p1"]
+
+def test_el_turno_estructurado_es_la_unica_fuente():
+    # horario_minutos (formato anterior) ya no tiene prioridad sobre el turno
+    ix = indice({
+        "id": "p1", "horas_presentacion": TEXTO_CON_FECHA, "horario_minutos": [660, 780],
+        "presentacion": {"fecha": "2025-08-15", "inicio": 660, "fin": 780, "sala": "Auditorio"}
+    })
+    assert ix.presentando(12 * 60, fecha="2025-08-16") == set()
@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+
+from perfil_importacion import PESADAS
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def modulos_importados(codigo):
+    """Ejecuta 'codigo' con -X importtime en un proceso nuevo y devuelve los paquetes de primer nivel importados"""
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo], cwd=RAIZ, capture_output=True, text=True
+    )
+    assert proceso.returncode == 0, proceso.stderr
+    return {
+        linea.rsplit("|", 1)[1].strip().split(".")[0]
+        for linea in proceso.stderr.splitlines()
+        if linea.startswith("import time:") and "self [us]" not in linea
+    }
+
+def test_arrancar_la_aplicacion_no_importa_librerias_pesadas():
+    for modulo in ("main", "concurso"):
+        importados = modulos_importados(f"import {modulo}")
+        assert modulo in importados
+        assert importados.isdisjoint(PESADAS), f"{modulo} importa {sorted(importados & set(PESADAS))}"
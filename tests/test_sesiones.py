@@ -0,0 +1,48 @@
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import sesiones
+
+USUARIO = {"id": "user_001", "username": "admin", "nombre": "Administrador", "rol": "admin"}
+
+@pytest.fixture(autouse=True)
+def estado_temporal(tmp_path, monkeypatch):
+    """Secreto fijo y revocaciones en un directorio temporal"""
+    monkeypatch.setenv("CONCURSO_SECRETO_SESION", "secreto-de-prueba")
+    monkeypatch.setattr(sesiones, "_secreto", [])
+    monkeypatch.setattr(sesiones, "revocaciones", sesiones.RevocacionesSesion(str(tmp_path / "revocadas.json")))
+
+def app():
+    import streamlit as st
+
+    import sesiones
+    sesiones.restaurar_sesion()
+    if st.button("Cerrar sesión"):
+        sesiones.cerrar_sesion()
+
+def abrir_con(token):
+    at = AppTest.from_function(app, default_timeout=30)
+    at.query_params["sesion"] = token
+    return at.run()
+
+def test_el_token_de_la_url_restaura_la_sesion():
+    at = abrir_con(sesiones.emitir_token(USUARIO))
+    assert at.session_state["usuario_actual"] == USUARIO
+
+def test_el_token_se_rechaza_despues_de_cerrar_sesion():
+    token = sesiones.emitir_token(USUARIO)
+    otro_token = sesiones.emitir_token(USUARIO)
+    at = abrir_con(token)
+    at.button[0].click().run()
+    assert "usuario_actual" not in at.session_state
+
+    # La URL copiada antes de salir ya no sirve, tampoco otro token del mismo usuario
+    assert "usuario_actual" not in abrir_con(token).session_state
+    assert sesiones.validar_token(otro_token) is None
+    # Un inicio de sesión posterior emite tokens válidos
+    assert sesiones.validar_token(sesiones.emitir_token(USUARIO)) == USUARIO
+
+def test_el_token_alterado_o_vencido_se_rechaza():
+    token = sesiones.emitir_token(USUARIO)
+    assert sesiones.validar_token(token[:-2] + "xx") is None
+    assert sesiones.validar_token(token, ahora=2**40) is None